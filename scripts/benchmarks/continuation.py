@@ -0,0 +1,103 @@
+"""Read a page whose links arrive in many continuation batches.
+
+Run with ``python -m scripts.benchmarks.continuation``. Batches are built from
+synthetic API data, so no network access is needed. The recursive merge of
+whole responses used before is timed for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from scripts.wikilanggraph.structures import MultitonScope
+from scripts.wikilanggraph.wikipedia_page import Page
+
+# MediaWiki returns at most 500 links per response to regular users
+BATCH_SIZE = 500
+SIZES = (1_000, 5_000, 20_000, 50_000)
+
+
+def batches(links: int, revisions: int) -> list[dict]:
+    """Continuation batches of a query for one page, as the API splits them"""
+    result = []
+    for start in range(0, max(links, revisions), BATCH_SIZE):
+        page_data = {"title": "Article", "ns": 0}
+        if not result:
+            page_data |= {"displaytitle": "Article", "pageprops": {"wikibase_item": "Q1"}}
+        page_data["links"] = [
+            {"ns": 0, "title": f"Article {i}"} for i in range(start, min(start + BATCH_SIZE, links))
+        ]
+        page_data["revisions"] = [
+            {"revid": i, "timestamp": f"20{10 + i % 10}-01-01T00:00:{i % 60:02d}Z"}
+            for i in range(start, min(start + BATCH_SIZE, revisions))
+        ]
+        result.append({"query": {"pages": {"1": page_data}}})
+    return result
+
+
+def merge_responses(d1: dict, d2: dict) -> dict:
+    """Recursive merge of two whole responses, concatenating their lists"""
+    merged = {}
+    for k in d1.keys() | d2.keys():
+        if k in d1 and k in d2 and isinstance(d1[k], dict):
+            merged[k] = merge_responses(d1[k], d2[k])
+        elif k in d1 and k in d2 and isinstance(d1[k], list):
+            merged[k] = d1[k] + d2[k]
+        else:
+            merged[k] = d1[k] if k in d1 else d2[k]
+    return merged
+
+
+def read_merged(responses: list[dict]) -> Page:
+    data = responses[0]
+    for new_data in responses[1:]:
+        data = merge_responses(data, new_data)
+    page = Page(language="en", title="Article")
+    page._parse_page_data(data=data["query"]["pages"]["1"])
+    return page
+
+
+def read_streamed(responses: list[dict]) -> Page:
+    page = Page(language="en", title="Article")
+    revisions = []
+    for data in responses:
+        page._consume_page_data(data=data["query"]["pages"]["1"], revisions=revisions)
+    page._finish_page_data(revisions=revisions)
+    return page
+
+
+def measure(read: Callable[[list[dict]], Page], responses: list[dict]) -> tuple[float, int]:
+    """Return seconds taken and peak bytes allocated while reading the responses"""
+    tracemalloc.start()
+    with MultitonScope():
+        start = time.perf_counter()
+        read(responses)
+        elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--revisions", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'links':>8} {'batches':>8} {'merged s':>9} {'merged MB':>10}"
+        f" {'streamed s':>11} {'streamed MB':>12}"
+    )
+    for links in SIZES:
+        responses = batches(links, args.revisions)
+        merged_time, merged_peak = measure(read_merged, responses)
+        streamed_time, streamed_peak = measure(read_streamed, responses)
+        print(
+            f"{links:>8} {len(responses):>8} {merged_time:>9.3f} {merged_peak / 2**20:>10.1f}"
+            f" {streamed_time:>11.3f} {streamed_peak / 2**20:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Build, score and move through time language graphs served by the local mock API.
+
+Run with ``python -m scripts.benchmarks.end_to_end``. Every size is run
+against a SyntheticWiki behind MockWikipediaApi, going through the same
+client, request scheduler and pages as a live session:
+
+- ``article``: ``Model.get_article_data``, i.e. ``generate_lang_graph`` and
+  the metrics of the finished graph
+- ``timestamp``: ``Model.get_article_timestamp`` for a past moment
+- ``metrics``: ``calculate_dissimilarity_metrics`` of the finished graph
+
+Wall time and requests per second come from a first run, peak memory from a
+second one traced with tracemalloc, which would otherwise slow it down. The
+default sizes keep a run short; ``--languages 10 100 300 --links 100 1000 5000``
+covers the full range.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Optional
+
+from scripts.benchmarks.mock_api import MockWikipediaApi
+from scripts.benchmarks.mock_api import SyntheticWiki
+from scripts.wikilanggraph import calculate_dissimilarity_metrics
+from scripts.wikilanggraph.Model import Model
+from scripts.wikilanggraph.wikipedia_api import RequestScheduler
+from scripts.wikilanggraph.wikipedia_api import disable_response_cache
+from scripts.wikilanggraph.wikipedia_api import get_scheduler
+from scripts.wikilanggraph.wikipedia_api import set_scheduler
+
+LANGUAGES = (10, 30, 100, 300)
+LINKS = (100, 1_000, 5_000)
+PHASES = ("article", "timestamp", "metrics")
+
+
+class PhaseResult:
+    def __init__(self: PhaseResult, phase: str) -> None:
+        self.phase: str = phase
+        self.seconds: float = 0.0
+        self.requests: int = 0
+        self.peak: Optional[int] = None
+
+    @property
+    def requests_per_second(self: PhaseResult) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+async def run_phases(
+    wiki: SyntheticWiki, api_options: dict, traced: bool
+) -> dict[str, PhaseResult]:
+    api = MockWikipediaApi(wiki, **api_options)
+    results = {phase: PhaseResult(phase) for phase in PHASES}
+    model = Model(client=api.client())
+    graphs = {}
+    moment = wiki.revision_timestamps[len(wiki.revision_timestamps) // 2]
+
+    async def article() -> None:
+        await model.get_article_data(article_name=wiki.title, article_language="en")
+        graphs["article"] = model.network
+
+    async def timestamp() -> None:
+        await model.get_article_timestamp(
+            article_name=wiki.title, moment_in_time=moment, article_language="en"
+        )
+
+    async def metrics() -> None:
+        calculate_dissimilarity_metrics(graph=graphs["article"])
+
+    try:
+        for phase, run in (("article", article), ("timestamp", timestamp), ("metrics", metrics)):
+            result = results[phase]
+            requests = api.requests
+            if traced:
+                tracemalloc.start()
+            start = time.perf_counter()
+            await run()
+            result.seconds = time.perf_counter() - start
+            if traced:
+                result.peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            result.requests = api.requests - requests
+    finally:
+        await model.close()
+    return results
+
+
+def measure(
+    languages: int, links: int, api_options: dict, memory: bool = True
+) -> dict[str, PhaseResult]:
+    results = asyncio.run(run_phases(SyntheticWiki(languages, links), api_options, traced=False))
+    if memory:
+        traced = asyncio.run(run_phases(SyntheticWiki(languages, links), api_options, traced=True))
+        for phase, result in results.items():
+            result.peak = traced[phase].peak
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--languages", type=int, nargs="+", default=LANGUAGES[:2])
+    parser.add_argument("--links", type=int, nargs="+", default=LINKS[:2])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=500, help="list items per batch")
+    parser.add_argument("--rate", type=float, default=None, help="scheduler requests per second")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run")
+    args = parser.parse_args()
+
+    disable_response_cache()
+    previous_scheduler = get_scheduler()
+    if args.rate is None:
+        # the mock API needs no politeness, measure the engine instead
+        set_scheduler(RequestScheduler(rate=1e9, burst=1e9, maxlag=None))
+    else:
+        set_scheduler(RequestScheduler(rate=args.rate, burst=args.rate, maxlag=None))
+    api_options = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "page_size": args.page_size,
+    }
+    print(
+        f"{'languages':>9} {'links':>6} {'phase':>9} {'wall s':>8}"
+        f" {'requests':>8} {'req/s':>8} {'peak MB':>8}"
+    )
+    try:
+        for languages in args.languages:
+            for links in args.links:
+                results = measure(languages, links, api_options, memory=not args.no_memory)
+                for result in results.values():
+                    peak = "-" if result.peak is None else f"{result.peak / 2**20:.1f}"
+                    print(
+                        f"{languages:>9} {links:>6} {result.phase:>9} {result.seconds:>8.3f}"
+                        f" {result.requests:>8} {result.requests_per_second:>8.0f} {peak:>8}"
+                    )
+    finally:
+        set_scheduler(previous_scheduler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Load test of the Bokeh server, measuring sessions per second for numbers of workers.
+
+Run with ``python -m scripts.benchmarks.load_test run --workers 1 2 4``. For
+every number of workers a server is started with ``scripts.main.serve``,
+answering from a SyntheticWiki instead of Wikipedia, so nothing leaves the
+machine and every run sees the same article. Then ``--clients`` client
+processes each open ``--sessions`` Bokeh sessions one after another, the way
+a browser does: a session sets the article in the search box and waits until
+its graph and language list have been rendered.
+
+Sessions per second should grow with the number of workers until they
+outnumber the CPU cores, minus the cores the clients keep busy, so run the
+clients on another machine (``run --url``) to measure large servers. With the
+graph cache, the graph built by the first session is read by every other
+one, whichever worker serves it, so ``--no-graph-cache`` shows the cost of
+building the graph in every session instead.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+from typing import Optional
+
+import httpx
+import numpy as np
+from bokeh.client import pull_session
+from bokeh.models import CheckboxGroup
+from bokeh.models import TextInput
+
+from scripts.benchmarks.mock_api import SyntheticWiki
+
+Seconds = float
+
+TITLE = "Article"
+
+
+def serve(args: argparse.Namespace) -> None:
+    # imported here, so that clients never import the server
+    from scripts.main import serve as serve_app
+    from scripts.wikilanggraph.wikipedia_api import set_data_source
+
+    set_data_source(SyntheticWiki(languages=args.languages, links=args.links, title=TITLE))
+    serve_app(
+        port=args.port,
+        workers=args.workers,
+        show=False,
+        cache_dir=args.cache_dir,
+        graph_cache=not args.no_graph_cache,
+    )
+
+
+def run_sessions(url: str, sessions: int, timeout: Seconds) -> list[Seconds]:
+    """Load the article in sessions one after another, returning how long each one took"""
+    article = f"{TITLE} | en"
+    latencies = []
+    for _ in range(sessions):
+        started = time.perf_counter()
+        rendered = []
+        with pull_session(url=url) as session:
+            document = session.document
+            languages = document.select_one({"type": CheckboxGroup}).id
+
+            # the Python client cannot apply the binary arrays of graph patches,
+            # so patches are only looked through for the rendered language list
+            def handle_patch(message: Any) -> None:
+                for event in message.content["events"]:
+                    if _is_rendered(event, languages):
+                        rendered.append(True)
+                        session.close()
+
+            session._handle_patch = handle_patch
+            document.add_timeout_callback(session.close, int(timeout * 1000))
+            document.select_one({"type": TextInput}).value = article
+            # patches are only received while the client loop runs
+            session._loop_until_closed()
+        if not rendered:
+            raise TimeoutError(f"Session not rendered in {timeout} s")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _is_rendered(event: dict[str, Any], languages: str) -> bool:
+    return (
+        event.get("kind") == "ModelChanged"
+        and event.get("model", {}).get("id") == languages
+        and event.get("attr") == "labels"
+        and bool(event.get("new"))
+    )
+
+
+def wait_for_server(url: str, timeout: Seconds = 60.0) -> None:
+    started = time.perf_counter()
+    while True:
+        try:
+            if httpx.get(f"{url}/metrics").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError(f"Server at {url} not up in {timeout} s")
+        time.sleep(0.2)
+
+
+def measure(
+    url: str, clients: int, sessions: int, timeout: Seconds
+) -> tuple[Seconds, list[Seconds]]:
+    work = [(url, sessions, timeout)] * clients
+    started = time.perf_counter()
+    with multiprocessing.Pool(clients) as pool:
+        latencies = pool.starmap(run_sessions, work)
+    return time.perf_counter() - started, list(itertools.chain(*latencies))
+
+
+def start_server(args: argparse.Namespace, workers: int, cache_dir: str) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "scripts.benchmarks.load_test", "serve",
+        "--port", str(args.port),
+        "--workers", str(workers),
+        "--cache-dir", cache_dir,
+        "--languages", str(args.languages),
+        "--links", str(args.links),
+    ]
+    if args.no_graph_cache:
+        command.append("--no-graph-cache")
+    # workers are forked children of the server, stopped together as a process group
+    return subprocess.Popen(
+        command, start_new_session=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    os.killpg(server.pid, signal.SIGTERM)
+    server.wait()
+
+
+def run(args: argparse.Namespace) -> None:
+    print(
+        f"{'workers':>7} {'sessions':>8} {'wall s':>8}"
+        f" {'sessions/s':>10} {'p50 s':>7} {'p95 s':>7}"
+    )
+    for workers in args.workers if args.url is None else [None]:
+        server: Optional[subprocess.Popen] = None
+        with tempfile.TemporaryDirectory() as cache_dir:
+            url = args.url
+            if url is None:
+                url = f"http://localhost:{args.port}"
+                server = start_server(args, workers, cache_dir)
+            try:
+                wait_for_server(url)
+                seconds, latencies = measure(url, args.clients, args.sessions, args.timeout)
+            finally:
+                if server is not None:
+                    stop_server(server)
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(
+            f"{workers or '-':>7} {len(latencies):>8} {seconds:>8.2f}"
+            f" {len(latencies) / seconds:>10.2f} {p50:>7.2f} {p95:>7.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="start servers and measure them")
+    run_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    run_parser.add_argument("--url", help="measure a server already running there instead")
+    run_parser.add_argument("--clients", type=int, default=4, help="concurrent client processes")
+    run_parser.add_argument("--sessions", type=int, default=5, help="sessions per client")
+    run_parser.add_argument("--timeout", type=float, default=120.0, help="seconds per session")
+    run_parser.set_defaults(run=run)
+
+    serve_parser = commands.add_parser("serve", help="serve the synthetic article")
+    serve_parser.add_argument("--workers", type=int, default=1)
+    serve_parser.add_argument("--cache-dir", default=tempfile.gettempdir())
+    serve_parser.set_defaults(run=serve)
+
+    for command_parser in (run_parser, serve_parser):
+        command_parser.add_argument("--port", type=int, default=5106)
+        command_parser.add_argument("--languages", type=int, default=20)
+        command_parser.add_argument("--links", type=int, default=500)
+        command_parser.add_argument("--no-graph-cache", action="store_true")
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
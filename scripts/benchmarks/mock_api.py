@@ -0,0 +1,329 @@
+"""Local stand-in for the MediaWiki API of many Wikipedias.
+
+``MockWikipediaApi`` is an ``httpx.MockTransport`` handler answering requests
+sent to ``https://<language>.wikipedia.org/w/api.php`` from any DataSource:
+``SyntheticWiki`` below, a ``DumpDataSource`` over imported dumps, or any
+other recorded responses. Lists longer than ``page_size`` are split into
+``continue`` batches the way the API limits them, and latency and throttling
+errors can be injected, so the whole client stack runs like against the live
+API but reproducibly and offline.
+"""
+from __future__ import annotations
+
+__all__ = ["MockWikipediaApi", "SyntheticWiki"]
+
+import asyncio
+import datetime
+import json
+import random
+import re
+from typing import Any
+from typing import Optional
+
+import httpx
+import numpy as np
+
+from scripts.wikilanggraph.wikipedia_api import DataSource
+from scripts.wikilanggraph.wikipedia_api import create_client
+
+Seconds = float
+
+# lists of a query response that the API hands out in continuation batches
+CONTINUED_LISTS = ("links", "langlinks", "revisions", "redirects", "linkshere")
+CONTINUE_PARAM = "mockcontinue"
+
+
+class MockWikipediaApi:
+    """MediaWiki API of every Wikipedia, answered from a DataSource"""
+
+    def __init__(
+        self: MockWikipediaApi,
+        backend: DataSource,
+        page_size: int = 500,
+        latency: Seconds = 0.0,
+        jitter: Seconds = 0.0,
+        error_rate: float = 0.0,
+        retry_after: Seconds = 0.05,
+        seed: int = 0,
+    ) -> None:
+        self.backend: DataSource = backend
+        self.page_size: int = page_size
+        self.latency: Seconds = latency
+        self.jitter: Seconds = jitter
+        self.error_rate: float = error_rate
+        self.retry_after: Seconds = retry_after
+        self._random: random.Random = random.Random(seed)
+        self.requests: int = 0
+        self.errors: int = 0
+        self.bytes: int = 0
+
+    def __repr__(self: MockWikipediaApi) -> str:
+        return (
+            f"MockWikipediaApi(backend={self.backend!r}, requests={self.requests},"
+            f" errors={self.errors}, bytes={self.bytes})"
+        )
+
+    def transport(self: MockWikipediaApi) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def client(self: MockWikipediaApi, **kwargs: Any) -> httpx.AsyncClient:
+        """Client set up like the real one, sending its requests to this API"""
+        return create_client(http2=False, transport=self.transport(), **kwargs)
+
+    async def handler(self: MockWikipediaApi, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return self._throttled()
+        language = request.url.host.split(".")[0]
+        params = dict(request.url.params)
+        offset = int(params.pop(CONTINUE_PARAM, 0))
+        params.pop("maxlag", None)
+        data = await self.backend.fetch_json(
+            None, language=language, params=params, description=params.get("titles", "")
+        )
+        if "query" in data:
+            data = self._batch(data, offset)
+        content = json.dumps(data).encode("utf-8")
+        self.bytes += len(content)
+        return httpx.Response(
+            200, content=content, headers={"Content-Type": "application/json"}
+        )
+
+    def _throttled(self: MockWikipediaApi) -> httpx.Response:
+        headers = {"Retry-After": str(self.retry_after)}
+        if self._random.random() < 0.5:
+            return httpx.Response(503, headers=headers, text="Service Unavailable")
+        error = {"error": {"code": "maxlag", "info": "Waiting for a database server"}}
+        return httpx.Response(200, headers=headers, json=error)
+
+    def _batch(self: MockWikipediaApi, data: dict, offset: int) -> dict:
+        """Cut the lists of all pages to the batch starting at offset.
+
+        Like the ``*limit`` parameters of the API, ``page_size`` caps the items
+        of every list in the whole response, not those of every page, so
+        multi-title queries are continued as often as the real API does.
+        """
+        start, end = offset * self.page_size, (offset + 1) * self.page_size
+        more = False
+        pages = {}
+        for page_id, page_data in data["query"].get("pages", {}).items():
+            if offset:
+                # only the lists are continued, other properties come with the first batch
+                page_data = {
+                    key: value
+                    for key, value in page_data.items()
+                    if key in ("pageid", "ns", "title")
+                }
+            pages[page_id] = page_data
+        for key in CONTINUED_LISTS:
+            items = [
+                (page_id, item)
+                for page_id, page_data in data["query"].get("pages", {}).items()
+                for item in page_data.get(key, [])
+            ]
+            more |= len(items) > end
+            for page_data in pages.values():
+                page_data.pop(key, None)
+            for page_id, item in items[start:end]:
+                pages[page_id].setdefault(key, []).append(item)
+        query = dict(data["query"], pages=pages)
+        if offset:
+            for mapping in ("normalized", "converted", "redirects"):
+                query.pop(mapping, None)
+        data = dict(data, query=query)
+        if more:
+            data.pop("batchcomplete", None)
+            data["continue"] = {CONTINUE_PARAM: str(offset + 1), "continue": "||"}
+        return data
+
+
+class SyntheticWiki(DataSource):
+    """One article in many languages, linking to deterministic random topics.
+
+    Every language version links to ``links`` of ``2 * links`` topic articles,
+    popular topics being linked from most language versions. Topics have
+    langlinks to fewer languages the less popular they are, the most popular
+    ones to nearly all of them. A few links are red, lowercase or point to
+    redirects, and the article has ``revisions`` past revisions whose links
+    are growing subsets of the current ones.
+    """
+
+    TOPIC = re.compile(r"^Topic (\d+)( \(alias\))?$")
+
+    def __init__(
+        self: SyntheticWiki,
+        languages: int = 10,
+        links: int = 100,
+        revisions: int = 20,
+        title: str = "Article",
+        seed: int = 0,
+    ) -> None:
+        self.languages: list[str] = ["en"] + [f"l{i:03d}" for i in range(1, languages)]
+        self.links: int = links
+        self.revisions: int = revisions
+        self.title: str = title
+        self.seed: int = seed
+        self._topics: int = 2 * links
+        weights = 1 / np.arange(1, self._topics + 1) ** 0.8
+        self._weights: np.ndarray = weights / weights.sum()
+        self._links: dict[str, list[int]] = {}
+        self.requests: int = 0
+
+    def __repr__(self: SyntheticWiki) -> str:
+        return (
+            f"SyntheticWiki(languages={len(self.languages)}, links={self.links},"
+            f" revisions={self.revisions})"
+        )
+
+    @property
+    def revision_timestamps(self: SyntheticWiki) -> list[datetime.datetime]:
+        return [self._timestamp(0, revision) for revision in range(self.revisions)]
+
+    async def fetch_json(
+        self: SyntheticWiki,
+        client: Optional[httpx.AsyncClient],
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        self.requests += 1
+        if params.get("action") == "parse":
+            return self.parse(language, params)
+        return self.query(language, params)
+
+    def query(self: SyntheticWiki, language: str, params: dict[str, Any]) -> dict:
+        props = set(str(params.get("prop", "")).split("|"))
+        normalized, redirects, pages = [], [], {}
+        missing_id = -1
+        for title in str(params.get("titles", "")).split("|"):
+            name = title[:1].upper() + title[1:]
+            if name != title:
+                normalized.append({"from": title, "to": name})
+            match = self.TOPIC.match(name)
+            if match and match.group(2) and params.get("redirects"):
+                redirects.append({"from": name, "to": f"Topic {match.group(1)}"})
+                name = f"Topic {match.group(1)}"
+            if name == self.title and language in self.languages:
+                pages["1"] = self._article(language, props)
+            elif match and self._exists(int(match.group(1))):
+                topic = int(match.group(1))
+                pages[str(topic + 1000)] = self._topic(language, topic, props)
+            else:
+                pages[str(missing_id)] = {"ns": 0, "title": name, "missing": ""}
+                missing_id -= 1
+        query = {"pages": pages}
+        if normalized:
+            query["normalized"] = normalized
+        if redirects:
+            query["redirects"] = redirects
+        return {"batchcomplete": "", "query": query}
+
+    def parse(self: SyntheticWiki, language: str, params: dict[str, Any]) -> dict:
+        oldid = int(params["oldid"])
+        revision = oldid % 10_000
+        titles = self._link_titles(language)
+        # older revisions link to fewer of the current links
+        count = len(titles) * (self.revisions - revision) // self.revisions
+        data = {
+            "title": self.title,
+            "pageid": 1,
+            "revid": oldid,
+            "displaytitle": self.title,
+            "links": [
+                {"ns": 0, "*": title, **({"exists": ""} if self._exists_title(title) else {})}
+                for title in titles[:count]
+            ],
+        }
+        if "properties" in str(params.get("prop", "")):
+            data["properties"] = [{"name": "wikibase_item", "*": "Q1"}]
+        return {"parse": data}
+
+    def _article(self: SyntheticWiki, language: str, props: set[str]) -> dict:
+        data = {
+            "pageid": 1,
+            "ns": 0,
+            "title": self.title,
+            "displaytitle": self.title,
+            "pageprops": {"wikibase_item": "Q1"},
+        }
+        if "langlinks" in props:
+            data["langlinks"] = [
+                {"lang": other, "*": self.title} for other in self.languages if other != language
+            ]
+        if "links" in props:
+            data["links"] = [{"ns": 0, "title": title} for title in self._link_titles(language)]
+        if "revisions" in props:
+            index = self.languages.index(language)
+            data["revisions"] = [
+                {
+                    "revid": index * 10_000 + revision,
+                    "timestamp": self._timestamp(index, revision).isoformat() + "Z",
+                }
+                for revision in range(self.revisions)
+            ]
+        if "pageterms" in props:
+            data["terms"] = {"description": ["Synthetic article"]}
+        return data
+
+    def _topic(self: SyntheticWiki, language: str, topic: int, props: set[str]) -> dict:
+        title = f"Topic {topic}"
+        data = {
+            "pageid": topic + 1000,
+            "ns": 0,
+            "title": title,
+            "displaytitle": title,
+            "pageprops": {"wikibase_item": f"Q{topic + 100}"},
+        }
+        if "langlinks" in props:
+            data["langlinks"] = [
+                {"lang": other, "*": title}
+                for other in self._topic_languages(topic)
+                if other != language
+            ]
+        if "redirects" in props and self._has_alias(topic):
+            data["redirects"] = [{"pageid": topic + 500_000, "ns": 0, "title": f"{title} (alias)"}]
+        return data
+
+    def _link_titles(self: SyntheticWiki, language: str) -> list[str]:
+        try:
+            topics = self._links[language]
+        except KeyError:
+            rng = np.random.default_rng([self.seed, self.languages.index(language)])
+            topics = rng.choice(
+                self._topics, size=self.links, replace=False, p=self._weights
+            ).tolist()
+            self._links[language] = topics
+        return [self._link_title(topic) for topic in topics]
+
+    def _topic_languages(self: SyntheticWiki, topic: int) -> list[str]:
+        popularity = 1 - topic / self._topics
+        return self.languages[: 1 + int((len(self.languages) - 1) * popularity**2)]
+
+    def _link_title(self: SyntheticWiki, topic: int) -> str:
+        if self._has_alias(topic):
+            return f"Topic {topic} (alias)"
+        if topic % 50 == 3:
+            return f"topic {topic}"
+        return f"Topic {topic}"
+
+    def _exists_title(self: SyntheticWiki, title: str) -> bool:
+        match = self.TOPIC.match(title[:1].upper() + title[1:])
+        return match is not None and self._exists(int(match.group(1)))
+
+    @staticmethod
+    def _exists(topic: int) -> bool:
+        return topic % 37 != 5
+
+    @staticmethod
+    def _has_alias(topic: int) -> bool:
+        return topic % 53 == 11
+
+    @staticmethod
+    def _timestamp(language_index: int, revision: int) -> datetime.datetime:
+        # revision 0 is the latest one, like the API lists them
+        latest = datetime.datetime(2021, 6, 1)
+        return latest - datetime.timedelta(days=30 * revision, hours=language_index)
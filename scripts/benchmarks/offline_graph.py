@@ -0,0 +1,75 @@
+"""Build a language graph from SQL dumps, without network access.
+
+Run with ``python -m scripts.benchmarks.offline_graph``. The fixture dumps
+are imported into a temporary store unless ``--store`` points to one built
+with ``python -m scripts.wikilanggraph.wikipedia_dump``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from scripts.wikilanggraph import calculate_dissimilarity_metrics
+from scripts.wikilanggraph import generate_lang_graph
+from scripts.wikilanggraph import initialize_graph
+from scripts.wikilanggraph import initialize_starting_page
+from scripts.wikilanggraph.structures import MultitonScope
+from scripts.wikilanggraph.wikipedia_api import get_data_source
+from scripts.wikilanggraph.wikipedia_api import set_data_source
+from scripts.wikilanggraph.wikipedia_dump import FIXTURE_DUMPS
+from scripts.wikilanggraph.wikipedia_dump import DumpDataSource
+from scripts.wikilanggraph.wikipedia_dump import DumpStore
+
+
+async def build_graph(title: str, language: str) -> None:
+    with MultitonScope():
+        graph = await generate_lang_graph(
+            graph=initialize_graph(),
+            starting_page=initialize_starting_page(language=language, title=title),
+        )
+        metrics = calculate_dissimilarity_metrics(graph=graph)
+    print(
+        f"{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges,"
+        f" {len(graph.language_nodes)} languages, {len(metrics)} scores"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--store", default=None)
+    parser.add_argument("--title", default="Bitwa pod Cedynią")
+    parser.add_argument("--language", default="pl")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.store is None:
+            store = DumpStore(os.path.join(directory, "dumps.sqlite3"))
+            start = time.perf_counter()
+            store.import_dumps(FIXTURE_DUMPS)
+            seconds = time.perf_counter() - start
+            print(f"imported {len(FIXTURE_DUMPS)} fixture dumps in {seconds:.3f} s")
+        else:
+            store = DumpStore(args.store)
+        previous_source = get_data_source()
+        source = DumpDataSource(store)
+        set_data_source(source)
+        try:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                asyncio.run(build_graph(title=args.title, language=args.language))
+            elapsed = time.perf_counter() - start
+        finally:
+            set_data_source(previous_source)
+            store.close()
+    print(
+        f"{elapsed / args.repeat * 1000:.1f} ms per graph,"
+        f" {source.requests / args.repeat:.0f} emulated requests per graph"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measure memory held per Page, including its links and langlinks.
+
+Run with ``python -m scripts.benchmarks.page_memory``. Pages are parsed from
+synthetic API data, so no network access is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+from scripts.wikilanggraph.structures import MultitonScope
+from scripts.wikilanggraph.wikipedia_page import Page
+
+LANGUAGES = ("en", "de", "fr", "pl", "ru", "es", "it", "ja", "zh", "uk")
+
+
+def page_data(i: int, links: int, langlinks: int) -> dict:
+    return {
+        "title": f"Article {i}",
+        "displaytitle": f"Article {i}",
+        "pageprops": {"wikibase_item": f"Q{i}"},
+        # titles repeat across pages like links to popular articles do
+        "links": [{"ns": 0, "title": f"Article {(i * 7 + j) % 5000}"} for j in range(links)],
+        "langlinks": [
+            {"lang": LANGUAGES[j % len(LANGUAGES)], "*": f"Article {i} ({j})"}
+            for j in range(langlinks)
+        ],
+    }
+
+
+def measure(pages: int, links: int, langlinks: int) -> tuple[int, int]:
+    """Return bytes held per page and the number of live Page instances"""
+    data = [page_data(i, links, langlinks) for i in range(pages)]
+    gc.collect()
+    tracemalloc.start()
+    with MultitonScope() as scope:
+        created = []
+        for i, page_json in enumerate(data):
+            page = Page(language="en", title=page_json["title"])
+            page._parse_page_data(data=page_json)
+            created.append(page)
+        # the linked pages are what a fetched graph holds on to
+        linked = [linked_page for page in created for linked_page in page.links]
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+        instances = len(scope.registry(Page.__wrapped__).values())
+    tracemalloc.stop()
+    del linked
+    return size // instances, instances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--links", type=int, default=100)
+    parser.add_argument("--langlinks", type=int, default=20)
+    args = parser.parse_args()
+
+    per_page, instances = measure(args.pages, args.links, args.langlinks)
+    print(f"{instances} pages, {per_page} bytes per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Build renderer columns for growing language graphs.
+
+Run with ``python -m scripts.benchmarks.renderer_data``. The list-lookup
+implementation the View used before is timed on the smaller graphs only.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import networkx as nx
+from bokeh.palettes import Spectral4
+
+from scripts.benchmarks.synthetic import language_graph
+from scripts.view.renderer_data import RendererData
+
+SIZES = ((10, 1_000), (25, 10_000), (100, 50_000), (100, 200_000), (200, 500_000))
+QUADRATIC_EDGES_LIMIT = 10_000
+
+
+def list_lookup_columns(graph: nx.Graph, left_nodes: list, left_colors: list) -> None:
+    visible_right = {node for left in left_nodes for node in graph.neighbors(left)}
+    visibility = [n in visible_right or n in left_nodes for n in graph]
+    colors = [
+        Spectral4[1] if n not in left_nodes else left_colors[left_nodes.index(n)]
+        for n in graph
+    ]
+    max_right_degree = max(graph.degree(n) for n in graph if n not in left_nodes)
+    [
+        0 if visibility[list(graph).index(n)] is False
+        else 0.5 if n in left_nodes
+        else 0.3 + (0.7 * graph.degree(n) / max_right_degree) for n in graph
+    ]
+    edges = list(graph.edges)
+    for e in edges:
+        left_end = e[0] if e[0] in left_nodes else e[1]
+        visibility[list(graph).index(left_end)]
+        colors[list(graph).index(left_end)]
+        edges.index(e)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=20_000, help="number of article nodes")
+    args = parser.parse_args()
+
+    print(f"{'languages':>9} {'edges':>8} {'build [s]':>10} {'select [s]':>10} {'lists [s]':>10}")
+    for languages, edges in SIZES:
+        graph = language_graph(languages=languages, links=args.links, edges=edges)
+        left_nodes = graph.language_nodes
+        left_colors = [Spectral4[i % 4] for i in range(len(left_nodes))]
+
+        started = time.perf_counter()
+        data = RendererData(graph=graph, left_nodes=left_nodes, left_colors=left_colors)
+        data.columns(left_nodes)
+        built = time.perf_counter() - started
+
+        started = time.perf_counter()
+        data.alphas(left_nodes[: len(left_nodes) // 2])
+        selected = time.perf_counter() - started
+
+        lists = "-"
+        if graph.number_of_edges() <= QUADRATIC_EDGES_LIMIT:
+            started = time.perf_counter()
+            list_lookup_columns(graph=graph, left_nodes=left_nodes, left_colors=left_colors)
+            lists = f"{time.perf_counter() - started:.3f}"
+
+        print(
+            f"{languages:>9} {graph.number_of_edges():>8} {built:>10.3f} "
+            f"{selected:>10.4f} {lists:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
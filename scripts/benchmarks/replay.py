@@ -0,0 +1,125 @@
+"""Record the API traffic of an article session into a cassette, and replay it.
+
+Run with ``python -m scripts.benchmarks.replay record CASSETTE --title T
+--language L`` to capture a session against the live API, or against the
+local mock API with ``--mock-languages``/``--mock-links``. Then run
+``python -m scripts.benchmarks.replay replay CASSETTE`` to run the very same
+session offline, instantly or with ``--timing original``. The session loads
+the article like the view does, fetches its latest revisions and moves to a
+few past moments stored in the cassette.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import time
+from typing import Optional
+
+import httpx
+import numpy as np
+
+from scripts.benchmarks.mock_api import MockWikipediaApi
+from scripts.benchmarks.mock_api import SyntheticWiki
+from scripts.wikilanggraph.Model import Model
+from scripts.wikilanggraph.wikipedia_api import RequestScheduler
+from scripts.wikilanggraph.wikipedia_api import recording
+from scripts.wikilanggraph.wikipedia_api import replaying
+from scripts.wikilanggraph.wikipedia_api import set_scheduler
+
+
+async def session(
+    title: str,
+    language: str,
+    moments: Optional[list[datetime.datetime]] = None,
+    timestamps: int = 3,
+    client: Optional[httpx.AsyncClient] = None,
+) -> tuple[dict[str, float], list[datetime.datetime]]:
+    """Run an article session, returning seconds per phase and the moments visited"""
+    model = Model(client=client)
+    seconds = {}
+    try:
+        start = time.perf_counter()
+        await model.get_article_data(article_name=title, article_language=language)
+        seconds["article"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await model.fetch_revisions()
+        seconds["revisions"] = time.perf_counter() - start
+
+        if moments is None:
+            values = model.timestamps.timestamps
+            positions = np.linspace(0, len(values) - 1, num=min(timestamps, len(values)), dtype=int)
+            moments = [values[position].item() for position in positions]
+        start = time.perf_counter()
+        for moment in moments:
+            await model.get_article_timestamp(
+                article_name=title, moment_in_time=moment, article_language=language
+            )
+        seconds["timestamps"] = time.perf_counter() - start
+    finally:
+        await model.close()
+    return seconds, moments
+
+
+def record(args: argparse.Namespace) -> None:
+    client = None
+    if args.mock_languages:
+        wiki = SyntheticWiki(languages=args.mock_languages, links=args.mock_links, title=args.title)
+        client = MockWikipediaApi(wiki, latency=args.mock_latency).client()
+        set_scheduler(RequestScheduler(rate=1e9, burst=1e9, maxlag=None))
+    metadata = {"title": args.title, "language": args.language}
+    with recording(args.cassette, metadata=metadata) as cassette:
+        seconds, moments = asyncio.run(
+            session(args.title, args.language, timestamps=args.timestamps, client=client)
+        )
+        cassette.metadata["moments"] = [moment.isoformat() for moment in moments]
+    print(f"recorded {cassette} in {sum(seconds.values()):.3f} s: {_format(seconds)}")
+
+
+def replay(args: argparse.Namespace) -> None:
+    for _ in range(args.repeat):
+        with replaying(args.cassette, timing=args.timing) as source:
+            metadata = source.cassette.metadata
+            moments = [datetime.datetime.fromisoformat(moment) for moment in metadata["moments"]]
+            seconds, _ = asyncio.run(
+                session(metadata["title"], metadata["language"], moments=moments)
+            )
+        print(
+            f"replayed {source.requests} of {len(source.cassette)} requests"
+            f" in {sum(seconds.values()):.3f} s: {_format(seconds)}"
+        )
+
+
+def _format(seconds: dict[str, float]) -> str:
+    return ", ".join(f"{phase} {value:.3f} s" for phase, value in seconds.items())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record")
+    record_parser.add_argument("cassette")
+    record_parser.add_argument("--title", required=True)
+    record_parser.add_argument("--language", default="en")
+    record_parser.add_argument("--timestamps", type=int, default=3, help="past moments to visit")
+    record_parser.add_argument("--mock-languages", type=int, default=0)
+    record_parser.add_argument("--mock-links", type=int, default=100)
+    record_parser.add_argument("--mock-latency", type=float, default=0.02)
+    record_parser.set_defaults(run=record)
+
+    replay_parser = commands.add_parser("replay")
+    replay_parser.add_argument("cassette")
+    replay_parser.add_argument("--timing", choices=("instant", "original"), default="instant")
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    replay_parser.set_defaults(run=replay)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+__all__ = ["language_graph"]
+
+import numpy as np
+
+from scripts.wikilanggraph.lang_graph import LangGraph
+from scripts.wikilanggraph.structures import NodeKey
+
+
+def language_graph(languages: int, links: int, edges: int, seed: int = 0) -> LangGraph:
+    """Random language graph shaped like the ones built from Wikipedia.
+
+    Language version nodes are NodeKeys named "<item>__<language>" and link to article
+    nodes drawn with a skewed distribution, so a few articles are linked by
+    almost every language version and most by only a few.
+    """
+    rng = np.random.default_rng(seed)
+    graph = LangGraph()
+    link_nodes = [f"Q{i}" for i in range(links)]
+    graph.add_nodes_from(
+        (node, {"page": {"title": node, "description": "Article %s" % node}})
+        for node in link_nodes
+    )
+    weights = 1 / np.arange(1, links + 1)
+    weights /= weights.sum()
+    per_language = min(edges // languages, links)
+    for i in range(languages):
+        language_node = NodeKey(item="Q0", language=f"lang{i}")
+        graph.add_node(
+            language_node, page={"title": language_node, "description": "Language version"}
+        )
+        targets = rng.choice(links, size=per_language, replace=False, p=weights)
+        graph.add_edges_from((language_node, link_nodes[target]) for target in targets)
+    return graph
@@ -1,27 +1,35 @@
+import argparse
 import logging
 import os
+import signal
+from typing import Optional
 
 import asyncio
 
 import httpx
 import networkx as nx
 from bokeh.server.server import Server
-from tornado.ioloop import IOLoop
-from tornado.platform.asyncio import AsyncIOMainLoop
 
 from scripts.wikilanggraph import generate_lang_graph
 from scripts.view.View import View
+from scripts.view.metrics_handler import MetricsHandler
 from scripts.viewmodel.ViewModel import ViewModel
 from scripts.wikilanggraph import enable_logging
 from scripts.wikilanggraph.metrics.dissimilarity import calculate_dissimilarity_metrics
+from scripts.wikilanggraph.lang_graph import enable_graph_cache
 from scripts.wikilanggraph.lang_graph.generate_lang_graph import initialize_graph
 from scripts.wikilanggraph.lang_graph.generate_lang_graph import (
     initialize_starting_page,
 )
+from scripts.wikilanggraph.wikipedia_api import create_client
+from scripts.wikilanggraph.wikipedia_api import enable_response_cache
 from scripts.wikilanggraph.wikipedia_page import Page
 from scripts.wikilanggraph.Model import Model
 
-AsyncIOMainLoop().install()
+PARENT_DIR = os.path.dirname(os.path.realpath(__file__))
+CACHE_DIR = os.path.join(PARENT_DIR, ".cache")
+
+_client: Optional[httpx.AsyncClient] = None
 
 
 async def main() -> int:
@@ -44,7 +52,7 @@ async def main() -> int:
     logging.info("Metrics: \n %s", metrics.to_string())
     logging.info("Timestamps: %s", timestamps)
 
-    async with httpx.AsyncClient() as client:
+    async with create_client() as client:
         tasks = []
         for timestamp in timestamps:
             page = Page(
@@ -62,17 +70,97 @@ async def main() -> int:
 
 
 def init_logging() -> None:
-    parent_dir = os.path.dirname(os.path.realpath(__file__))
-    enable_logging(root_path=parent_dir)
+    enable_logging(root_path=PARENT_DIR)
+
+
+def init_caches(cache_dir: str = CACHE_DIR, graph_cache: bool = True) -> None:
+    # SQLite connections must not cross a fork, every server process opens its own
+    enable_response_cache(path=os.path.join(cache_dir, "responses.sqlite3"))
+    if graph_cache:
+        enable_graph_cache(path=os.path.join(cache_dir, "graphs.sqlite3"))
+
+
+def shared_client() -> httpx.AsyncClient:
+    """HTTP client shared by every session of the server process"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+async def close_shared_client() -> None:
+    if _client is not None:
+        await _client.aclose()
+
+
+def make_document(doc) -> None:
+    # every session gets a model of its own, so sessions never see each other's articles
+    model = Model(client=shared_client())
+    view = View(view_model=ViewModel(model=model))
+    view.modify_doc(doc)
+
+
+def serve(
+    port: int = 5006,
+    address: Optional[str] = None,
+    workers: int = 1,
+    allow_websocket_origin: Optional[list[str]] = None,
+    show: bool = True,
+    cache_dir: str = CACHE_DIR,
+    graph_cache: bool = True,
+) -> None:
+    """Serve the app from a number of worker processes sharing the port and the caches"""
+    server = Server(
+        {"/": make_document},
+        port=port,
+        address=address,
+        num_procs=workers,
+        allow_websocket_origin=allow_websocket_origin,
+        extra_patterns=[(r"/metrics", MetricsHandler)],
+    )
+    # from here on this is one of the worker processes
+    init_caches(cache_dir=cache_dir, graph_cache=graph_cache)
+    server.start()
+    signal.signal(
+        signal.SIGTERM,
+        lambda *_: server.io_loop.add_callback_from_signal(server.io_loop.stop),
+    )
+
+    if show and workers == 1:
+        server.io_loop.add_callback(server.show, "/")
+    try:
+        server.io_loop.start()
+    finally:
+        server.io_loop.run_sync(close_shared_client)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the Wiki-lang-graph app")
+    parser.add_argument("--port", type=int, default=5006)
+    parser.add_argument("--address", default=None)
+    parser.add_argument(
+        "--workers", type=int, default=1, help="server processes, 0 for one per CPU core"
+    )
+    parser.add_argument(
+        "--allow-websocket-origin", action="append", help="host[:port] of a proxy in front"
+    )
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument(
+        "--no-graph-cache", action="store_true", help="build every graph from scratch"
+    )
+    parser.add_argument("--no-show", action="store_true", help="do not open a browser")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
+    args = parse_args()
     init_logging()
-    model = Model()
-    view_model = ViewModel(model=model)
-    view = View(view_model=view_model)
-    server = Server({"/": view.modify_doc}, io_loop=IOLoop.current(), num_procs=1)
-    server.start()
-
-    server.io_loop.add_callback(server.show, "/")
-    server.io_loop.start()
+    serve(
+        port=args.port,
+        address=args.address,
+        workers=args.workers,
+        allow_websocket_origin=args.allow_websocket_origin,
+        show=not args.no_show,
+        cache_dir=args.cache_dir,
+        graph_cache=not args.no_graph_cache,
+    )
@@ -1,7 +1,6 @@
 import logging
-import random
+from functools import partial
 
-import networkx as nx
 from bokeh.document import without_document_lock
 from bokeh.io import curdoc
 from bokeh.layouts import column, row
@@ -23,16 +22,22 @@ from bokeh.models import (
     TextInput,
     CheckboxGroup,
     RadioGroup,
-    Div
+    Div,
+    GraphRenderer,
+    StaticLayoutProvider,
 )
 from bokeh.models import Slider
 from bokeh.models import TableColumn
 from bokeh.palettes import Spectral4
-from bokeh.plotting import from_networkx
 
 from scripts.view.Layouts import degree_bipartite_layout
+from scripts.view.Layouts import streamed_positions
+from scripts.view.renderer_data import RendererData
+from scripts.view.renderer_data import selected_left_nodes
+from scripts.wikilanggraph.instrumentation import span
 
 TITLE = "<b>Wiki-lang-graph</b>"
+TABLE_COLUMNS = ["Language 1", "Language 2", "score"]
 
 
 class View:
@@ -41,78 +46,21 @@ class View:
         self.input_error_message = None
         self.node_renderer_data_source = {}
         self.edge_renderer_data_source = {}
+        self.renderer_data = None
         self.visualization = None
 
     @without_document_lock
     def modify_doc(self, doc):
-        def make_loading_screen():
-            loading_text = Paragraph(text="Loading...")
-            loading_text.sizing_mode = 'stretch_both'
-            screen = loading_text
-            doc.add_root(screen)
-
-        def determine_nodes_visibility(G: nx.Graph, left_nodes):
-            languages_indices = [self.view_model.available_languages.index(lang) for lang in
-                                 set(self.view_model.selected_languages) & set(self.view_model.available_languages)]
-            visible_left_nodes = set(left_nodes[i] for i in languages_indices)
-            visible_right_nodes = set(node for left_node in visible_left_nodes for node in nx.neighbors(G, left_node))
-            visibility = [
-                n in visible_right_nodes or n in visible_left_nodes
-                for n in list(G)
-            ]
-            return visibility
-
-        def init_visualization_data(G, left_nodes, right_nodes, original_nodes_data):
-            self.node_renderer_data_source["index"] = original_nodes_data["index"]
-            self.node_renderer_data_source["page"] = original_nodes_data["page"]
-            self.node_renderer_data_source["name"] = [p["title"] for p in original_nodes_data["page"]]
-            self.node_renderer_data_source["details"] = [p["description"] for p in original_nodes_data["page"]]
-
-            left_colors = self.view_model.colors
-            colors = [
-                Spectral4[1]
-                if n not in left_nodes
-                else left_colors[left_nodes.index(n)]
-                for n in G
-            ]
-            self.node_renderer_data_source["color"] = colors
-
-            self.node_renderer_data_source["visibility"] = determine_nodes_visibility(G=G, left_nodes=left_nodes)
-
-            max_right_degree = max(G.degree(r) for r in right_nodes)
-            alpha = [
-                0 if self.node_renderer_data_source["visibility"][list(G).index(n)] is False
-                else 0.5 if n in left_nodes
-                else 0.3 + (0.7 * G.degree(n) / max_right_degree) for n in G
-            ]
-            self.node_renderer_data_source["alpha"] = alpha
-
-            self.edge_renderer_data_source["start"] = [e[0] for e in G.edges()]
-            self.edge_renderer_data_source["end"] = [e[1] for e in G.edges()]
-            edges_colors = determine_edges_colors(G, left_nodes, colors)
-            self.edge_renderer_data_source["color"] = edges_colors
-
-            edges_visibility = determine_edges_visibility(G, left_nodes, self.node_renderer_data_source["visibility"])
-            edges_alphas = [
-                0 if edges_visibility[list(G.edges).index(e)] is False
-                else 0.5
-                for e in G.edges
-            ]
-            self.edge_renderer_data_source["alpha"] = edges_alphas
-
-        def determine_edges_visibility(G: nx.Graph, left_nodes: list, nodes_visibility: list):
-            visibility = []
-            for e in G.edges:
-                left_end = e[0] if e[0] in left_nodes else e[1]
-                visibility.append(nodes_visibility[list(G).index(left_end)])
-            return visibility
-
-        def determine_edges_colors(G: nx.Graph, left_nodes: list, colors: list):
-            edges_colors = []
-            for e in G.edges:
-                left_end = e[0] if e[0] in left_nodes else e[1]
-                edges_colors.append(colors[list(G).index(left_end)])
-            return edges_colors
+        # Bokeh models are created once per document; interactions only patch
+        # or swap their data instead of clearing and rebuilding the document
+        state = {"rendering": False, "streamed_left": 0, "streamed_right": 0}
+
+        def visible_left_nodes():
+            return selected_left_nodes(
+                left_nodes=self.view_model.left_nodes,
+                available_languages=self.view_model.available_languages,
+                selected_languages=self.view_model.selected_languages,
+            )
 
         def prepare_plot(width=1000, height=600, vertical_margin=10):
             plot = Plot(
@@ -125,26 +73,21 @@ class View:
             plot.sizing_mode = 'stretch_width'
             return plot
 
-        def make_graph():
-            logging.debug("star drawing")
-            G = self.view_model.network
-            left_nodes = self.view_model.left_nodes
-            right_nodes = self.view_model.right_nodes
-
-            width = 1000
-            height = 10 * len(right_nodes)
+        def resize_plot(height, width=1000):
             vertical_margin = 0.1 * width / height
+            plot.plot_height = height
+            plot.y_range.start = -0.5 - vertical_margin
+            plot.y_range.end = 0.5 + vertical_margin
 
-            plot = prepare_plot(width=width, height=height, vertical_margin=vertical_margin)
+        def make_graph():
+            plot = prepare_plot(height=600, vertical_margin=0.1)
 
             plot.add_tools(HoverTool(tooltips=None), TapTool(), BoxSelectTool())
 
-            layout = degree_bipartite_layout(G, left_nodes, right_nodes)
-            graph_renderer = from_networkx(G, layout, scale=1, center=(0, 0))
-            init_visualization_data(G=G, left_nodes=left_nodes, right_nodes=right_nodes,
-                                    original_nodes_data=graph_renderer.node_renderer.data_source.data)
-
-            graph_renderer.node_renderer.data_source.data = self.node_renderer_data_source
+            graph_renderer = GraphRenderer(layout_provider=StaticLayoutProvider(graph_layout={}))
+            graph_renderer.node_renderer.data_source = ColumnDataSource(
+                data=dict(index=[], page=[], name=[], details=[], color=[], visibility=[], alpha=[])
+            )
 
             graph_renderer.node_renderer.glyph = Circle(
                 size=12,
@@ -173,8 +116,9 @@ class View:
                 line_alpha="alpha",
             )
 
-            graph_renderer.edge_renderer.data_source.data = self.edge_renderer_data_source
-            graph_renderer.node_renderer.glyph.properties_with_values()
+            graph_renderer.edge_renderer.data_source = ColumnDataSource(
+                data=dict(start=[], end=[], color=[], alpha=[])
+            )
             graph_renderer.edge_renderer.glyph = MultiLine(
                 line_color="color", line_alpha="alpha", line_width=2
             )
@@ -194,8 +138,142 @@ class View:
             graph_renderer.inspection_policy = NodesAndLinkedEdges()
 
             plot.renderers.append(graph_renderer)
+            return plot, graph_renderer
+
+        def render_network():
+            with span("render network"):
+                _render_network()
+
+        def _render_network():
+            logging.debug("star drawing")
+            G = self.view_model.network
+            left_nodes = self.view_model.left_nodes
+            right_nodes = self.view_model.right_nodes
+
+            layout = degree_bipartite_layout(
+                G, left_nodes, right_nodes, self.view_model.selected_languages
+            )
+            self.renderer_data = RendererData(
+                graph=G, left_nodes=left_nodes, left_colors=self.view_model.colors
+            )
+            self.node_renderer_data_source, self.edge_renderer_data_source = (
+                self.renderer_data.columns(visible_left_nodes())
+            )
+
+            resize_plot(height=max(10 * len(right_nodes), 100))
+            graph_renderer.node_renderer.data_source.data = dict(self.node_renderer_data_source)
+            graph_renderer.edge_renderer.data_source.data = dict(self.edge_renderer_data_source)
+            graph_renderer.layout_provider.graph_layout = layout
+
+            render_controls()
+            set_analysis_visible(True)
             logging.debug("network rendered")
-            return plot
+
+        def render_selection():
+            visibility, alpha, edges_alphas = self.renderer_data.alphas(visible_left_nodes())
+            node_source = graph_renderer.node_renderer.data_source
+            node_source.patch({
+                "visibility": [(slice(len(visibility)), visibility)],
+                "alpha": [(slice(len(alpha)), alpha)],
+            })
+            edge_source = graph_renderer.edge_renderer.data_source
+            edge_source.patch({"alpha": [(slice(len(edges_alphas)), edges_alphas)]})
+            render_metrics()
+
+        def render_metrics():
+            df = self.view_model.filtered_metrics.to_frame().reset_index()
+            df = df.round(3)
+            df = df.rename(columns={'lang_1': 'Language 1', 'lang_2': 'Language 2'})
+            table_source.data = {c: df[c].tolist() for c in TABLE_COLUMNS}
+
+        def render_controls():
+            state["rendering"] = True
+            try:
+                options = self.view_model.available_languages
+                checked = self.view_model.selected_languages
+                checkbox_group.labels = options
+                checkbox_group.active = [options.index(c) for c in set(checked) & set(options)]
+
+                timeline_values = self.view_model.timeline_values
+                selected = self.view_model.selected_timeline_value
+                slider.end = max(len(timeline_values) - 1, 1)
+                if slider.value >= len(timeline_values) or timeline_values[slider.value] != selected:
+                    slider.value = timeline_values.index(selected)
+                timeline_header.text = (
+                    "Select moment in time: %s" % self.view_model.selected_timeline_value
+                )
+            finally:
+                state["rendering"] = False
+            render_metrics()
+
+        def set_analysis_visible(visible):
+            for widget in analysis_widgets:
+                widget.visible = visible
+
+        def apply_delta(delta):
+            with span("apply delta", nodes=len(delta.nodes), edges=len(delta.edges)):
+                _apply_delta(delta)
+
+        def _apply_delta(delta):
+            colors = dict(zip(self.view_model.left_nodes, self.view_model.colors))
+            graph_renderer.node_renderer.data_source.stream(dict(
+                index=[node for node, _ in delta.nodes],
+                page=[data["page"] for _, data in delta.nodes],
+                name=[data["page"]["title"] for _, data in delta.nodes],
+                details=[data["page"]["description"] for _, data in delta.nodes],
+                color=[colors.get(node, Spectral4[1]) for node, _ in delta.nodes],
+                visibility=[True for _ in delta.nodes],
+                alpha=[0.5 for _ in delta.nodes],
+            ))
+            graph_renderer.edge_renderer.data_source.stream(dict(
+                start=[start for start, _ in delta.edges],
+                end=[end for _, end in delta.edges],
+                color=[colors.get(delta.language_node, Spectral4[1]) for _ in delta.edges],
+                alpha=[0.5 for _ in delta.edges],
+            ))
+            # streamed nodes are only placed, the graph is laid out once it is complete
+            layout = graph_renderer.layout_provider.graph_layout
+            link_nodes = [
+                node
+                for node, _ in delta.nodes
+                if node != delta.language_node and node not in layout
+            ]
+            positions = dict(zip(
+                link_nodes, streamed_positions(state["streamed_right"], len(link_nodes), x=1)
+            ))
+            state["streamed_right"] += len(link_nodes)
+            if delta.language_node not in layout:
+                positions[delta.language_node] = streamed_positions(
+                    state["streamed_left"], 1, x=-1
+                )[0]
+                state["streamed_left"] += 1
+            layout.update(positions)
+            progress_text.text = "Loading... %i language versions so far" % len(
+                self.view_model.left_nodes
+            )
+
+        def start_loading():
+            set_analysis_visible(False)
+            error_text.visible = False
+            progress_text.text = "Loading..."
+            progress_text.visible = True
+            resize_plot(height=600)
+            graph_renderer.node_renderer.data_source.data = {
+                k: [] for k in graph_renderer.node_renderer.data_source.data
+            }
+            graph_renderer.edge_renderer.data_source.data = {
+                k: [] for k in graph_renderer.edge_renderer.data_source.data
+            }
+            graph_renderer.layout_provider.graph_layout = {}
+            state["streamed_left"] = state["streamed_right"] = 0
+
+        def finish_loading():
+            progress_text.visible = False
+            if self.input_error_message is not None:
+                error_text.text = self.input_error_message
+                error_text.visible = True
+            elif self.view_model.network is not None:
+                render_network()
 
         def make_timeline_slider():
             header = Paragraph(
@@ -203,14 +281,6 @@ class View:
                      % self.view_model.selected_timeline_value
             )
 
-            selected_index = (
-                0
-                if self.view_model.network is None
-                else self.view_model.timeline_values.index(
-                    self.view_model.selected_timeline_value
-                )
-            )
-
             # slider = DateSlider(
             #     start=self.view_model.timeline_values[0],
             #     end=self.view_model.timeline_values[-1],
@@ -229,32 +299,33 @@ class View:
 
             slider = Slider(
                 start=0,
-                end=len(self.view_model.timeline_values) - 1,
-                value=selected_index,
+                end=1,
+                value=0,
                 show_value=False,
                 step=1,
             )
 
             def update_timeline_value(attr, old, new):
-                index = slider.value
-
+                if state["rendering"]:
+                    return
                 logging.debug("Update timeline value %s", new)
-                # doc.clear()
-                # make_loading_screen()
 
                 async def proceed_update():
-                    doc.clear()
                     new_value = self.view_model.timeline_values[new]
                     self.view_model.selected_timeline_value = new_value
-                    await self.view_model.update_timeline_value()
-                    header.text = f"Select moment in time: {new}"
-                    doc.clear()
-                    self.modify_doc(doc)
+                    header.text = f"Loading moment in time: {new_value}"
+                    try:
+                        await self.view_model.update_timeline_value()
+                    except Exception as e:  # noqa: B902
+                        logging.exception("Could not load moment in time %s", new_value)
+                        header.text = f"Could not load moment in time {new_value}: {e}"
+                        return
+                    render_network()
 
                 curdoc().add_timeout_callback(proceed_update, timeout_milliseconds=0)
 
             slider.on_change("value", update_timeline_value)
-            return column(header, slider)
+            return header, slider
 
         def make_text_input():
             title_input = TextInput(
@@ -263,15 +334,20 @@ class View:
             )
 
             def update_link(attr, old, new):
-                doc.clear()
-                make_loading_screen()
+                start_loading()
 
+                @without_document_lock
                 async def proceed_update():
                     self.view_model.article = new
                     self.input_error_message = None
-                    await self.view_model.update_article()
-                    doc.clear()
-                    self.modify_doc(doc)
+                    try:
+                        async for delta in self.view_model.stream_article():
+                            doc.add_next_tick_callback(partial(apply_delta, delta))
+                    except Exception as e:  # noqa: B902
+                        # whatever failed, the page must not be left loading
+                        logging.exception('Could not load article "%s"', new)
+                        self.input_error_message = f"Could not load the article: {e}"
+                    doc.add_next_tick_callback(finish_loading)
 
                 curdoc().add_next_tick_callback(proceed_update)
 
@@ -283,18 +359,14 @@ class View:
 
         def make_language_checkbox():
             def update_selected(attr, old, new):
-                doc.clear()
-                make_loading_screen()
+                if state["rendering"]:
+                    return
                 selection = [self.view_model.available_languages[i] for i in new]
                 self.view_model.update_selected_languages(selection)
-                doc.clear()
-                self.modify_doc(doc)
+                render_selection()
 
-            options = self.view_model.available_languages
-            checked = self.view_model.selected_languages
-            active = [options.index(c) for c in set(checked) & set(options)]
             checkbox_group = CheckboxGroup(
-                name="languages", labels=options, active=active
+                name="languages", labels=[], active=[]
             )
             checkbox_group.on_change("active", update_selected)
             return checkbox_group
@@ -303,11 +375,9 @@ class View:
             def update_selected(attr, old, new):
                 async def proceed_update():
                     await self.view_model.update_analysis_mode()
-                    doc.clear()
-                    self.modify_doc(doc)
+                    finish_loading()
 
-                doc.clear()
-                make_loading_screen()
+                start_loading()
                 self.view_model.analysis_mode = new
                 curdoc().add_next_tick_callback(proceed_update)
 
@@ -322,101 +392,70 @@ class View:
 
         def make_error_text():
             text_output = Paragraph(
-                text=self.input_error_message, style={"color": "red"}
+                text=self.input_error_message or "", style={"color": "red"}
             )
             return text_output
 
         def make_dissimilarity_table():
-            df = self.view_model.filtered_metrics.to_frame().reset_index()
-            df = df.round(3)
-            df = df.rename(columns={'lang_1': 'Language 1', 'lang_2': 'Language 2'})
-
-            columns = [TableColumn(field=c, title=c) for c in df.columns]
+            columns = [TableColumn(field=c, title=c) for c in TABLE_COLUMNS]
+            source = ColumnDataSource(data={c: [] for c in TABLE_COLUMNS})
             dissimilarity_table = DataTable(
                 columns=columns,
-                source=ColumnDataSource(df),
+                source=source,
                 autosize_mode='fit_viewport',
                 height_policy='fit'
             )
-            return column(
-                make_static_header(text="Dissimilarity score"),
-                dissimilarity_table
+            return source, dissimilarity_table
+
+        error_text = make_error_text()
+        error_text.visible = self.input_error_message is not None
+        progress_text = Paragraph(text="Loading...", visible=False)
+        languages_header = make_static_header("Select from available languages")
+        checkbox_group = make_language_checkbox()
+        timeline_header, slider = make_timeline_slider()
+        table_source, dissimilarity_table = make_dissimilarity_table()
+        table_header = make_static_header(text="Dissimilarity score")
+        plot, graph_renderer = make_graph()
+        analysis_widgets = [
+            languages_header,
+            checkbox_group,
+            timeline_header,
+            slider,
+            table_header,
+            dissimilarity_table,
+        ]
+
+        column1 = column(
+            make_text_input(),
+            error_text,
+            *analysis_widgets,
+            # make_static_header("What kind of analysis is performed?"),
+            # make_analysis_mode_radio(),
+            margin=(10, 10, 10, 0),
+        )
+        column2 = column(
+            # make_static_header("Most different versions: %s %s" % self.view_model.max_metric[0]),
+            # make_static_header("Difference is: %f" % self.view_model.max_metric[1]),
+            progress_text,
+            plot,
+            margin=(10, 10, 10, 0)
+        )
+        column2.sizing_mode = 'stretch_width'
+        doc.add_root(
+            column(
+                make_static_header(TITLE, font_size='120%'),
+                row(
+                    column1,
+                    column2
+                ),
+                margin=(10, 10, 0, 10),
+                sizing_mode='stretch_width'
             )
+        )
 
-        if self.input_error_message is not None:
-            logging.info("There was error")
-            column1 = column(
-                make_text_input(),
-                make_error_text(),
-                margin=(10, 10, 10, 0),
-            )
-            column2 = column(
-                make_static_header("Most different versions: ", color='dark-gray'),
-                make_static_header("Difference is: ", color='dark-gray'),
-                prepare_plot(),
-                margin=(10, 10, 10, 0),
-            )
-            column2.sizing_mode = 'stretch_width'
-            doc.add_root(
-                column(
-                    make_static_header(TITLE, font_size='120%'),
-                    row(
-                        column1,
-                        column2
-                    ),
-                    margin=(10, 10, 0, 10),
-                    sizing_mode='stretch_width'
-                )
-            )
-        elif self.input_error_message is None and self.view_model.network is None:
-            logging.info("current network was None. Display start screen")
-            column1 = column(
-                make_text_input(),
-                margin=(10, 10, 10, 0),
-            )
-            column2 = column(
-                prepare_plot(),
-                margin=(10, 10, 10, 0),
-            )
-            column2.sizing_mode = 'stretch_width'
-            doc.add_root(
-                column(
-                    make_static_header(TITLE, font_size='120%'),
-                    row(
-                        column1,
-                        column2
-                    ),
-                    margin=(10, 10, 0, 10),
-                    sizing_mode='stretch_width'
-                )
-            )
-        else:
+        if self.input_error_message is None and self.view_model.network is not None:
             logging.info("Network was present. Proceed to analysis screen.")
-            column1 = column(
-                make_text_input(),
-                make_static_header("Select from available languages"),
-                make_language_checkbox(),
-                make_timeline_slider(),
-                make_dissimilarity_table(),
-                # make_static_header("What kind of analysis is performed?"),
-                # make_analysis_mode_radio(),
-                margin=(10, 10, 10, 0),
-            )
-            column2 = column(
-                        # make_static_header("Most different versions: %s %s" % self.view_model.max_metric[0]),
-                        # make_static_header("Difference is: %f" % self.view_model.max_metric[1]),
-                        make_graph(),
-                        margin=(10, 10, 10, 0)
-                    )
-            column2.sizing_mode = 'stretch_width'
-            doc.add_root(
-                column(
-                    make_static_header(TITLE, font_size='120%'),
-                    row(
-                        column1,
-                        column2
-                    ),
-                    margin=(10, 10, 0, 10),
-                    sizing_mode='stretch_width'
-                )
-            )
+            render_network()
+        else:
+            logging.info("current network was None. Display start screen")
+            set_analysis_visible(False)
@@ -0,0 +1,22 @@
+from tornado.web import RequestHandler
+
+from scripts.wikilanggraph.monitoring import CONTENT_TYPE
+from scripts.wikilanggraph.monitoring import collect_metrics
+
+
+class MetricsHandler(RequestHandler):
+    """Serves the metrics of the process to Prometheus, next to the Bokeh applications.
+
+    With several worker processes, each scrape is answered by whichever one
+    accepts the connection. Samples carry the pid of that worker, so series of
+    different workers never mix; sum them over the pid label in queries.
+    """
+
+    def get(self):
+        # extra patterns are served by the BokehTornado application itself
+        sessions = {
+            path: len(context.sessions)
+            for path, context in self.application.applications.items()
+        }
+        self.set_header("Content-Type", CONTENT_TYPE)
+        self.write(collect_metrics(sessions=sessions))
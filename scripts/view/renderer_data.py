@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+__all__ = ["RendererData", "selected_left_nodes"]
+
+from collections import Iterable
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+from bokeh.palettes import Spectral4
+
+from scripts.wikilanggraph.lang_graph import CompactGraph
+
+DEFAULT_NODE_COLOR = Spectral4[1]
+LEFT_NODE_ALPHA = 0.5
+EDGE_ALPHA = 0.5
+MIN_RIGHT_NODE_ALPHA = 0.3
+
+
+def selected_left_nodes(
+    left_nodes: list[Hashable], available_languages: list[str], selected_languages: list[str]
+) -> list[Hashable]:
+    """Map selected languages onto the left nodes that represent them"""
+    language_indices = {language: i for i, language in enumerate(available_languages)}
+    return [
+        left_nodes[language_indices[language]]
+        for language in set(selected_languages)
+        if language in language_indices
+    ]
+
+
+class RendererData:
+    """Node and edge columns of the graph renderer built in O(V + E).
+
+    Node positions, the left end of every edge and node degrees are indexed
+    once, so the columns and the visibility-dependent alphas are computed with
+    array operations instead of list lookups per node or edge.
+    """
+
+    def __init__(
+        self: RendererData,
+        graph: nx.Graph,
+        left_nodes: list[Hashable],
+        left_colors: list[str],
+        default_color: str = DEFAULT_NODE_COLOR,
+    ) -> None:
+        self.graph: nx.Graph = graph
+        self.nodes: list[Hashable] = list(graph)
+        if isinstance(graph, CompactGraph):
+            self.node_index: dict[Hashable, int] = graph._index
+            edges = graph.edge_indices
+        else:
+            self.node_index: dict[Hashable, int] = {node: i for i, node in enumerate(self.nodes)}
+            edges = np.array(
+                [(self.node_index[start], self.node_index[end]) for start, end in graph.edges()],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+
+        # color slot of every node: position among the left nodes or the default slot
+        color_slots = np.full(len(self.nodes), len(left_nodes), dtype=np.int64)
+        for slot, node in enumerate(left_nodes):
+            color_slots[self.node_index[node]] = slot
+        self.is_left: np.ndarray = color_slots < len(left_nodes)
+        palette = np.empty(len(left_nodes) + 1, dtype=object)
+        palette[:len(left_colors)] = left_colors
+        palette[len(left_colors):] = default_color
+        self.node_colors: np.ndarray = palette[color_slots]
+
+        self.edge_starts: np.ndarray = edges[:, 0]
+        self.edge_ends: np.ndarray = edges[:, 1]
+        starts_left = self.is_left[self.edge_starts]
+        self.edge_left_ends: np.ndarray = np.where(starts_left, self.edge_starts, self.edge_ends)
+        self.edge_right_ends: np.ndarray = np.where(starts_left, self.edge_ends, self.edge_starts)
+
+        self.degrees: np.ndarray = np.bincount(edges.ravel(), minlength=len(self.nodes))
+        right_degrees = self.degrees[~self.is_left]
+        self.max_right_degree: int = max(right_degrees.max(initial=0), 1)
+
+    def __len__(self: RendererData) -> int:
+        return len(self.nodes)
+
+    def columns(
+        self: RendererData, visible_left_nodes: Iterable[Hashable]
+    ) -> tuple[dict[str, object], dict[str, object]]:
+        """Return node and edge columns for a language selection"""
+        visibility, alpha, edges_alpha = self.alphas(visible_left_nodes)
+        pages = [page for _, page in self.graph.nodes(data="page")]
+        nodes = np.empty(len(self.nodes), dtype=object)
+        nodes[:] = self.nodes
+        node_columns = {
+            "index": self.nodes,
+            "page": pages,
+            "name": [page["title"] for page in pages],
+            "details": [page["description"] for page in pages],
+            "color": self.node_colors,
+            "visibility": visibility,
+            "alpha": alpha,
+        }
+        edge_columns = {
+            "start": nodes[self.edge_starts],
+            "end": nodes[self.edge_ends],
+            "color": self.node_colors[self.edge_left_ends],
+            "alpha": edges_alpha,
+        }
+        return node_columns, edge_columns
+
+    def alphas(
+        self: RendererData, visible_left_nodes: Iterable[Hashable]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return node visibility, node alphas and edge alphas for a language selection"""
+        visibility = np.zeros(len(self.nodes), dtype=bool)
+        visibility[[self.node_index[node] for node in visible_left_nodes]] = True
+        edges_visibility = visibility[self.edge_left_ends]
+        visibility[self.edge_right_ends[edges_visibility]] = True
+
+        alpha = np.where(
+            self.is_left,
+            LEFT_NODE_ALPHA,
+            MIN_RIGHT_NODE_ALPHA
+            + (1 - MIN_RIGHT_NODE_ALPHA) * self.degrees / self.max_right_degree,
+        )
+        alpha[~visibility] = 0
+        edges_alpha = np.where(edges_visibility, EDGE_ALPHA, 0.0)
+        return visibility, alpha, edges_alpha
@@ -1,8 +1,16 @@
 import logging
 import random
 import time
+from typing import AsyncIterator
 
 from scripts.viewmodel.backlinks import AnalysisMode
+from scripts.wikilanggraph.instrumentation import span
+from scripts.wikilanggraph.monitoring import ARTICLE_LOAD
+from scripts.wikilanggraph.monitoring import TIMELINE_UPDATE
+from scripts.wikilanggraph.monitoring import timed
+from scripts.wikilanggraph.lang_graph import GraphDelta
+from scripts.wikilanggraph.lang_graph import language_nodes
+from scripts.wikilanggraph.lang_graph import link_nodes
 
 right_node_count = 50
 left_node_count = 3
@@ -30,39 +38,43 @@ class ViewModel:
         self.max_metric = None
 
     async def update_article(self):
+        async for _ in self.stream_article():
+            pass
+
+    async def stream_article(self) -> AsyncIterator[GraphDelta]:
+        with span("update article", article=self.article), timed(ARTICLE_LOAD):
+            async for delta in self._stream_article():
+                yield delta
+
+    async def _stream_article(self) -> AsyncIterator[GraphDelta]:
         logging.debug("Update link")
         logging.debug("article and language: %s" % self.article)
         article_name, language = self._parse_article_name()
-        await self.model.get_article_data(
+        self.colors = []
+        deltas = self.model.stream_article_data(
             article_name=article_name,
             article_language=language
         )
+        async for delta in deltas:
+            self._update_network()
+            self._assign_colors()
+            yield delta
         await self.model.fetch_revisions()
         self._update_network()
-        self.colors = ["#%06x" % random.randint(0, 0xFFFFFF) for _ in self.left_nodes]
-        self.available_languages = [str(node).split("__")[1] for node in self.left_nodes]
+        self._assign_colors()
+        self.available_languages = [node.language for node in self.left_nodes]
         self.selected_languages = self.available_languages
         self.filtered_metrics = self.model.metrics.sort_values(ascending=False)
         self.max_metric = [self.filtered_metrics.index[0], self.filtered_metrics[0]]
-        self.timeline_values = [t.timestamp for t in self.model.timestamps]
+        self.timeline_values = self.model.timestamps.timestamps.tolist()
         self.selected_timeline_value = self.timeline_values[0]
 
     def update_selected_languages(self, selected):
         logging.debug("selected languages: %s", selected)
-        self.selected_languages = selected
-
-        # slightly ugly solution to cope with new names for left nodes
-        # selected languages must be updated somehow, to avoid situation
-        # where there is less left nodes than selected languages to render plot properly
-        self.available_languages = [str(node).split("__")[1] for node in self.left_nodes]
-        initially_selected = selected
-
-        self.selected_languages = [lang for lang in self.available_languages for s_lang in self.selected_languages if lang.startswith(s_lang)]
+        self.available_languages = [node.language for node in self.left_nodes]
+        self.selected_languages = [l for l in selected if l in self.available_languages]
         self._find_metrics_by_languages()
 
-        self.available_languages = [str(node).split("__")[1].split(' ~ ')[0] for node in self.left_nodes]
-        self.selected_languages = [l for l in initially_selected if l in self.available_languages]
-
     async def update_analysis_mode(self):
         logging.debug(self.analysis_mode)
         article_name, language = self._parse_article_name()
@@ -78,6 +90,11 @@ class ViewModel:
         self._find_metrics_by_languages()
 
     async def update_timeline_value(self):
+        moment = self.selected_timeline_value
+        with span("update timeline value", moment=moment), timed(TIMELINE_UPDATE):
+            await self._update_timeline_value()
+
+    async def _update_timeline_value(self):
         logging.debug("Timestamp: %s" % self.selected_timeline_value)
         article_name, language = self._parse_article_name()
         await self.model.get_article_timestamp(
@@ -86,29 +103,27 @@ class ViewModel:
             moment_in_time=self.selected_timeline_value
         )
         self._update_network()
-
-        # slightly ugly solution to cope with new names for left nodes
-        # selected languages must be updated somehow, to avoid situation
-        # where there is less left nodes than selected languages to render plot properly
-        self.available_languages = [str(node).split("__")[1] for node in self.left_nodes]
-        initially_selected = self.selected_languages
-
-        self.selected_languages = [lang for lang in self.available_languages for s_lang in self.selected_languages if s_lang in lang]
+        self.available_languages = [node.language for node in self.left_nodes]
+        self.selected_languages = [l for l in self.selected_languages if l in self.available_languages]
         self._find_metrics_by_languages()
 
-        self.available_languages = [str(node).split("__")[1].split(' ~ ')[0] for node in self.left_nodes]
-        self.selected_languages = [l for l in initially_selected if l in self.available_languages]
-
     def _update_network(self):
         self.network = self.model.network
-        self.left_nodes = [node for node in self.network if "__" in node]
-        self.right_nodes = [node for node in self.network if "__" not in node]
+        self.left_nodes = language_nodes(self.network)
+        self.right_nodes = link_nodes(self.network)
+
+    def _assign_colors(self):
+        new_left_nodes = self.left_nodes[len(self.colors):]
+        self.colors += ["#%06x" % random.randint(0, 0xFFFFFF) for _ in new_left_nodes]
 
     def _find_metrics_by_languages(self):
         metrics = self.model.metrics
+        # metrics are labelled by language and, for past revisions, timestamp
+        selected = set(self.selected_languages)
+        labels = [node.label for node in self.left_nodes if node.language in selected]
         self.filtered_metrics = metrics[
-            metrics.index.get_level_values('lang_1').isin(self.selected_languages)
-            & metrics.index.get_level_values('lang_2').isin(self.selected_languages)
+            metrics.index.get_level_values('lang_1').isin(labels)
+            & metrics.index.get_level_values('lang_2').isin(labels)
             ].sort_values(ascending=False)
 
         self.max_metric = \
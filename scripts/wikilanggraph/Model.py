@@ -3,83 +3,177 @@ import asyncio
 import httpx
 import networkx as nx
 import logging
+from typing import AsyncIterator
+from typing import Optional
 
-from scripts.wikilanggraph import generate_lang_graph, calculate_dissimilarity_metrics
+from scripts.wikilanggraph import calculate_dissimilarity_metrics
 from scripts.wikilanggraph import initialize_graph
 from scripts.wikilanggraph import initialize_starting_page
-from scripts.wikilanggraph.lang_graph.generate_lang_graph import add_page_to_graph
+from scripts.wikilanggraph.instrumentation import span
+from scripts.wikilanggraph.lang_graph import CompactGraph
+from scripts.wikilanggraph.lang_graph import GraphDelta
+from scripts.wikilanggraph.lang_graph import generate_lang_graph_deltas
+from scripts.wikilanggraph.lang_graph import get_graph_cache
+from scripts.wikilanggraph.lang_graph.generate_lang_graph import add_page_with_links_to_graph
+from scripts.wikilanggraph.lang_graph.generate_lang_graph import as_completed_bounded
+from scripts.wikilanggraph.lang_graph.generate_lang_graph import fetch_revision_page
+from scripts.wikilanggraph.metrics import IncrementalDissimilarity
+from scripts.wikilanggraph.monitoring import observe_graph
+from scripts.wikilanggraph.structures import MultitonScope
+from scripts.wikilanggraph.wikipedia_api import create_client
+from scripts.wikilanggraph.wikipedia_api import get_response_cache
+from scripts.wikilanggraph.wikipedia_api import get_scheduler
 from scripts.wikilanggraph.wikipedia_page import Page
-from scripts.wikilanggraph.wikipedia_page import RevisionKeys
+from scripts.wikilanggraph.wikipedia_page import TimelineIndex
 
 logger = logging.getLogger(__name__)
 
 
 class Model:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         self.network = None
         self.metrics = None
         self.df = None
         self.timestamps = None
+        self.timeline_index = None
+        self._client = client
+        self._dissimilarity = IncrementalDissimilarity()
+        # pages of the analysed article, released as soon as another article is loaded
+        self._pages = MultitonScope()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = create_client()
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def fetch_revisions(self):
+        with self._pages, span("revisions"):
+            await self._fetch_revisions()
+
+    async def _fetch_revisions(self):
         self.timestamps = self.timestamps[:20]
-        async with httpx.AsyncClient() as client:
-            tasks = []
-            for timestamp in self.timestamps:
-                page = Page(
-                    title=timestamp.title,
-                    language=timestamp.language,
-                    revision=timestamp.oldid,
-                    timestamp=timestamp.timestamp,
-                )
-
-                task = page.fetch_page(client=client, make_unique=True)
-                tasks.append(task)
-            await asyncio.gather(*tasks)
+        tasks = []
+        for timestamp in self.timestamps:
+            page = Page(
+                title=timestamp.title,
+                language=timestamp.language,
+                revision=timestamp.oldid,
+                timestamp=timestamp.timestamp,
+            )
+
+            task = page.fetch_page(client=self.client, make_unique=True)
+            tasks.append(task)
+        await asyncio.gather(*tasks)
 
     async def get_article_timestamp(self, article_name: str, moment_in_time: str, article_language='en'):
-        async with httpx.AsyncClient() as client:
-            graph = initialize_graph()
-            starting_page = initialize_starting_page(
-                language=article_language, title=article_name
+        with self._pages, span("article timestamp", title=article_name, moment=moment_in_time):
+            await self._get_article_timestamp(
+                article_name=article_name,
+                moment_in_time=moment_in_time,
+                article_language=article_language,
             )
-            languages_to_revisions = starting_page.timepoints_all_languages_as_dict
-
-            for language, revisions in languages_to_revisions.items():
-                past_revisions = RevisionKeys(revision for revision in revisions if revision.timestamp <= moment_in_time)
-                if not past_revisions:
-                    logger.warning("At time %s, the article %s was not available in language %s", str(moment_in_time), starting_page.title, language)
-                    continue
-                nearest_revision = max(past_revisions, key=lambda x: x.timestamp)
-                nearest_revision_page = Page(
-                    language=nearest_revision.language,
-                    title=nearest_revision.title,
-                    revision=nearest_revision.oldid,
-                    timestamp=nearest_revision.timestamp,
-                )
-                await nearest_revision_page.fetch_page(client=client, make_unique=True)
-                await nearest_revision_page.fetch_links(client=client)
-                nearest_revision_page._links.remove_nonexistent()
-
-                add_page_to_graph(graph=graph, page=nearest_revision_page)
-                graph.add_nodes_from(nearest_revision_page.links_as_graph_nodes)
-                graph.add_edges_from(nearest_revision_page.links_as_graph_edges)
 
-        self.metrics = calculate_dissimilarity_metrics(graph=graph)
-        self.network = graph
+    async def _get_article_timestamp(self, article_name: str, moment_in_time: str, article_language='en'):
+        # graphs built by any server process are shared through the graph cache
+        cache = get_graph_cache()
+        graph = None
+        if cache is not None:
+            graph = await cache.get(article_language, article_name, moment=moment_in_time)
+        if graph is None:
+            graph = await self._build_revision_graph(
+                article_name=article_name,
+                moment_in_time=moment_in_time,
+                article_language=article_language,
+            )
+            if cache is not None:
+                await cache.put(article_language, article_name, graph, moment=moment_in_time)
 
-    async def get_article_data(self, article_name: str, article_language='en'):
+        self._dissimilarity.update_from_graph(graph=graph)
+        self.metrics = self._dissimilarity.scores()
+        observe_graph(graph)
+        self.network = CompactGraph.from_networkx(graph)
+
+    async def _build_revision_graph(self, article_name: str, moment_in_time: str, article_language='en') -> nx.Graph:
+        client = self.client
+        graph = initialize_graph()
+        starting_page = initialize_starting_page(
+            language=article_language, title=article_name
+        )
+        if self.timeline_index is None:
+            self.timeline_index = TimelineIndex.from_page(starting_page)
+
+        nearest_revisions = []
+        for language, nearest_revision in self.timeline_index.nearest_revisions(moment_in_time).items():
+            if nearest_revision is None:
+                logger.warning("At time %s, the article %s was not available in language %s", str(moment_in_time), starting_page.title, language)
+                continue
+            nearest_revisions.append(nearest_revision)
+
+        revision_pages = as_completed_bounded(
+            fetch_revision_page(client=client, revision=revision) for revision in nearest_revisions
+        )
+        try:
+            async for nearest_revision_page in revision_pages:
+                if nearest_revision_page is not None:
+                    add_page_with_links_to_graph(graph=graph, page=nearest_revision_page)
+        finally:
+            await revision_pages.aclose()
+        return graph
+
+    async def stream_article_data(self, article_name: str, article_language='en') -> AsyncIterator[GraphDelta]:
+        self._pages = MultitonScope()
+        with self._pages, span("article", title=article_name, language=article_language):
+            async for delta in self._stream_article_data(
+                article_name=article_name, article_language=article_language
+            ):
+                yield delta
+
+    async def _stream_article_data(self, article_name: str, article_language='en') -> AsyncIterator[GraphDelta]:
+        cache = get_graph_cache()
+        cached = None if cache is None else await cache.get(article_language, article_name)
+        if cached is not None:
+            # the whole graph is there at once, so there is nothing to stream
+            self.network, self.metrics, self.timestamps, self.timeline_index = cached
+            self._dissimilarity = IncrementalDissimilarity()
+            return
         graph = initialize_graph()
+        self.network = graph
         starting_page = initialize_starting_page(
             language=article_language, title=article_name
         )
-        graph = await generate_lang_graph(
-            graph=graph, starting_page=starting_page, languages=None # ('pl', 'ru', 'fr', 'simple') # ('pl', 'en', 'de', 'ru', 'fr', 'simple')
+        deltas = generate_lang_graph_deltas(
+            graph=graph, starting_page=starting_page, languages=None, # ('pl', 'ru', 'fr', 'simple') # ('pl', 'en', 'de', 'ru', 'fr', 'simple')
+            client=self.client,
         )
+        async for delta in deltas:
+            yield delta
         self.metrics = calculate_dissimilarity_metrics(graph=graph)
+        self._dissimilarity = IncrementalDissimilarity()
         self.timestamps = starting_page.timepoints_all_languages
-        self.network = graph
+        self.timeline_index = TimelineIndex.from_page(starting_page)
 
         logger.info("Graph: \n %s", nx.info(graph))
         logger.info("Metrics: \n %s", self.metrics.to_string())
         logger.info("Timestamps: %s", self.timestamps)
+        logger.info("Response cache: %s", get_response_cache())
+        logger.info("Request scheduler: %s", get_scheduler())
+        logger.info("Pages: %s", self._pages)
+        observe_graph(graph)
+        # the finished graph is only read from now on, keep it in the compact form
+        self.network = CompactGraph.from_networkx(graph)
+        if cache is not None:
+            await cache.put(
+                article_language,
+                article_name,
+                (self.network, self.metrics, self.timestamps, self.timeline_index),
+            )
+
+    async def get_article_data(self, article_name: str, article_language='en'):
+        async for _ in self.stream_article_data(article_name=article_name, article_language=article_language):
+            pass
@@ -0,0 +1,19 @@
+__all__ = [
+    "Span",
+    "Tracer",
+    "count",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "get_tracer",
+    "span",
+    "traced",
+]
+
+from scripts.wikilanggraph.instrumentation.tracer import Span
+from scripts.wikilanggraph.instrumentation.tracer import Tracer
+from scripts.wikilanggraph.instrumentation.tracer import count
+from scripts.wikilanggraph.instrumentation.tracer import disable_instrumentation
+from scripts.wikilanggraph.instrumentation.tracer import enable_instrumentation
+from scripts.wikilanggraph.instrumentation.tracer import get_tracer
+from scripts.wikilanggraph.instrumentation.tracer import span
+from scripts.wikilanggraph.instrumentation.tracer import traced
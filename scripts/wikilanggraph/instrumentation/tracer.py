@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "count",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "get_tracer",
+    "span",
+    "traced",
+]
+
+import asyncio
+import atexit
+import json
+import logging
+import itertools
+import os
+import threading
+import time
+import weakref
+from collections import Callable
+from collections import Iterator
+from collections import defaultdict
+from collections import deque
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+Seconds = float
+
+DEFAULT_MAX_EVENTS = 100_000
+DEFAULT_SUMMARY_MIN_DURATION: Seconds = 0.1
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_NO_SPAN = nullcontext()
+
+
+class Span:
+    """A timed stage of work, nested in the span that was current when it started.
+
+    Spans started while another one is current, also in tasks created then,
+    are its children. The outermost span, the root, gathers the time spent
+    in every stage below it and the counters increased meanwhile.
+    """
+
+    __slots__ = (
+        "tracer", "name", "args", "parent", "root", "start", "thread", "stages", "counters"
+    )
+
+    def __init__(self: Span, tracer: Tracer, name: str, args: dict[str, Any]) -> None:
+        self.tracer: Tracer = tracer
+        self.name: str = name
+        self.args: dict[str, Any] = args
+        self.parent: Optional[Span] = None
+        self.root: Span = self
+        self.start: int = 0
+        self.thread: int = 0
+        self.stages: Optional[defaultdict[str, list]] = None
+        self.counters: Optional[defaultdict[str, int]] = None
+
+    def __repr__(self: Span) -> str:
+        return f"Span(name={self.name}, args={self.args})"
+
+    def __enter__(self: Span) -> Span:
+        self.parent = _current_span.get()
+        if self.parent is None:
+            self.stages = defaultdict(lambda: [0, 0])
+            self.counters = defaultdict(int)
+        else:
+            self.root = self.parent.root
+        self.thread = self.tracer.thread_id()
+        _current_span.set(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self: Span, *exc_info: Any) -> None:
+        duration = time.perf_counter_ns() - self.start
+        # spans may be left in another step of an async generator, so no context tokens
+        _current_span.set(self.parent)
+        self.tracer.finish(self, duration)
+
+
+class Tracer:
+    """Collects spans as Chrome trace events and sums up each root span in the logs"""
+
+    def __init__(
+        self: Tracer,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        summary_min_duration: Seconds = DEFAULT_SUMMARY_MIN_DURATION,
+    ) -> None:
+        self.summary_min_duration: Seconds = summary_min_duration
+        self.events: deque[tuple[str, int, int, int, dict[str, Any]]] = deque(maxlen=max_events)
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self._started: int = time.perf_counter_ns()
+        # rows of finished tasks are let go together with the tasks
+        self._tasks: weakref.WeakKeyDictionary[asyncio.Task, int] = weakref.WeakKeyDictionary()
+        self._threads: dict[int, int] = {}
+        self._rows: Iterator[int] = itertools.count(1)
+
+    def __repr__(self: Tracer) -> str:
+        return f"Tracer(events={len(self.events)}, counters={dict(self.counters)})"
+
+    def span(self: Tracer, name: str, **args: Any) -> Span:
+        return Span(self, name, args)
+
+    def count(self: Tracer, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+        current = _current_span.get()
+        if current is not None:
+            current.root.counters[name] += value
+
+    def thread_id(self: Tracer) -> int:
+        """Small number of the asyncio task or thread running, a row of the trace"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            rows, key = self._tasks, task
+        else:
+            rows, key = self._threads, threading.get_ident()
+        try:
+            return rows[key]
+        except KeyError:
+            thread = rows[key] = next(self._rows)
+            return thread
+
+    def finish(self: Tracer, span: Span, duration: int) -> None:
+        self.events.append((span.name, span.thread, span.start, duration, span.args))
+        stage = span.root.stages[span.name]
+        stage[0] += duration
+        stage[1] += 1
+        if span.parent is None and duration / 1e9 >= self.summary_min_duration:
+            logger.info("%s", self.summary(span, duration))
+
+    @staticmethod
+    def summary(root: Span, duration: int) -> str:
+        stages = ", ".join(
+            f"{name} {total / 1e9:.3f} s" + (f" in {calls}" if calls > 1 else "")
+            for name, (total, calls) in sorted(
+                root.stages.items(), key=lambda item: item[1][0], reverse=True
+            )
+            if name != root.name
+        )
+        counters = ", ".join(f"{name}={value}" for name, value in sorted(root.counters.items()))
+        summary = f"{root.name} took {duration / 1e9:.3f} s"
+        if stages:
+            # stages of concurrent tasks overlap, so their times may add up to more
+            summary += f" - summed over spans: {stages}"
+        if counters:
+            summary += f" - {counters}"
+        return summary
+
+    def to_chrome_trace(self: Tracer) -> dict[str, Any]:
+        """Events in the Chrome trace format, also opened by speedscope and Perfetto"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "pid": pid,
+                "tid": thread,
+                "ts": (start - self._started) / 1e3,
+                "dur": duration / 1e3,
+                "args": {key: str(value) for key, value in args.items()},
+            }
+            for name, thread, start, duration, args in self.events
+        ]
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread,
+                "args": {"name": f"task {thread}"},
+            }
+            for thread in {event[1] for event in self.events}
+        )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(self.counters)},
+        }
+
+    def save(self: Tracer, path: str) -> None:
+        """Save the trace, named after the process, which may be one of many server workers"""
+        root, extension = os.path.splitext(path)
+        path = f"{root}.{os.getpid()}{extension}"
+        os.makedirs(os.path.dirname(os.path.realpath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file)
+        logger.info('Saved %s to "%s"', self, path)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **args: Any) -> AbstractContextManager:
+    """Time the block as a stage of the current span, doing nothing while disabled"""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return Span(tracer, name, args)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increase a counter of the current root span, doing nothing while disabled"""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, value)
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Time every call of the decorated function or coroutine function as a span"""
+
+    def decorator(function: Callable) -> Callable:
+        label = name or function.__qualname__
+
+        if asyncio.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return await function(*args, **kwargs)
+                with Span(_tracer, label, {}):
+                    return await function(*args, **kwargs)
+
+        else:
+
+            @wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return function(*args, **kwargs)
+                with Span(_tracer, label, {}):
+                    return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enable_instrumentation(
+    max_events: int = DEFAULT_MAX_EVENTS,
+    summary_min_duration: Seconds = DEFAULT_SUMMARY_MIN_DURATION,
+    trace_file: Optional[str] = None,
+) -> Tracer:
+    """Start tracing, saving the trace next to trace_file, if given, when the process exits"""
+    global _tracer
+    _tracer = Tracer(max_events=max_events, summary_min_duration=summary_min_duration)
+    if trace_file is not None:
+        atexit.register(_tracer.save, trace_file)
+    logger.info("Enabled instrumentation %s", _tracer)
+    return _tracer
+
+
+def disable_instrumentation() -> None:
+    global _tracer
+    _tracer = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
@@ -1,4 +1,25 @@
-__all__ = ["LangGraph", "generate_lang_graph"]
+__all__ = [
+    "CompactGraph",
+    "GraphCache",
+    "GraphDelta",
+    "LangGraph",
+    "disable_graph_cache",
+    "enable_graph_cache",
+    "generate_lang_graph",
+    "generate_lang_graph_deltas",
+    "get_graph_cache",
+    "language_nodes",
+    "link_nodes",
+]
 
+from scripts.wikilanggraph.lang_graph.compact_graph import CompactGraph
+from scripts.wikilanggraph.lang_graph.graph_cache import GraphCache
+from scripts.wikilanggraph.lang_graph.graph_cache import disable_graph_cache
+from scripts.wikilanggraph.lang_graph.graph_cache import enable_graph_cache
+from scripts.wikilanggraph.lang_graph.graph_cache import get_graph_cache
+from scripts.wikilanggraph.lang_graph.graph_delta import GraphDelta
 from scripts.wikilanggraph.lang_graph.lang_graph import LangGraph
+from scripts.wikilanggraph.lang_graph.lang_graph import language_nodes
+from scripts.wikilanggraph.lang_graph.lang_graph import link_nodes
 from scripts.wikilanggraph.lang_graph.generate_lang_graph import generate_lang_graph
+from scripts.wikilanggraph.lang_graph.generate_lang_graph import generate_lang_graph_deltas
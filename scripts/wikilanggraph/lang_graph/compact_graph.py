@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+__all__ = ["CompactGraph"]
+
+from collections import Iterable
+from collections import Iterator
+from typing import Any
+from typing import Hashable
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+from scripts.wikilanggraph.instrumentation import traced
+from scripts.wikilanggraph.lang_graph.lang_graph import LangGraph
+from scripts.wikilanggraph.structures.node_key import NodeKey
+
+Node = Hashable
+
+
+class CompactGraph:
+    """Immutable undirected graph with integer-indexed nodes and CSR adjacency.
+
+    Nodes live in a table mapping them to consecutive integers, the adjacency
+    of node ``i`` is ``indices[indptr[i]:indptr[i + 1]]`` and node attributes
+    are kept in per-attribute columns. This takes a few bytes per edge instead
+    of the dict-of-dicts of ``nx.Graph``. The read-only part of the
+    ``nx.Graph`` API used by the metrics, the layouts and the view is
+    provided, and ``to_networkx`` converts back when anything else is needed.
+    """
+
+    def __init__(
+        self: CompactGraph,
+        nodes: Sequence[Node],
+        edges: np.ndarray,
+        node_columns: Optional[Mapping[str, Sequence[Any]]] = None,
+    ) -> None:
+        self._nodes: np.ndarray = np.empty(len(nodes), dtype=object)
+        self._nodes[:] = list(nodes)
+        self._index: dict[Node, int] = {node: i for i, node in enumerate(self._nodes.tolist())}
+        if len(self._index) != len(self._nodes):
+            raise ValueError("CompactGraph nodes must be unique")
+        self._is_language: np.ndarray = np.fromiter(
+            (isinstance(node, NodeKey) for node in self._index),
+            dtype=bool,
+            count=len(self._nodes),
+        )
+        self._columns: dict[str, np.ndarray] = {}
+        for name, values in (node_columns or {}).items():
+            column = np.empty(len(self._nodes), dtype=object)
+            column[:] = list(values)
+            self._columns[name] = column
+
+        # every undirected edge once, as (lower index, higher index)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        self._edges: np.ndarray = edges
+        loops = edges[:, 0] == edges[:, 1]
+        sources = np.concatenate([edges[:, 0], edges[~loops, 1]])
+        targets = np.concatenate([edges[:, 1], edges[~loops, 0]])
+        order = np.lexsort((targets, sources))
+        self._indices: np.ndarray = targets[order]
+        self._indptr: np.ndarray = np.zeros(len(self._nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self._nodes)), out=self._indptr[1:])
+        # like networkx, a self-loop adds two to the degree of its node
+        self._degrees: np.ndarray = np.diff(self._indptr) + np.bincount(
+            edges[loops, 0], minlength=len(self._nodes)
+        )
+
+    @classmethod
+    def from_edges(
+        cls: type[CompactGraph],
+        edges: Iterable[tuple[Node, Node]],
+        nodes: Optional[Iterable[Union[Node, tuple[Node, dict[str, Any]]]]] = None,
+    ) -> CompactGraph:
+        """Build a graph the way ``nx.Graph.add_nodes_from``/``add_edges_from`` would"""
+        index: dict[Node, int] = {}
+        data: dict[Node, dict[str, Any]] = {}
+        for item in nodes or ():
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], dict):
+                node, attributes = item
+                data.setdefault(node, {}).update(attributes)
+            else:
+                node = item
+            index.setdefault(node, len(index))
+        edge_indices = [
+            (index.setdefault(start, len(index)), index.setdefault(end, len(index)))
+            for start, end in edges
+        ]
+        names = list(dict.fromkeys(name for attributes in data.values() for name in attributes))
+        return cls(
+            nodes=list(index),
+            edges=np.array(edge_indices, dtype=np.int64),
+            node_columns={
+                name: [data.get(node, {}).get(name) for node in index] for name in names
+            },
+        )
+
+    @classmethod
+    @traced("compact graph")
+    def from_networkx(cls: type[CompactGraph], graph: nx.Graph) -> CompactGraph:
+        return cls.from_edges(edges=graph.edges(), nodes=graph.nodes(data=True))
+
+    def to_networkx(self: CompactGraph) -> LangGraph:
+        graph = LangGraph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def __repr__(self: CompactGraph) -> str:
+        return (
+            f"CompactGraph(nodes={self.number_of_nodes()}, edges={self.number_of_edges()}, "
+            f"columns={list(self._columns)})"
+        )
+
+    def __len__(self: CompactGraph) -> int:
+        return len(self._nodes)
+
+    def __iter__(self: CompactGraph) -> Iterator[Node]:
+        return iter(self._nodes.tolist())
+
+    def __contains__(self: CompactGraph, node: Node) -> bool:
+        try:
+            return node in self._index
+        except TypeError:
+            return False
+
+    @property
+    def nodes(self: CompactGraph) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def edges(self: CompactGraph) -> _EdgeView:
+        return _EdgeView(self)
+
+    @property
+    def degree(self: CompactGraph) -> _DegreeView:
+        return _DegreeView(self)
+
+    @property
+    def language_nodes(self: CompactGraph) -> list[NodeKey]:
+        return self._nodes[self._is_language].tolist()
+
+    @property
+    def link_nodes(self: CompactGraph) -> list[Node]:
+        return self._nodes[~self._is_language].tolist()
+
+    @property
+    def languages(self: CompactGraph) -> dict[str, NodeKey]:
+        """Map languages to their language version nodes"""
+        return {node.language: node for node in self.language_nodes}
+
+    @property
+    def is_language(self: CompactGraph) -> np.ndarray:
+        """Boolean mask of language version nodes over node indices"""
+        return self._is_language
+
+    @property
+    def indptr(self: CompactGraph) -> np.ndarray:
+        return self._indptr
+
+    @property
+    def indices(self: CompactGraph) -> np.ndarray:
+        return self._indices
+
+    @property
+    def degrees(self: CompactGraph) -> np.ndarray:
+        return self._degrees
+
+    @property
+    def edge_indices(self: CompactGraph) -> np.ndarray:
+        """Array of (lower, higher) node index pairs, one row per edge"""
+        return self._edges
+
+    def index_of(self: CompactGraph, node: Node) -> int:
+        try:
+            return self._index[node]
+        except KeyError:
+            raise nx.NetworkXError(f"The node {node} is not in the graph.") from None
+
+    def indices_of(self: CompactGraph, nodes: Iterable[Node]) -> np.ndarray:
+        return np.fromiter((self.index_of(node) for node in nodes), dtype=np.int64)
+
+    def node_at(self: CompactGraph, index: int) -> Node:
+        return self._nodes[index]
+
+    def column(self: CompactGraph, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def neighbor_indices(self: CompactGraph, index: int) -> np.ndarray:
+        return self._indices[self._indptr[index]:self._indptr[index + 1]]
+
+    def neighbors(self: CompactGraph, node: Node) -> Iterator[Node]:
+        return iter(self._nodes[self.neighbor_indices(self.index_of(node))].tolist())
+
+    def has_node(self: CompactGraph, node: Node) -> bool:
+        return node in self
+
+    def has_edge(self: CompactGraph, start: Node, end: Node) -> bool:
+        if start not in self or end not in self:
+            return False
+        neighbors = self.neighbor_indices(self._index[start])
+        position = np.searchsorted(neighbors, self._index[end])
+        return position < len(neighbors) and neighbors[position] == self._index[end]
+
+    def number_of_nodes(self: CompactGraph) -> int:
+        return len(self._nodes)
+
+    def number_of_edges(self: CompactGraph) -> int:
+        return len(self._edges)
+
+    def adjacency_matrix(self: CompactGraph) -> sparse.csr_matrix:
+        return sparse.csr_matrix(
+            (np.ones(len(self._indices), dtype=np.int32), self._indices, self._indptr),
+            shape=(len(self._nodes), len(self._nodes)),
+        )
+
+
+class _NodeView:
+    def __init__(self: _NodeView, graph: CompactGraph) -> None:
+        self._graph = graph
+
+    def __len__(self: _NodeView) -> int:
+        return len(self._graph)
+
+    def __iter__(self: _NodeView) -> Iterator[Node]:
+        return iter(self._graph)
+
+    def __contains__(self: _NodeView, node: Node) -> bool:
+        return node in self._graph
+
+    def __getitem__(self: _NodeView, node: Node) -> dict[str, Any]:
+        index = self._graph.index_of(node)
+        return {
+            name: column[index]
+            for name, column in self._graph._columns.items()
+            if column[index] is not None
+        }
+
+    def __call__(
+        self: _NodeView, data: Union[bool, str] = False, default: Any = None
+    ) -> Union[_NodeView, Iterator[tuple[Node, Any]]]:
+        if data is False:
+            return self
+        if data is True:
+            return ((node, self[node]) for node in self._graph)
+        try:
+            values = self._graph._columns[data].tolist()
+        except KeyError:
+            values = [default] * len(self._graph)
+        return zip(self._graph, (default if value is None else value for value in values))
+
+
+class _EdgeView:
+    def __init__(self: _EdgeView, graph: CompactGraph) -> None:
+        self._graph = graph
+
+    def __len__(self: _EdgeView) -> int:
+        return self._graph.number_of_edges()
+
+    def __iter__(self: _EdgeView) -> Iterator[tuple[Node, Node]]:
+        nodes = self._graph._nodes
+        edges = self._graph._edges
+        return zip(nodes[edges[:, 0]].tolist(), nodes[edges[:, 1]].tolist())
+
+    def __contains__(self: _EdgeView, edge: tuple[Node, Node]) -> bool:
+        return self._graph.has_edge(*edge)
+
+    def __call__(self: _EdgeView) -> _EdgeView:
+        return self
+
+
+class _DegreeView:
+    def __init__(self: _DegreeView, graph: CompactGraph) -> None:
+        self._graph = graph
+
+    def __iter__(self: _DegreeView) -> Iterator[tuple[Node, int]]:
+        return zip(self._graph, self._graph._degrees.tolist())
+
+    def __getitem__(self: _DegreeView, node: Node) -> int:
+        return int(self._graph._degrees[self._graph.index_of(node)])
+
+    def __call__(
+        self: _DegreeView, nbunch: Optional[Union[Node, Iterable[Node]]] = None
+    ) -> Union[int, _DegreeView, Iterator[tuple[Node, int]]]:
+        if nbunch is None:
+            return self
+        if nbunch in self._graph:
+            return self[nbunch]
+        nodes = list(nbunch)
+        degrees = self._graph._degrees[self._graph.indices_of(nodes)]
+        return zip(nodes, degrees.tolist())
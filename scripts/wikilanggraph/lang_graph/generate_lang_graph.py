@@ -1,19 +1,33 @@
 import logging
 
 import asyncio
+from typing import Any
+from typing import AsyncIterator
+from typing import Coroutine
 from typing import Iterable
 from typing import Optional
+from typing import TypeVar
 
 import httpx
 import networkx as nx
 
-from scripts.wikilanggraph.lang_graph import LangGraph
+from scripts.wikilanggraph.instrumentation import traced
+from scripts.wikilanggraph.lang_graph.graph_delta import GraphDelta
+from scripts.wikilanggraph.lang_graph.lang_graph import LangGraph
+from scripts.wikilanggraph.wikipedia_api import FETCH_ERRORS
+from scripts.wikilanggraph.wikipedia_api import client_session
 from scripts.wikilanggraph.wikipedia_page.page import Page
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKey
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def initialize_graph() -> nx.Graph:
+# Language versions processed at once; HTTP traffic is further limited by the scheduler
+MAX_CONCURRENT_LANGUAGES = 16
+
+
+def initialize_graph() -> LangGraph:
     """Create and return an empty graph structure"""
     graph = LangGraph()
     logger.info("Created an empty graph structure")
@@ -57,50 +71,141 @@ def add_starting_pages_langlinks_to_graph(graph: nx.Graph, page: Page) -> None:
     )
 
 
-async def fetch_pages_links(client: httpx.AsyncClient, page: Page) -> None:
-    """Fetch details of page's links"""
-    await page.fetch_links(client=client)
+@traced("fetch links")
+async def fetch_pages_links(client: httpx.AsyncClient, page: Page) -> Optional[Page]:
+    """Fetch details of page's links, returning None if its wiki cannot be reached"""
+    try:
+        await page.fetch_links(client=client)
+    except FETCH_ERRORS as e:
+        logger.error('Skipping language "%s" of "%s": %s', page.language, page.title, e)
+        return None
     logging.info('Fetched pages "%s" links "%s"', page, set(page.links))
+    return page
 
 
-async def generate_lang_graph(
-    graph: nx.Graph, starting_page: Page, languages: Optional[Iterable[str]] = None
-) -> nx.Graph:
+@traced("fetch revision")
+async def fetch_revision_page(
+    client: httpx.AsyncClient, revision: RevisionKey
+) -> Optional[Page]:
+    """Fetch a past revision of a page together with its existing links, or return None"""
+    page = Page(
+        language=revision.language,
+        title=revision.title,
+        revision=revision.oldid,
+        timestamp=revision.timestamp,
+    )
+    try:
+        await page.fetch_page(client=client, make_unique=True)
+        await page.fetch_links(client=client)
+    except FETCH_ERRORS as e:
+        logger.error('Skipping revision "%s" of "%s": %s', revision.oldid, revision.title, e)
+        return None
+    logging.info('Fetched revision "%s" links', page)
+    return page
+
+
+@traced("add to graph")
+def add_page_with_links_to_graph(graph: nx.Graph, page: Page) -> GraphDelta:
+    """Add page, its links and edges between them to graph"""
+    nodes = [(page.wikibase_item, {"page": page.to_serializable()})]
+    nodes.extend(page.links_as_graph_nodes)
+    edges = list(page.links_as_graph_edges)
+    new_nodes = [(node, data) for node, data in nodes if node not in graph]
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return GraphDelta(
+        language=page.language,
+        language_node=page.wikibase_item,
+        nodes=new_nodes,
+        edges=edges,
+    )
+
 
-    async with httpx.AsyncClient() as client:
+async def as_completed_bounded(
+    coroutines: Iterable[Coroutine[Any, Any, T]], limit: int = MAX_CONCURRENT_LANGUAGES
+) -> AsyncIterator[T]:
+    """Run at most limit coroutines at once, yielding results as they complete.
+
+    Once the consumer stops early and closes the generator, the coroutines
+    still running or waiting are cancelled, so none keeps using the client.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coroutine: Coroutine[Any, Any, T]) -> T:
+        async with semaphore:
+            return await coroutine
+
+    coroutines = list(coroutines)
+    tasks = [asyncio.ensure_future(bounded(c)) for c in coroutines]
+    try:
+        for next_completed in asyncio.as_completed(tasks):
+            yield await next_completed
+    finally:
+        for task in tasks:
+            task.cancel()
+        # also collects errors of tasks completed but never yielded
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # tasks cancelled before they started never awaited their coroutine
+        for coroutine in coroutines:
+            coroutine.close()
+
+
+async def generate_lang_graph_deltas(
+    graph: nx.Graph,
+    starting_page: Page,
+    languages: Optional[Iterable[str]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[GraphDelta]:
+    """Build language graph, yielding what each language version adds as it completes"""
+    async with client_session(client) as client:
         await fetch_starting_page(client=client, page=starting_page)
-        add_page_to_graph(graph=graph, page=starting_page)
         await fetch_starting_page_langlinks(
             client=client, page=starting_page, languages=languages
         )
-        add_starting_pages_langlinks_to_graph(graph=graph, page=starting_page)
 
-        tasks = {}
-        for langlink in starting_page.all_language_versions:
-            tasks[langlink] = fetch_pages_links(client=client, page=langlink)
-        await asyncio.gather(*tasks.values())
+        language_versions = as_completed_bounded(
+            fetch_pages_links(client=client, page=langlink)
+            for langlink in starting_page.all_language_versions
+        )
+        try:
+            async for langlink in language_versions:
+                if langlink is not None:
+                    yield add_page_with_links_to_graph(graph=graph, page=langlink)
+        finally:
+            # cancel what is still fetching before the client is closed
+            await language_versions.aclose()
 
-        for langlink in starting_page.all_language_versions:
-            graph.add_nodes_from(langlink.links_as_graph_nodes)
-            graph.add_edges_from(langlink.links_as_graph_edges)
 
+async def generate_lang_graph(
+    graph: nx.Graph,
+    starting_page: Page,
+    languages: Optional[Iterable[str]] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> nx.Graph:
+    deltas = generate_lang_graph_deltas(
+        graph=graph, starting_page=starting_page, languages=languages, client=client
+    )
+    async for _ in deltas:
+        pass
     return graph
 
 
 async def generate_lang_graph_revision(
-        graph: nx.Graph, starting_page: Page
+        graph: nx.Graph, starting_page: Page, client: Optional[httpx.AsyncClient] = None
 ) -> nx.Graph:
 
-    async with httpx.AsyncClient() as client:
+    async with client_session(client) as client:
         await fetch_starting_page(client=client, page=starting_page)
         add_page_to_graph(graph=graph, page=starting_page)
 
         tasks = {}
         for langlink in starting_page.all_language_versions:
             tasks[langlink] = fetch_pages_links(client=client, page=langlink)
-        await asyncio.gather(*tasks.values())
+        fetched = await asyncio.gather(*tasks.values())
 
-        for langlink in starting_page.all_language_versions:
+        for langlink in fetched:
+            if langlink is None:
+                continue
             graph.add_nodes_from(langlink.links_as_graph_nodes)
             graph.add_edges_from(langlink.links_as_graph_edges)
 
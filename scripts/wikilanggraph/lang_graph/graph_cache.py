@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+__all__ = [
+    "GraphCache",
+    "disable_graph_cache",
+    "enable_graph_cache",
+    "get_graph_cache",
+]
+
+import asyncio
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Callable
+from collections import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+Seconds = int
+
+DEFAULT_TTL: Seconds = 6 * 60 * 60
+# wait this long for another process writing to the cache
+BUSY_TIMEOUT: Seconds = 30
+# part of every key, raise it whenever the pickled classes change
+FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class GraphCache:
+    """SQLite cache of computed graphs and metrics, shared by the processes of a server.
+
+    Results are keyed on the article language, title and, for past revisions,
+    moment in time, and stored as compressed pickles for ``ttl`` seconds. The
+    database is in WAL mode, so a result stored by one server process is read
+    by the others right away without blocking them. Pickling, compression and
+    queries, which may wait for another process, run in a thread of the cache,
+    so the sessions served by the event loop never wait for them. A result that
+    cannot be read, e.g. pickled by an older version, is a miss.
+    """
+
+    def __init__(self: GraphCache, path: str, ttl: Seconds = DEFAULT_TTL) -> None:
+        self._path: str = path
+        self._ttl: Seconds = ttl
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, timeout=BUSY_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graph-cache")
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.errors: int = 0
+
+    def __repr__(self: GraphCache) -> str:
+        return f"GraphCache(path={self._path}, {self.stats()})"
+
+    @staticmethod
+    def key(language: str, title: str, moment: Optional[Any] = None) -> str:
+        moment_key = "" if moment is None else str(moment)
+        return "|".join((str(FORMAT_VERSION), language, title, moment_key))
+
+    async def get(
+        self: GraphCache, language: str, title: str, moment: Optional[Any] = None
+    ) -> Optional[Any]:
+        return await self._run(self._get, self.key(language, title, moment))
+
+    async def put(
+        self: GraphCache, language: str, title: str, result: Any, moment: Optional[Any] = None
+    ) -> None:
+        await self._run(self._put, self.key(language, title, moment), result)
+
+    def clear(self: GraphCache) -> None:
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM results")
+
+    def close(self: GraphCache) -> None:
+        self._executor.shutdown()
+        with self._lock:
+            self._connection.close()
+
+    def stats(self: GraphCache) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+    async def _run(self: GraphCache, function: Callable, *args: Any) -> Any:
+        """Run function in the thread of the cache, a failing cache only means a miss"""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, *args
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("Graph cache unavailable: %r", e)
+            return None
+
+    def _get(self: GraphCache, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM results WHERE key = ? AND expires >= ?", (key, time.time())
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            result = pickle.loads(zlib.decompress(row[0]))
+        except Exception as e:  # noqa: B902
+            # unpickling runs code of the stored classes, which may fail in any way
+            self.errors += 1
+            self.misses += 1
+            logger.warning('Cannot read cached result "%s": %r', key, e)
+            return None
+        self.hits += 1
+        return result
+
+    def _put(self: GraphCache, key: str, result: Any) -> None:
+        blob = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        now = time.time()
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, blob, now + self._ttl)
+            )
+            self._connection.execute("DELETE FROM results WHERE expires < ?", (now,))
+        self.stores += 1
+
+    @contextmanager
+    def _transaction(self: GraphCache) -> Iterator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+_graph_cache: Optional[GraphCache] = None
+
+
+def enable_graph_cache(path: str, ttl: Seconds = DEFAULT_TTL) -> GraphCache:
+    global _graph_cache
+    disable_graph_cache()
+    os.makedirs(os.path.dirname(os.path.realpath(path)), exist_ok=True)
+    _graph_cache = GraphCache(path=path, ttl=ttl)
+    logger.info("Enabled graph cache %s", _graph_cache)
+    return _graph_cache
+
+
+def disable_graph_cache() -> None:
+    global _graph_cache
+    if _graph_cache is not None:
+        _graph_cache.close()
+        _graph_cache = None
+
+
+def get_graph_cache() -> Optional[GraphCache]:
+    return _graph_cache
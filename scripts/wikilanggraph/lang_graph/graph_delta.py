@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+__all__ = ["GraphDelta"]
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class GraphDelta:
+    """Part of a language graph contributed by one language version.
+
+    Holds only nodes that were not in the graph before, so consumers can
+    append them to what they have already rendered.
+    """
+
+    language: str
+    language_node: str
+    nodes: list[tuple[str, dict[str, Any]]]
+    edges: list[tuple[str, str]]
@@ -1,10 +1,23 @@
-__all__ = ["LangGraph"]
+__all__ = ["LangGraph", "language_nodes", "link_nodes"]
+
+from itertools import islice
 
 import networkx as nx
 
+from scripts.wikilanggraph.structures.node_key import NodeKey
+
 
 class LangGraph(nx.Graph):
+    """Graph of language versions and the articles they link to.
+
+    Language version nodes (NodeKey instances) and link nodes are kept in two
+    insertion-ordered partitions updated whenever nodes are added or removed,
+    so neither has to be recovered by scanning the graph.
+    """
+
     def __init__(self, incoming_graph_data=None, **kwargs):
+        self._language_nodes = {}
+        self._link_nodes = {}
         super().__init__(incoming_graph_data=incoming_graph_data, **kwargs)
 
     def __repr__(self):
@@ -19,3 +32,76 @@ class LangGraph(nx.Graph):
     def __iter__(self):
         return super().__iter__()
 
+    @property
+    def language_nodes(self):
+        return list(self._language_nodes)
+
+    @property
+    def link_nodes(self):
+        return list(self._link_nodes)
+
+    @property
+    def languages(self):
+        """Map languages to their language version nodes"""
+        return {node.language: node for node in self._language_nodes}
+
+    def add_node(self, node_for_adding, **attr):
+        count = len(self._node)
+        super().add_node(node_for_adding, **attr)
+        self._register_nodes_added_since(count)
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        count = len(self._node)
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self._register_nodes_added_since(count)
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        count = len(self._node)
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self._register_nodes_added_since(count)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        count = len(self._node)
+        super().add_edges_from(ebunch_to_add, **attr)
+        self._register_nodes_added_since(count)
+
+    def remove_node(self, n):
+        super().remove_node(n)
+        self._unregister_node(n)
+
+    def remove_nodes_from(self, nodes):
+        nodes = list(nodes)
+        super().remove_nodes_from(nodes)
+        for n in nodes:
+            self._unregister_node(n)
+
+    def clear(self):
+        super().clear()
+        self._language_nodes.clear()
+        self._link_nodes.clear()
+
+    def _register_nodes_added_since(self, count):
+        # nodes are kept in insertion order, so the new ones are at the end
+        for node in reversed(list(islice(reversed(self._node), len(self._node) - count))):
+            partition = self._language_nodes if isinstance(node, NodeKey) else self._link_nodes
+            partition[node] = None
+
+    def _unregister_node(self, n):
+        self._language_nodes.pop(n, None)
+        self._link_nodes.pop(n, None)
+
+
+def language_nodes(graph):
+    """Language version nodes of any graph, in node order"""
+    try:
+        return graph.language_nodes
+    except AttributeError:
+        return [node for node in graph if isinstance(node, NodeKey)]
+
+
+def link_nodes(graph):
+    """Nodes of any graph that are not language version nodes, in node order"""
+    try:
+        return graph.link_nodes
+    except AttributeError:
+        return [node for node in graph if not isinstance(node, NodeKey)]
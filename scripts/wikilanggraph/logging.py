@@ -7,9 +7,20 @@ from contextlib import suppress
 
 import yaml
 
+from scripts.wikilanggraph.instrumentation import enable_instrumentation
+
 
 def enable_logging(root_path: str = ".") -> None:
+    root_path = os.path.realpath(root_path)
     with suppress(FileNotFoundError):
-        path = os.path.join(os.path.realpath(root_path), "logging.yml")
+        path = os.path.join(root_path, "logging.yml")
         with open(file=path, mode="r") as stream:
-            logging.config.dictConfig(yaml.safe_load(stream))
+            config = yaml.safe_load(stream)
+        # not a part of the dictConfig schema, configures spans and counters instead
+        instrumentation = config.pop("instrumentation", None) or {}
+        logging.config.dictConfig(config)
+        if instrumentation.pop("enabled", False):
+            trace_file = instrumentation.pop("trace_file", None)
+            if trace_file is not None:
+                trace_file = os.path.join(root_path, trace_file)
+            enable_instrumentation(trace_file=trace_file, **instrumentation)
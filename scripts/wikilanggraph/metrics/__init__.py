@@ -1,3 +1,11 @@
-__all__ = ["calculate_dissimilarity_metrics"]
+__all__ = [
+    "IncrementalDissimilarity",
+    "calculate_dissimilarity_metrics",
+    "calculate_dissimilarity_metrics_reference",
+]
 
 from scripts.wikilanggraph.metrics.dissimilarity import calculate_dissimilarity_metrics
+from scripts.wikilanggraph.metrics.dissimilarity import (
+    calculate_dissimilarity_metrics_reference,
+)
+from scripts.wikilanggraph.metrics.incremental import IncrementalDissimilarity
@@ -1,7 +1,13 @@
 import itertools
 
 import networkx as nx
+import numpy as np
 import pandas as pd
+from scipy import sparse
+
+from scripts.wikilanggraph.instrumentation import traced
+from scripts.wikilanggraph.lang_graph.compact_graph import CompactGraph
+from scripts.wikilanggraph.lang_graph.lang_graph import language_nodes
 
 
 def _calculate_dissimilarity(set1: set, set2: set, total_size: int):
@@ -11,14 +17,61 @@ def _calculate_dissimilarity(set1: set, set2: set, total_size: int):
     return levenshtein / total_size
 
 
+def _incidence_matrix(graph: nx.Graph, lang_nodes: list) -> sparse.csr_matrix:
+    """Build a binary language x link matrix with a row per language node"""
+    if isinstance(graph, CompactGraph):
+        return graph.adjacency_matrix()[graph.indices_of(lang_nodes)]
+    link_index = {}
+    rows, columns = [], []
+    for row, lang_node in enumerate(lang_nodes):
+        for neighbor in graph.neighbors(lang_node):
+            rows.append(row)
+            columns.append(link_index.setdefault(neighbor, len(link_index)))
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+        shape=(len(lang_nodes), len(link_index)),
+    )
+
+
+def dissimilarity_scores(
+    languages: np.ndarray, intersections: np.ndarray, sizes: np.ndarray, total_size: int
+) -> pd.Series:
+    """Turn pairwise intersection and per-language link counts into scores"""
+    unions = sizes[:, np.newaxis] + sizes[np.newaxis, :] - intersections
+    lang1_indices, lang2_indices = np.nonzero(~np.eye(len(languages), dtype=bool))
+    scores = pd.Series(
+        (unions - intersections)[lang1_indices, lang2_indices] / total_size,
+        index=pd.MultiIndex.from_arrays(
+            [languages[lang1_indices], languages[lang2_indices]], names=["lang_1", "lang_2"]
+        ),
+        name="score",
+        dtype=float,
+    )
+    return scores.sort_index()
+
+
+@traced("dissimilarity metrics")
 def calculate_dissimilarity_metrics(graph: nx.Graph) -> pd.Series:
-    lang_nodes = {node for node in graph if "__" in node}
+    lang_nodes = language_nodes(graph)
+    languages = np.array([lang_node.label for lang_node in lang_nodes], dtype=object)
+    incidence = _incidence_matrix(graph=graph, lang_nodes=lang_nodes)
+    return dissimilarity_scores(
+        languages=languages,
+        intersections=(incidence @ incidence.T).toarray(),
+        sizes=np.asarray(incidence.sum(axis=1)).ravel(),
+        total_size=len(graph.nodes) - len(lang_nodes),
+    )
+
+
+def calculate_dissimilarity_metrics_reference(graph: nx.Graph) -> pd.Series:
+    """Pairwise set-based implementation, kept to check the matrix one against"""
+    lang_nodes = set(language_nodes(graph))
     scores = pd.DataFrame(columns=["lang_1", "lang_2", "score"]).set_index(
         ["lang_1", "lang_2"]
     )["score"]
     for lang_node1, lang_node2 in itertools.combinations(lang_nodes, 2):
-        lang1 = lang_node1.split("__")[-1]
-        lang2 = lang_node2.split("__")[-1]
+        lang1 = lang_node1.label
+        lang2 = lang_node2.label
         neighbors1 = {*graph.neighbors(lang_node1)}
         neighbors2 = {*graph.neighbors(lang_node2)}
         scores.loc[(lang1, lang2)] = _calculate_dissimilarity(
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+__all__ = ["IncrementalDissimilarity"]
+
+import logging
+from collections import Counter
+from collections import Iterable
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from scripts.wikilanggraph.instrumentation import traced
+from scripts.wikilanggraph.lang_graph.lang_graph import language_nodes
+from scripts.wikilanggraph.metrics.dissimilarity import dissimilarity_scores
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalDissimilarity:
+    """Dissimilarity scores maintained one language version at a time.
+
+    Keeps the link set of every language version together with a matrix of
+    pairwise intersection sizes. Replacing a single language version only
+    recomputes its own row and column, so moving between neighbouring
+    timepoints costs O(changed languages x languages) set intersections
+    instead of a recomputation over every pair.
+    """
+
+    def __init__(self: IncrementalDissimilarity, capacity: int = 16) -> None:
+        self._slots: dict[str, int] = {}
+        self._labels: dict[str, str] = {}
+        self._links: dict[str, frozenset[Hashable]] = {}
+        self._link_counts: Counter[Hashable] = Counter()
+        self._sizes: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._intersections: np.ndarray = np.zeros((capacity, capacity), dtype=np.int64)
+
+    def __len__(self: IncrementalDissimilarity) -> int:
+        return len(self._slots)
+
+    @property
+    def languages(self: IncrementalDissimilarity) -> set[str]:
+        return set(self._slots)
+
+    def update(
+        self: IncrementalDissimilarity, language: str, label: str, links: Iterable[Hashable]
+    ) -> bool:
+        """Set links of a language version, return whether they have changed"""
+        links = frozenset(links)
+        self._labels[language] = label
+        if self._links.get(language) == links:
+            return False
+        self.remove(language)
+        slot = self._allocate_slot(language)
+        self._labels[language] = label
+        self._links[language] = links
+        self._link_counts.update(links)
+        self._sizes[slot] = len(links)
+        for other_language, other_slot in self._slots.items():
+            if other_language != language:
+                intersection = len(links & self._links[other_language])
+                self._intersections[slot, other_slot] = intersection
+                self._intersections[other_slot, slot] = intersection
+        return True
+
+    def remove(self: IncrementalDissimilarity, language: str) -> None:
+        slot = self._slots.pop(language, None)
+        if slot is None:
+            return
+        self._labels.pop(language)
+        self._link_counts.subtract(self._links.pop(language))
+        self._link_counts = +self._link_counts
+        self._sizes[slot] = 0
+        self._intersections[slot, :] = 0
+        self._intersections[:, slot] = 0
+
+    @traced("incremental dissimilarity")
+    def update_from_graph(self: IncrementalDissimilarity, graph: nx.Graph) -> set[str]:
+        """Synchronize with language nodes of a graph, return changed languages
+
+        A language node label carries the revision timestamp, so language
+        versions whose label did not change are skipped without reading
+        their neighbours.
+        """
+        labels = {node.language: (node, node.label) for node in language_nodes(graph)}
+        for language in self.languages - labels.keys():
+            self.remove(language)
+        changed = set()
+        for language, (node, label) in labels.items():
+            if self._labels.get(language) == label:
+                continue
+            if self.update(language=language, label=label, links=graph.neighbors(node)):
+                changed.add(language)
+        logger.debug("Updated dissimilarity of languages %s", changed)
+        return changed
+
+    def scores(self: IncrementalDissimilarity) -> pd.Series:
+        languages = list(self._slots)
+        slots = np.fromiter(self._slots.values(), dtype=np.int64, count=len(languages))
+        return dissimilarity_scores(
+            languages=np.array([self._labels[language] for language in languages], dtype=object),
+            intersections=self._intersections[np.ix_(slots, slots)],
+            sizes=self._sizes[slots],
+            total_size=len(self._link_counts),
+        )
+
+    def _allocate_slot(self: IncrementalDissimilarity, language: str) -> int:
+        used = set(self._slots.values())
+        slot = next(slot for slot in range(len(self._sizes) + 1) if slot not in used)
+        if slot == len(self._sizes):
+            self._grow()
+        self._slots[language] = slot
+        return slot
+
+    def _grow(self: IncrementalDissimilarity) -> None:
+        capacity = 2 * len(self._sizes)
+        sizes = np.zeros(capacity, dtype=np.int64)
+        sizes[: len(self._sizes)] = self._sizes
+        intersections = np.zeros((capacity, capacity), dtype=np.int64)
+        intersections[: len(self._sizes), : len(self._sizes)] = self._intersections
+        self._sizes, self._intersections = sizes, intersections
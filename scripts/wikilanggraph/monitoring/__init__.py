@@ -0,0 +1,23 @@
+__all__ = [
+    "ARTICLE_LOAD",
+    "CONTENT_TYPE",
+    "Exposition",
+    "GRAPH_EDGES",
+    "GRAPH_NODES",
+    "SizeHistogram",
+    "TIMELINE_UPDATE",
+    "collect_metrics",
+    "observe_graph",
+    "timed",
+]
+
+from scripts.wikilanggraph.monitoring.exposition import CONTENT_TYPE
+from scripts.wikilanggraph.monitoring.exposition import Exposition
+from scripts.wikilanggraph.monitoring.metrics import ARTICLE_LOAD
+from scripts.wikilanggraph.monitoring.metrics import GRAPH_EDGES
+from scripts.wikilanggraph.monitoring.metrics import GRAPH_NODES
+from scripts.wikilanggraph.monitoring.metrics import SizeHistogram
+from scripts.wikilanggraph.monitoring.metrics import TIMELINE_UPDATE
+from scripts.wikilanggraph.monitoring.metrics import collect_metrics
+from scripts.wikilanggraph.monitoring.metrics import observe_graph
+from scripts.wikilanggraph.monitoring.metrics import timed
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+__all__ = ["CONTENT_TYPE", "Exposition"]
+
+from typing import Any
+
+from scripts.wikilanggraph.wikipedia_api.scheduler import LatencyHistogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Exposition:
+    """Metric samples written in the Prometheus text exposition format.
+
+    Samples of one metric may be added with different labels at any point,
+    they are grouped under a single HELP and TYPE header when rendered. The
+    given ``labels`` are added to every sample.
+    """
+
+    def __init__(self: Exposition, prefix: str = "", **labels: Any) -> None:
+        self.prefix: str = prefix
+        self.labels: dict[str, Any] = labels
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def __str__(self: Exposition) -> str:
+        return self.render()
+
+    def gauge(self: Exposition, name: str, help_: str, value: float, **labels: Any) -> None:
+        self._samples(name, "gauge", help_).append(
+            _sample(self.prefix + name, value, self.labels | labels)
+        )
+
+    def counter(self: Exposition, name: str, help_: str, value: float, **labels: Any) -> None:
+        name = name if name.endswith("_total") else f"{name}_total"
+        self._samples(name, "counter", help_).append(
+            _sample(self.prefix + name, value, self.labels | labels)
+        )
+
+    def histogram(
+        self: Exposition, name: str, help_: str, histogram: LatencyHistogram, **labels: Any
+    ) -> None:
+        samples = self._samples(name, "histogram", help_)
+        name = self.prefix + name
+        labels = self.labels | labels
+        cumulative = 0
+        for bound, bucket_count in zip((*histogram.BUCKETS, "+Inf"), histogram.bucket_counts):
+            cumulative += bucket_count
+            samples.append(_sample(f"{name}_bucket", cumulative, labels | {"le": bound}))
+        samples.append(_sample(f"{name}_sum", histogram.sum, labels))
+        samples.append(_sample(f"{name}_count", histogram.count, labels))
+
+    def render(self: Exposition) -> str:
+        lines = []
+        for name, (type_, help_, samples) in self._families.items():
+            lines.append(f"# HELP {self.prefix}{name} {help_}")
+            lines.append(f"# TYPE {self.prefix}{name} {type_}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def _samples(self: Exposition, name: str, type_: str, help_: str) -> list[str]:
+        try:
+            return self._families[name][2]
+        except KeyError:
+            self._families[name] = (type_, help_, [])
+            return self._families[name][2]
+
+
+def _sample(name: str, value: float, labels: dict[str, Any]) -> str:
+    if labels:
+        label_values = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+        name = f"{name}{{{label_values}}}"
+    return f"{name} {float(value)!r}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+__all__ = [
+    "ARTICLE_LOAD",
+    "GRAPH_EDGES",
+    "GRAPH_NODES",
+    "TIMELINE_UPDATE",
+    "SizeHistogram",
+    "collect_metrics",
+    "observe_graph",
+    "timed",
+]
+
+import os
+import time
+from collections import Iterator
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+
+import networkx as nx
+
+from scripts.wikilanggraph.monitoring.exposition import Exposition
+from scripts.wikilanggraph.structures.multiton import live_scopes
+from scripts.wikilanggraph.wikipedia_api.cache import get_response_cache
+from scripts.wikilanggraph.wikipedia_api.scheduler import LatencyHistogram
+from scripts.wikilanggraph.wikipedia_api.scheduler import get_scheduler
+from scripts.wikilanggraph.wikipedia_page.page import Page
+
+PREFIX = "wikilanggraph_"
+
+
+class SizeHistogram(LatencyHistogram):
+    BUCKETS: tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+ARTICLE_LOAD = LatencyHistogram()
+TIMELINE_UPDATE = LatencyHistogram()
+GRAPH_NODES = SizeHistogram()
+GRAPH_EDGES = SizeHistogram()
+
+
+@contextmanager
+def timed(histogram: LatencyHistogram) -> Iterator[None]:
+    """Observe how many seconds the block takes, also when it fails"""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        histogram.observe(time.monotonic() - started)
+
+
+def observe_graph(graph: nx.Graph) -> None:
+    GRAPH_NODES.observe(graph.number_of_nodes())
+    GRAPH_EDGES.observe(graph.number_of_edges())
+
+
+def collect_metrics(sessions: Optional[dict[str, int]] = None) -> str:
+    """Current metrics of the process in the Prometheus text format.
+
+    Every process of a server has metrics of its own, labelled with its pid,
+    so that scrapes answered by different worker processes are told apart.
+    """
+    exposition = Exposition(prefix=PREFIX, pid=os.getpid())
+    _collect_scheduler(exposition)
+    _collect_response_cache(exposition)
+    _collect_multitons(exposition)
+    for app, count in (sessions or {}).items():
+        exposition.gauge("sessions", "Open Bokeh sessions", count, app=app)
+    exposition.histogram("article_load_seconds", "Time to load an article", ARTICLE_LOAD)
+    exposition.histogram(
+        "timeline_update_seconds", "Time to move an article in time", TIMELINE_UPDATE
+    )
+    exposition.histogram("graph_nodes", "Nodes of the built graphs", GRAPH_NODES)
+    exposition.histogram("graph_edges", "Edges of the built graphs", GRAPH_EDGES)
+    return exposition.render()
+
+
+def _collect_scheduler(exposition: Exposition) -> None:
+    scheduler = get_scheduler()
+    metrics = scheduler.metrics()
+    exposition.gauge("http_requests_queued", "Requests waiting for a host slot", metrics["queued"])
+    exposition.gauge("http_request_rate", "Requests per second allowed now", metrics["rate"])
+    exposition.counter("http_requests", "Requests sent to Wikipedia", metrics["requests"])
+    exposition.counter(
+        "http_retries", "Requests retried after an error or throttling", metrics["retries"]
+    )
+    exposition.counter("http_throttled", "Throttling responses received", metrics["throttled"])
+    exposition.counter("http_failures", "Requests given up after every retry", metrics["failures"])
+    for host, state in scheduler.host_metrics().items():
+        exposition.gauge(
+            "http_requests_in_flight", "Requests awaiting a response", state["in_flight"], host=host
+        )
+    for host, histogram in scheduler.host_latencies().items():
+        exposition.histogram(
+            "http_request_duration_seconds", "Time to a response", histogram, host=host
+        )
+
+
+def _collect_response_cache(exposition: Exposition) -> None:
+    cache = get_response_cache()
+    if cache is None:
+        return
+    stats = cache.stats()
+    exposition.counter("response_cache_hits", "Responses read from the cache", stats["hits"])
+    exposition.counter("response_cache_misses", "Responses missing from the cache", stats["misses"])
+    exposition.counter("response_cache_evictions", "Responses evicted", stats["evictions"])
+    exposition.counter("response_cache_errors", "Cache queries failed", stats["errors"])
+    exposition.gauge("response_cache_bytes", "Compressed size of cached responses", stats["size"])
+
+
+def _collect_multitons(exposition: Exposition) -> None:
+    # pages of an article live in the scope of its model, the rest in the class registry;
+    # only sizes are read, walking every instance at each scrape would stall the sessions
+    keys, strong = defaultdict(int), defaultdict(int)
+    counts = [("Page", Page.registry().counts())]
+    for scope in live_scopes():
+        counts.extend(scope.counts().items())
+    for name, registry_counts in counts:
+        keys[name] += registry_counts["keys"]
+        strong[name] += registry_counts["strong"]
+    for name in keys:
+        exposition.gauge("multiton_keys", "Keys of live multiton instances", keys[name], cls=name)
+        exposition.gauge(
+            "multiton_strong_keys", "Keys keeping their instances alive", strong[name], cls=name
+        )
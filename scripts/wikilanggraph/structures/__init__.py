@@ -1,5 +1,19 @@
-__all__ = ["BaseList", "BaseSet", "multiton"]
+__all__ = [
+    "BaseList",
+    "BaseSet",
+    "MultitonRegistry",
+    "MultitonScope",
+    "NodeKey",
+    "live_scopes",
+    "multiton",
+    "registry_of",
+]
 
 from scripts.wikilanggraph.structures.base_list import BaseList
 from scripts.wikilanggraph.structures.base_set import BaseSet
+from scripts.wikilanggraph.structures.multiton import MultitonRegistry
+from scripts.wikilanggraph.structures.multiton import MultitonScope
+from scripts.wikilanggraph.structures.multiton import live_scopes
 from scripts.wikilanggraph.structures.multiton import multiton
+from scripts.wikilanggraph.structures.multiton import registry_of
+from scripts.wikilanggraph.structures.node_key import NodeKey
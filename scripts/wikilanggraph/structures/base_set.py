@@ -6,6 +6,7 @@ from collections import MutableSet
 
 
 class BaseSet(Hashable, MutableSet):
+    __slots__ = ("_data",)
     __hash__ = MutableSet._hash
 
     def __init__(self, iterable: Iterable = ()):
@@ -26,5 +27,8 @@ class BaseSet(Hashable, MutableSet):
     def add(self, item):
         self._data.add(item)
 
+    def update(self, iterable: Iterable):
+        self._data.update(iterable)
+
     def discard(self, item):
         self._data.discard(item)
@@ -1,15 +1,194 @@
+from __future__ import annotations
+
+__all__ = ["MultitonRegistry", "MultitonScope", "live_scopes", "multiton", "registry_of"]
+
+import sys
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
+from contextvars import Token
 from functools import wraps
+from typing import Any
+from typing import Hashable
+from typing import Optional
+
+DEFAULT_MAX_SIZE = 20_000
+
+
+class MultitonRegistry:
+    """Instances of a multiton class, held weakly behind an LRU of strong references.
+
+    Every registered instance stays reachable through a ``WeakValueDictionary``
+    for as long as anything else uses it. Additionally the ``max_size`` most
+    recently used keys keep their instances alive on their own; ``None`` keeps
+    every instance until the registry is cleared or dropped.
+    """
+
+    def __init__(self: MultitonRegistry, max_size: Optional[int] = DEFAULT_MAX_SIZE) -> None:
+        self.max_size: Optional[int] = max_size
+        self._weak: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._strong: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __repr__(self: MultitonRegistry) -> str:
+        return f"MultitonRegistry({self.stats()})"
+
+    def __len__(self: MultitonRegistry) -> int:
+        return len(self._weak)
+
+    def __contains__(self: MultitonRegistry, key: Hashable) -> bool:
+        return key in self._weak
+
+    def __getitem__(self: MultitonRegistry, key: Hashable) -> Any:
+        try:
+            instance = self._weak[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._hold(key, instance)
+        return instance
+
+    def __setitem__(self: MultitonRegistry, key: Hashable, instance: Any) -> None:
+        self._weak[key] = instance
+        self._hold(key, instance)
+
+    def values(self: MultitonRegistry) -> list[Any]:
+        """Return every live instance once, regardless of its number of keys"""
+        return list({id(instance): instance for instance in self._weak.values()}.values())
+
+    def clear(self: MultitonRegistry) -> None:
+        self._strong.clear()
+        self._weak.clear()
+
+    def approximate_bytes(self: MultitonRegistry) -> int:
+        """Shallow size of live instances and of their attribute values"""
+        return sum(_approximate_size(instance) for instance in self.values())
+
+    def stats(self: MultitonRegistry) -> dict[str, int]:
+        return {
+            "keys": len(self._weak),
+            "instances": len(self.values()),
+            "strong": len(self._strong),
+            "approximate_bytes": self.approximate_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def counts(self: MultitonRegistry) -> dict[str, int]:
+        """Sizes of the registry, cheap enough to be read at any time"""
+        return {"keys": len(self._weak), "strong": len(self._strong)}
+
+    def _hold(self: MultitonRegistry, key: Hashable, instance: Any) -> None:
+        self._strong[key] = instance
+        self._strong.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._strong) > self.max_size:
+                self._strong.popitem(last=False)
+                self.evictions += 1
+
+
+class MultitonScope:
+    """Separate registries for multiton classes, active while the scope is entered.
+
+    Instances created inside the scope are neither shared with nor visible to
+    code running outside of it, and they are released together with the scope.
+    A scope may be entered repeatedly, e.g. once per callback of a session.
+    """
+
+    def __init__(self: MultitonScope, max_size: Optional[int] = None) -> None:
+        self.max_size: Optional[int] = max_size
+        self._registries: dict[type, MultitonRegistry] = {}
+        _scopes.add(self)
+
+    def __repr__(self: MultitonScope) -> str:
+        return f"MultitonScope({self.stats()})"
+
+    def __enter__(self: MultitonScope) -> MultitonScope:
+        # every task keeps the tokens of the scopes it entered in its own context
+        _scope_tokens.set((*_scope_tokens.get(), _active_scope.set(self)))
+        return self
+
+    def __exit__(self: MultitonScope, *exc_info: Any) -> None:
+        *tokens, token = _scope_tokens.get()
+        _scope_tokens.set(tuple(tokens))
+        _active_scope.reset(token)
+
+    def registry(self: MultitonScope, cls: type) -> MultitonRegistry:
+        try:
+            return self._registries[cls]
+        except KeyError:
+            registry = MultitonRegistry(max_size=self.max_size)
+            self._registries[cls] = registry
+            return registry
+
+    def clear(self: MultitonScope) -> None:
+        for registry in self._registries.values():
+            registry.clear()
+
+    def stats(self: MultitonScope) -> dict[str, dict[str, int]]:
+        return {cls.__name__: registry.stats() for cls, registry in self._registries.items()}
+
+    def counts(self: MultitonScope) -> dict[str, dict[str, int]]:
+        return {cls.__name__: registry.counts() for cls, registry in self._registries.items()}
+
+
+_active_scope: ContextVar[Optional[MultitonScope]] = ContextVar("multiton_scope", default=None)
+_scope_tokens: ContextVar[tuple[Token, ...]] = ContextVar("multiton_scope_tokens", default=())
+_scopes: weakref.WeakSet = weakref.WeakSet()
+
+
+def live_scopes() -> list[MultitonScope]:
+    """Return every scope still in use, e.g. to monitor the instances they hold"""
+    return list(_scopes)
+
+
+def registry_of(cls: type) -> MultitonRegistry:
+    """Return the registry of a multiton class used in the current context"""
+    scope = _active_scope.get()
+    if scope is None:
+        return cls._instances
+    return scope.registry(cls)
 
 
 def multiton(*keys):
     def _multiton(cls):
+        if not isinstance(cls.__dict__.get("_instances"), MultitonRegistry):
+            cls._instances = MultitonRegistry()
+
         @wraps(cls)
         def getinstance(**kwargs):
-            key = tuple(v for k, v in kwargs.items() if k in keys)
-            if key not in cls._instances:
-                cls._instances[key] = cls(**kwargs)
-            return cls._instances[key]
+            key = tuple(kwargs.get(k) for k in keys)
+            registry = registry_of(cls)
+            try:
+                return registry[key]
+            except KeyError:
+                instance = cls(**kwargs)
+                registry[key] = instance
+                return instance
 
+        getinstance.registry = lambda: registry_of(cls)
         return getinstance
 
     return _multiton
+
+
+def _approximate_size(instance: Any) -> int:
+    try:
+        attributes = vars(instance).values()
+    except TypeError:
+        attributes = (
+            getattr(instance, name)
+            for cls in type(instance).__mro__
+            for name in _slot_names(cls)
+            if name != "__weakref__" and hasattr(instance, name)
+        )
+    return sys.getsizeof(instance) + sum(sys.getsizeof(value) for value in attributes)
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+    slots = cls.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+__all__ = ["NodeKey"]
+
+import datetime
+from typing import Optional
+
+
+class NodeKey(str):
+    """Graph node of a language version of an article.
+
+    Compares, hashes and serializes as the "<item>__<language>" string (with
+    " ~ (<timestamp>)" appended for past revisions) that has always been used
+    as its node name, while keeping the parts it is made of as attributes.
+    """
+
+    item: str
+    language: str
+    timestamp: Optional[datetime.datetime]
+
+    def __new__(
+        cls: type[NodeKey],
+        item: str,
+        language: str,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> NodeKey:
+        label = language if timestamp is None else f"{language} ~ ({timestamp})"
+        key = super().__new__(cls, f"{item}__{label}")
+        key.item = item
+        key.language = language
+        key.timestamp = timestamp
+        return key
+
+    def __reduce__(self: NodeKey) -> tuple:
+        return NodeKey, (self.item, self.language, self.timestamp)
+
+    @property
+    def label(self: NodeKey) -> str:
+        """Language, together with the revision timestamp if there is one"""
+        return self[len(self.item) + 2:]
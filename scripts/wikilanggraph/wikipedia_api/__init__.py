@@ -0,0 +1,47 @@
+__all__ = [
+    "FETCH_ERRORS",
+    "ApiDataSource",
+    "Cassette",
+    "CassetteMissException",
+    "DataSource",
+    "RecordingDataSource",
+    "ReplayDataSource",
+    "RequestScheduler",
+    "ResponseCache",
+    "RetriesExhaustedException",
+    "client_session",
+    "create_client",
+    "disable_response_cache",
+    "enable_response_cache",
+    "fetch_json",
+    "get_data_source",
+    "get_response_cache",
+    "get_scheduler",
+    "recording",
+    "replaying",
+    "set_data_source",
+    "set_scheduler",
+]
+
+from scripts.wikilanggraph.wikipedia_api.cache import ResponseCache
+from scripts.wikilanggraph.wikipedia_api.cassette import Cassette
+from scripts.wikilanggraph.wikipedia_api.cassette import CassetteMissException
+from scripts.wikilanggraph.wikipedia_api.cassette import RecordingDataSource
+from scripts.wikilanggraph.wikipedia_api.cassette import ReplayDataSource
+from scripts.wikilanggraph.wikipedia_api.cassette import recording
+from scripts.wikilanggraph.wikipedia_api.cassette import replaying
+from scripts.wikilanggraph.wikipedia_api.client import client_session
+from scripts.wikilanggraph.wikipedia_api.client import create_client
+from scripts.wikilanggraph.wikipedia_api.cache import disable_response_cache
+from scripts.wikilanggraph.wikipedia_api.cache import enable_response_cache
+from scripts.wikilanggraph.wikipedia_api.cache import get_response_cache
+from scripts.wikilanggraph.wikipedia_api.request import fetch_json
+from scripts.wikilanggraph.wikipedia_api.scheduler import FETCH_ERRORS
+from scripts.wikilanggraph.wikipedia_api.scheduler import RequestScheduler
+from scripts.wikilanggraph.wikipedia_api.scheduler import RetriesExhaustedException
+from scripts.wikilanggraph.wikipedia_api.scheduler import get_scheduler
+from scripts.wikilanggraph.wikipedia_api.scheduler import set_scheduler
+from scripts.wikilanggraph.wikipedia_api.source import ApiDataSource
+from scripts.wikilanggraph.wikipedia_api.source import DataSource
+from scripts.wikilanggraph.wikipedia_api.source import get_data_source
+from scripts.wikilanggraph.wikipedia_api.source import set_data_source
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+__all__ = [
+    "ResponseCache",
+    "disable_response_cache",
+    "enable_response_cache",
+    "get_response_cache",
+]
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Callable
+from collections import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextlib import suppress
+from typing import Any
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+Seconds = int
+Bytes = int
+
+DEFAULT_TTL: Seconds = 6 * 60 * 60
+DEFAULT_MAX_SIZE: Bytes = 1024 * 1024 * 1024
+# wait this long for another process writing to the cache
+BUSY_TIMEOUT: Seconds = 30
+# times of cache hits are written together, at the latest after this many hits
+ACCESS_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    language TEXT NOT NULL,
+    action TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals SELECT 0, COALESCE(SUM(size), 0) FROM responses;
+"""
+
+
+class ResponseCache:
+    """Persistent SQLite cache of Wikipedia API responses.
+
+    Responses are keyed on (language, action, normalized params) and stored as
+    compressed JSON. Responses for a fixed old revision never change, so they
+    never expire; everything else lives for ``ttl`` seconds. Once the stored
+    data exceeds ``max_size`` bytes, the least recently used entries are evicted.
+    Queries and (de)compression run in a thread of the cache, off the event loop.
+
+    The database may be shared by the processes of a server. Reads never write:
+    times of cache hits are kept in memory and written along with the next
+    stored response, and the total size is kept in the database, updated by
+    every process storing or evicting responses.
+    """
+
+    def __init__(
+        self: ResponseCache,
+        path: str,
+        ttl: Seconds = DEFAULT_TTL,
+        max_size: Bytes = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self._path: str = path
+        self._ttl: Seconds = ttl
+        self._max_size: Bytes = max_size
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, timeout=BUSY_TIMEOUT, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache")
+        self._accessed: dict[str, float] = {}
+        self._size: Bytes = self._total_size()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+        self.errors: int = 0
+
+    def __repr__(self: ResponseCache) -> str:
+        return f"ResponseCache(path={self._path}, {self.stats()})"
+
+    @staticmethod
+    def key(language: str, params: dict[str, Any]) -> str:
+        normalized_params = sorted((str(k), str(v)) for k, v in params.items())
+        return json.dumps([language, params.get("action"), normalized_params])
+
+    async def get(
+        self: ResponseCache, language: str, params: dict[str, Any]
+    ) -> Optional[dict]:
+        return await self._run(self._get, language, params)
+
+    async def put(
+        self: ResponseCache, language: str, params: dict[str, Any], data: dict
+    ) -> None:
+        if "error" in data:
+            return
+        await self._run(self._put, language, params, data)
+
+    def clear(self: ResponseCache) -> None:
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM responses")
+            self._connection.execute("UPDATE totals SET size = 0")
+            self._accessed.clear()
+            self._size = 0
+
+    def close(self: ResponseCache) -> None:
+        self._executor.shutdown()
+        with self._lock:
+            with suppress(sqlite3.Error), self._transaction():
+                self._write_accessed()
+            self._connection.close()
+
+    def stats(self: ResponseCache) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "size": self._size,
+        }
+
+    async def _run(self: ResponseCache, function: Callable, *args: Any) -> Any:
+        """Run function in the thread of the cache, a failing cache only means a miss"""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, function, *args
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning("Response cache unavailable: %r", e)
+            return None
+
+    def _get(self: ResponseCache, language: str, params: dict[str, Any]) -> Optional[dict]:
+        key = self.key(language, params)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_BATCH:
+                with self._transaction():
+                    self._write_accessed()
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def _put(self: ResponseCache, language: str, params: dict[str, Any], data: dict) -> None:
+        key = self.key(language, params)
+        blob = zlib.compress(json.dumps(data).encode("utf-8"))
+        now = time.time()
+        expires = None if self._is_immutable(params) else now + self._ttl
+        with self._lock, self._transaction():
+            self._write_accessed()
+            previous = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, language, str(params.get("action")), blob, len(blob), expires, now),
+            )
+            self._connection.execute(
+                "UPDATE totals SET size = size + ?",
+                (len(blob) - (previous[0] if previous else 0),),
+            )
+            self._size = self._total_size()
+        self.stores += 1
+        if self._size > self._max_size:
+            self._evict()
+
+    @staticmethod
+    def _is_immutable(params: dict[str, Any]) -> bool:
+        return params.get("action") == "parse" and "oldid" in params
+
+    @contextmanager
+    def _transaction(self: ResponseCache) -> Iterator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _write_accessed(self: ResponseCache) -> None:
+        if self._accessed:
+            self._connection.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _total_size(self: ResponseCache) -> Bytes:
+        return self._connection.execute("SELECT size FROM totals").fetchone()[0]
+
+    def _evict(self: ResponseCache) -> None:
+        now = time.time()
+        with self._lock, self._transaction():
+            expired = self._connection.execute(
+                "DELETE FROM responses WHERE expires < ?", (now,)
+            ).rowcount
+            # recounted, as any process of the server may have stored responses meanwhile
+            size = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed"
+            ).fetchall()
+            evicted_keys = []
+            for key, entry_size in rows:
+                if size <= self._max_size:
+                    break
+                evicted_keys.append((key,))
+                size -= entry_size
+            self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted_keys)
+            self._connection.execute("UPDATE totals SET size = ?", (size,))
+        self._size = size
+        self.evictions += expired + len(evicted_keys)
+        logger.debug(
+            "Evicted %i expired and %i least recently used responses from cache",
+            expired,
+            len(evicted_keys),
+        )
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def enable_response_cache(
+    path: str, ttl: Seconds = DEFAULT_TTL, max_size: Bytes = DEFAULT_MAX_SIZE
+) -> ResponseCache:
+    global _response_cache
+    disable_response_cache()
+    os.makedirs(os.path.dirname(os.path.realpath(path)), exist_ok=True)
+    _response_cache = ResponseCache(path=path, ttl=ttl, max_size=max_size)
+    logger.info("Enabled response cache %s", _response_cache)
+    return _response_cache
+
+
+def disable_response_cache() -> None:
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+        _response_cache = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return _response_cache
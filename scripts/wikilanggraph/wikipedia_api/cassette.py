@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+__all__ = [
+    "Cassette",
+    "CassetteMissException",
+    "RecordingDataSource",
+    "ReplayDataSource",
+    "recording",
+    "replaying",
+]
+
+import asyncio
+import datetime
+import gzip
+import json
+import logging
+import os
+import time
+from collections import Iterator
+from collections import defaultdict
+from collections import deque
+from contextlib import contextmanager
+from typing import Any
+from typing import Optional
+
+import httpx
+
+from scripts.wikilanggraph.wikipedia_api.cache import ResponseCache
+from scripts.wikilanggraph.wikipedia_api.scheduler import FETCH_ERRORS
+from scripts.wikilanggraph.wikipedia_api.scheduler import RetriesExhaustedException
+from scripts.wikilanggraph.wikipedia_api.source import DataSource
+from scripts.wikilanggraph.wikipedia_api.source import get_data_source
+from scripts.wikilanggraph.wikipedia_api.source import set_data_source
+
+logger = logging.getLogger(__name__)
+
+Seconds = float
+
+CASSETTE_VERSION = 1
+TIMINGS = ("instant", "original")
+
+
+class CassetteMissException(KeyError):
+    pass
+
+
+class Cassette:
+    """API requests of a session and their responses, stored in one gzip file.
+
+    Every distinct request (language and normalized params) and its response
+    are stored once. Each time it was made is kept as a (start, duration)
+    pair relative to the start of the recording, so a replay can reproduce
+    the original timing. A request that failed is stored with its error
+    instead of a response, so a replay fails it the same way.
+    """
+
+    def __init__(self: Cassette, metadata: Optional[dict[str, Any]] = None) -> None:
+        self.metadata: dict[str, Any] = metadata or {}
+        self.entries: list[dict[str, Any]] = []
+        self.requests: list[tuple[int, Seconds, Seconds]] = []
+        self._index: dict[str, int] = {}
+
+    def __repr__(self: Cassette) -> str:
+        return f"Cassette(responses={len(self.entries)}, requests={len(self.requests)})"
+
+    def __len__(self: Cassette) -> int:
+        return len(self.requests)
+
+    def add(
+        self: Cassette,
+        language: str,
+        params: dict[str, Any],
+        data: Optional[dict],
+        start: Seconds,
+        duration: Seconds,
+        error: Optional[Exception] = None,
+    ) -> None:
+        key = ResponseCache.key(language, params)
+        try:
+            index = self._index[key]
+        except KeyError:
+            index = len(self.entries)
+            self._index[key] = index
+            entry = {"language": language, "params": dict(params)}
+            if error is None:
+                # pages consume the responses they are given, keep a copy of what was received
+                entry["response"] = json.loads(json.dumps(data))
+            else:
+                entry["error"] = _error_entry(error)
+            self.entries.append(entry)
+        self.requests.append((index, round(start, 6), round(duration, 6)))
+
+    def response(
+        self: Cassette, language: str, params: dict[str, Any]
+    ) -> tuple[int, Optional[dict]]:
+        """Index and response of a request, None as response if it failed"""
+        try:
+            index = self._index[ResponseCache.key(language, params)]
+        except KeyError:
+            raise CassetteMissException(
+                f"No recorded response for {language}: {params}"
+            ) from None
+        return index, self.entries[index].get("response")
+
+    def error(self: Cassette, index: int) -> Optional[Exception]:
+        """The error a recorded request failed with, rebuilt to be raised again"""
+        try:
+            entry = self.entries[index]["error"]
+        except KeyError:
+            return None
+        if entry["type"] == httpx.HTTPStatusError.__name__:
+            request = httpx.Request("GET", entry["url"])
+            response = httpx.Response(entry["status"], request=request)
+            return httpx.HTTPStatusError(entry["message"], request=request, response=response)
+        return RetriesExhaustedException(entry["message"])
+
+    def durations(self: Cassette) -> dict[int, list[Seconds]]:
+        """Durations of every request, in the order they were made"""
+        durations = defaultdict(list)
+        for index, _, duration in self.requests:
+            durations[index].append(duration)
+        return durations
+
+    def save(self: Cassette, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.realpath(path)), exist_ok=True)
+        content = {
+            "version": CASSETTE_VERSION,
+            "metadata": self.metadata,
+            "entries": self.entries,
+            "requests": self.requests,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(content, file, separators=(",", ":"))
+        logger.info('Saved %s to "%s"', self, path)
+
+    @classmethod
+    def load(cls: type[Cassette], path: str) -> Cassette:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            content = json.load(file)
+        if content.get("version") != CASSETTE_VERSION:
+            raise ValueError(f'Unsupported cassette version {content.get("version")} in "{path}"')
+        cassette = cls(metadata=content["metadata"])
+        for entry in content["entries"]:
+            cassette._index[ResponseCache.key(entry["language"], entry["params"])] = len(
+                cassette.entries
+            )
+            cassette.entries.append(entry)
+        cassette.requests = [tuple(request) for request in content["requests"]]
+        return cassette
+
+
+class RecordingDataSource(DataSource):
+    """Passes requests on to another data source, recording them into a cassette"""
+
+    def __init__(
+        self: RecordingDataSource, source: DataSource, cassette: Optional[Cassette] = None
+    ) -> None:
+        self.source: DataSource = source
+        self.cassette: Cassette = Cassette() if cassette is None else cassette
+        self._started: float = time.monotonic()
+        self.cassette.metadata.setdefault(
+            "recorded", datetime.datetime.now(datetime.timezone.utc).isoformat()
+        )
+
+    def __repr__(self: RecordingDataSource) -> str:
+        return f"RecordingDataSource(source={self.source!r}, cassette={self.cassette!r})"
+
+    async def fetch_json(
+        self: RecordingDataSource,
+        client: httpx.AsyncClient,
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        start = time.monotonic()
+        try:
+            data = await self.source.fetch_json(
+                client, language=language, params=params, description=description
+            )
+        except FETCH_ERRORS as e:
+            self.cassette.add(
+                language,
+                params,
+                None,
+                start=start - self._started,
+                duration=time.monotonic() - start,
+                error=e,
+            )
+            raise
+        now = time.monotonic()
+        self.cassette.add(
+            language, params, data, start=start - self._started, duration=now - start
+        )
+        return data
+
+
+class ReplayDataSource(DataSource):
+    """Answers requests from a cassette, instantly or taking as long as when recorded.
+
+    With ``"original"`` timing every repetition of a request takes as long as
+    the corresponding recorded one did. A request that failed when recorded
+    raises the same kind of error again, and a request missing from the
+    cassette raises CassetteMissException, so replays never silently diverge.
+    """
+
+    def __init__(self: ReplayDataSource, cassette: Cassette, timing: str = "instant") -> None:
+        if timing not in TIMINGS:
+            raise ValueError(f'Unknown timing "{timing}", expected one of {TIMINGS}')
+        self.cassette: Cassette = cassette
+        self.timing: str = timing
+        self._durations: dict[int, deque[Seconds]] = {
+            index: deque(durations) for index, durations in cassette.durations().items()
+        }
+        self.requests: int = 0
+
+    def __repr__(self: ReplayDataSource) -> str:
+        return (
+            f"ReplayDataSource(cassette={self.cassette!r}, timing={self.timing},"
+            f" requests={self.requests})"
+        )
+
+    async def fetch_json(
+        self: ReplayDataSource,
+        client: httpx.AsyncClient,
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        index, data = self.cassette.response(language, params)
+        self.requests += 1
+        if self.timing == "original":
+            await asyncio.sleep(self._next_duration(index))
+        error = self.cassette.error(index)
+        if error is not None:
+            raise error
+        # callers consume responses, every replay gets its own copy
+        return json.loads(json.dumps(data))
+
+    def _next_duration(self: ReplayDataSource, index: int) -> Seconds:
+        durations = self._durations.get(index)
+        if not durations:
+            return 0.0
+        return durations.popleft() if len(durations) > 1 else durations[0]
+
+
+def _error_entry(error: Exception) -> dict[str, Any]:
+    entry = {"type": type(error).__name__, "message": str(error)}
+    if isinstance(error, httpx.HTTPStatusError):
+        entry["status"] = error.response.status_code
+        entry["url"] = str(error.request.url)
+    return entry
+
+
+@contextmanager
+def recording(path: str, metadata: Optional[dict[str, Any]] = None) -> Iterator[Cassette]:
+    """Record every request made in the block, saving the cassette when it ends"""
+    previous_source = get_data_source()
+    recorder = RecordingDataSource(previous_source, Cassette(metadata=metadata))
+    set_data_source(recorder)
+    try:
+        yield recorder.cassette
+    finally:
+        set_data_source(previous_source)
+        recorder.cassette.save(path)
+
+
+@contextmanager
+def replaying(path: str, timing: str = "instant") -> Iterator[ReplayDataSource]:
+    """Answer every request made in the block from a recorded cassette"""
+    previous_source = get_data_source()
+    replay = ReplayDataSource(Cassette.load(path), timing=timing)
+    set_data_source(replay)
+    try:
+        yield replay
+    finally:
+        set_data_source(previous_source)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+__all__ = ["client_session", "create_client"]
+
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "wiki-lang-graph/0.1.0 (https://github.com/foxale/Wiki-lang-graph)"
+
+# One keep-alive connection pool shared by all *.wikipedia.org hosts; the request
+# scheduler caps per-host concurrency well below these limits.
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=200, max_keepalive_connections=100, keepalive_expiry=60.0
+)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
+def create_client(
+    http2: bool = True,
+    limits: httpx.Limits = DEFAULT_LIMITS,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """Create a long-lived, pooled client for the Wikipedia API"""
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning('HTTP/2 requires the "h2" package, falling back to HTTP/1.1')
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT},
+        **kwargs,
+    )
+
+
+@asynccontextmanager
+async def client_session(
+    client: Optional[httpx.AsyncClient] = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the given shared client, or a short-lived one if there is none"""
+    if client is not None:
+        yield client
+        return
+    async with create_client() as new_client:
+        yield new_client
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+__all__ = ["fetch_json"]
+
+import logging
+from typing import Any
+
+import httpx
+
+from scripts.wikilanggraph.wikipedia_api.source import get_data_source
+
+logger = logging.getLogger(__name__)
+
+
+async def fetch_json(
+    client: httpx.AsyncClient, language: str, params: dict[str, Any], description: str
+) -> dict:
+    return await get_data_source().fetch_json(
+        client, language=language, params=params, description=description
+    )
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+__all__ = [
+    "FETCH_ERRORS",
+    "LatencyHistogram",
+    "RequestScheduler",
+    "RetriesExhaustedException",
+    "TokenBucket",
+    "get_scheduler",
+    "set_scheduler",
+]
+
+import asyncio
+import bisect
+import datetime
+import email.utils
+import logging
+import math
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from scripts.wikilanggraph.instrumentation import count
+from scripts.wikilanggraph.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+Seconds = float
+
+RETRIABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+)
+THROTTLING_STATUS_CODES = (429, 503)
+
+
+class RetriesExhaustedException(Exception):
+    pass
+
+
+# Errors of a request given up on, after which only what it was for is left out
+FETCH_ERRORS = (RetriesExhaustedException, httpx.HTTPStatusError)
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate shared by all hosts"""
+
+    def __init__(self: TokenBucket, rate: float, capacity: float) -> None:
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+
+    async def acquire(self: TokenBucket) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LatencyHistogram:
+    BUCKETS: tuple[Seconds, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self: LatencyHistogram) -> None:
+        self.count: int = 0
+        self.sum: Seconds = 0.0
+        self.max: Seconds = 0.0
+        self.bucket_counts: list[int] = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self: LatencyHistogram, value: Seconds) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.bucket_counts[bisect.bisect_left(self.BUCKETS, value)] += 1
+
+    def to_dict(self: LatencyHistogram) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": dict(zip((*self.BUCKETS, float("inf")), self.bucket_counts)),
+        }
+
+
+@dataclass
+class _HostState:
+    semaphore: asyncio.Semaphore
+    in_flight: int = 0
+    blocked_until: float = 0.0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    async def wait_until_unblocked(self: _HostState) -> None:
+        delay = self.blocked_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.blocked_until - time.monotonic()
+
+    def block_for(self: _HostState, delay: Seconds) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+
+class RequestScheduler:
+    """Shared gate for all Wikipedia HTTP traffic.
+
+    Every request waits for a free per-host slot and a token from the global
+    token bucket. Throttling responses (HTTP 429/503 or a ``maxlag`` API error)
+    block the offending host for the server-advertised ``Retry-After`` delay
+    and halve the request rate, which then recovers additively on success.
+    """
+
+    def __init__(
+        self: RequestScheduler,
+        max_per_host: int = 8,
+        rate: float = 50.0,
+        burst: float = 50.0,
+        min_rate: float = 1.0,
+        rate_increase: float = 0.5,
+        max_attempts: int = 10,
+        max_backoff: Seconds = 60.0,
+        maxlag: Optional[int] = 5,
+        slowdown_interval: Seconds = 1.0,
+    ) -> None:
+        self.max_per_host: int = max_per_host
+        self.max_rate: float = rate
+        self.min_rate: float = min_rate
+        self.rate_increase: float = rate_increase
+        self.max_attempts: int = max_attempts
+        self.max_backoff: Seconds = max_backoff
+        self.maxlag: Optional[int] = maxlag
+        self.slowdown_interval: Seconds = slowdown_interval
+        self._last_slowdown: float = float("-inf")
+        self._bucket: TokenBucket = TokenBucket(rate=rate, capacity=burst)
+        self._hosts: dict[str, _HostState] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queued: int = 0
+        self.requests: int = 0
+        self.retries: int = 0
+        self.throttled: int = 0
+        self.failures: int = 0
+        self.latency: LatencyHistogram = LatencyHistogram()
+
+    def __repr__(self: RequestScheduler) -> str:
+        return f"RequestScheduler({self.metrics()})"
+
+    @property
+    def queue_depth(self: RequestScheduler) -> int:
+        return self._queued
+
+    def metrics(self: RequestScheduler) -> dict[str, Any]:
+        return {
+            "queued": self._queued,
+            "in_flight": {
+                host: state.in_flight for host, state in self._hosts.items() if state.in_flight
+            },
+            "rate": round(self._bucket.rate, 2),
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "latency": self.latency.to_dict(),
+        }
+
+    def host_metrics(self: RequestScheduler) -> dict[str, dict[str, Any]]:
+        return {
+            host: {"in_flight": state.in_flight, "latency": state.latency.to_dict()}
+            for host, state in self._hosts.items()
+        }
+
+    def host_latencies(self: RequestScheduler) -> dict[str, LatencyHistogram]:
+        return {host: state.latency for host, state in self._hosts.items()}
+
+    async def get_json(
+        self: RequestScheduler,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any],
+        description: str = "",
+    ) -> dict:
+        host = self._host(urlsplit(url).hostname)
+        if self.maxlag is not None:
+            params = params | {"maxlag": self.maxlag}
+        self._queued += 1
+        try:
+            await host.semaphore.acquire()
+        finally:
+            self._queued -= 1
+        try:
+            return await self._get_json(client, url, params, host, description)
+        finally:
+            host.semaphore.release()
+
+    async def _get_json(
+        self: RequestScheduler,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any],
+        host: _HostState,
+        description: str,
+    ) -> dict:
+        for attempt in range(1, self.max_attempts + 1):
+            await host.wait_until_unblocked()
+            await self._bucket.acquire()
+            try:
+                response = await self._send(client, url, params, host)
+            except RETRIABLE_ERRORS as e:
+                delay = self._backoff(attempt)
+                reason = e.__class__.__name__
+            else:
+                with span("json decode"):
+                    data = response.json() if response.status_code == 200 else None
+                delay = self._throttle_delay(response, data, attempt)
+                if delay is None:
+                    self._on_success()
+                    return data
+                reason = f"HTTP {response.status_code}"
+                if data is not None:
+                    reason += f" ({data['error']['code']})"
+                self._on_throttle()
+            logger.error(
+                '%s while fetching "%s" - waiting at least %.1f seconds before another try',
+                reason,
+                description,
+                delay,
+            )
+            self.retries += 1
+            count("retries")
+            host.block_for(delay)
+        self.failures += 1
+        raise RetriesExhaustedException(
+            f'Giving up on "{description}" after {self.max_attempts} attempts'
+        )
+
+    async def _send(
+        self: RequestScheduler,
+        client: httpx.AsyncClient,
+        url: str,
+        params: dict[str, Any],
+        host: _HostState,
+    ) -> httpx.Response:
+        self.requests += 1
+        host.in_flight += 1
+        started = time.monotonic()
+        try:
+            with span("http", host=urlsplit(url).hostname):
+                response = await client.get(url, params=params)
+            count("requests")
+            count("bytes", len(response.content))
+            return response
+        finally:
+            host.in_flight -= 1
+            elapsed = time.monotonic() - started
+            host.latency.observe(elapsed)
+            self.latency.observe(elapsed)
+
+    def _throttle_delay(
+        self: RequestScheduler, response: httpx.Response, data: Optional[dict], attempt: int
+    ) -> Optional[Seconds]:
+        if response.status_code in THROTTLING_STATUS_CODES:
+            delay = self._retry_after(response)
+            return self._backoff(attempt) if delay is None else delay
+        if response.status_code != 200:
+            response.raise_for_status()
+        with_maxlag = isinstance(data, dict) and data.get("error", {}).get("code") == "maxlag"
+        if with_maxlag:
+            delay = self._retry_after(response)
+            return self._backoff(attempt) if delay is None else delay
+        return None
+
+    def _retry_after(self: RequestScheduler, response: httpx.Response) -> Optional[Seconds]:
+        """Seconds to wait given by the Retry-After header, None if it has none or a bad one"""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                logger.warning('Ignoring malformed Retry-After header "%s"', value)
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+            delay = retry_at.timestamp() - time.time()
+        if math.isnan(delay):
+            return None
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def _backoff(self: RequestScheduler, attempt: int) -> Seconds:
+        return min(2.0 ** attempt, self.max_backoff)
+
+    def _on_success(self: RequestScheduler) -> None:
+        self._bucket.rate = min(self.max_rate, self._bucket.rate + self.rate_increase)
+
+    def _on_throttle(self: RequestScheduler) -> None:
+        self.throttled += 1
+        now = time.monotonic()
+        # a burst of throttled responses to requests already in flight counts as one signal
+        if now - self._last_slowdown < self.slowdown_interval:
+            return
+        self._last_slowdown = now
+        self._bucket.rate = max(self.min_rate, self._bucket.rate / 2)
+
+    def _host(self: RequestScheduler, hostname: str) -> _HostState:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio primitives must not be shared between event loops
+            self._loop = loop
+            self._hosts = {}
+        try:
+            return self._hosts[hostname]
+        except KeyError:
+            state = _HostState(semaphore=asyncio.Semaphore(self.max_per_host))
+            self._hosts[hostname] = state
+            return state
+
+
+_scheduler: RequestScheduler = RequestScheduler()
+
+
+def get_scheduler() -> RequestScheduler:
+    return _scheduler
+
+
+def set_scheduler(scheduler: RequestScheduler) -> None:
+    global _scheduler
+    _scheduler = scheduler
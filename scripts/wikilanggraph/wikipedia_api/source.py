@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+__all__ = [
+    "ApiDataSource",
+    "DataSource",
+    "get_data_source",
+    "set_data_source",
+]
+
+import logging
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+import httpx
+
+from scripts.wikilanggraph.instrumentation import count
+from scripts.wikilanggraph.wikipedia_api.cache import get_response_cache
+from scripts.wikilanggraph.wikipedia_api.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class DataSource(ABC):
+    """Source of responses to MediaWiki API requests.
+
+    Pages only ever read API responses, so anything able to answer the
+    ``action=query`` and ``action=parse`` requests they make can stand in
+    for the live Wikipedia API.
+    """
+
+    def __repr__(self: DataSource) -> str:
+        return f"{type(self).__name__}()"
+
+    @abstractmethod
+    async def fetch_json(
+        self: DataSource,
+        client: httpx.AsyncClient,
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        """Return the decoded response to a request to the API of the language version"""
+
+
+class ApiDataSource(DataSource):
+    """The live Wikipedia API, behind the response cache and the request scheduler"""
+
+    async def fetch_json(
+        self: ApiDataSource,
+        client: httpx.AsyncClient,
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        cache = get_response_cache()
+        if cache is not None:
+            data = await cache.get(language, params)
+            if data is not None:
+                count("cache_hits")
+                return data
+            count("cache_misses")
+        data = await self._get(client, language=language, params=params, description=description)
+        if cache is not None:
+            await cache.put(language, params, data)
+        return data
+
+    @staticmethod
+    async def _get(
+        client: httpx.AsyncClient, language: str, params: dict[str, Any], description: str
+    ) -> dict:
+        base_url = f"https://{language}.wikipedia.org/w/api.php"
+        return await get_scheduler().get_json(
+            client, url=base_url, params=params, description=description
+        )
+
+
+_data_source: DataSource = ApiDataSource()
+
+
+def get_data_source() -> DataSource:
+    return _data_source
+
+
+def set_data_source(data_source: DataSource) -> None:
+    global _data_source
+    _data_source = data_source
+    logger.info("Using data source %s", data_source)
@@ -0,0 +1,15 @@
+__all__ = [
+    "FIXTURE_DUMPS",
+    "DumpDataSource",
+    "DumpStore",
+    "StoredPage",
+    "dump_language",
+    "read_sql_dump",
+]
+
+from scripts.wikilanggraph.wikipedia_dump.fixtures import FIXTURE_DUMPS
+from scripts.wikilanggraph.wikipedia_dump.source import DumpDataSource
+from scripts.wikilanggraph.wikipedia_dump.sql_dump import dump_language
+from scripts.wikilanggraph.wikipedia_dump.sql_dump import read_sql_dump
+from scripts.wikilanggraph.wikipedia_dump.store import DumpStore
+from scripts.wikilanggraph.wikipedia_dump.store import StoredPage
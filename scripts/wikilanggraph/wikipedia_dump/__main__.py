@@ -0,0 +1,33 @@
+"""Import Wikipedia SQL dumps into a local store.
+
+Run with ``python -m scripts.wikilanggraph.wikipedia_dump STORE DUMP...``.
+The language of each dump is taken from its file name, e.g.
+``plwiki-20240601-pagelinks.sql.gz``, unless ``--language`` is given.
+"""
+import argparse
+import logging
+
+from scripts.wikilanggraph.wikipedia_dump.store import DumpStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("store", help="path of the SQLite store, created if missing")
+    parser.add_argument(
+        "dumps",
+        nargs="+",
+        help="page, pagelinks, linktarget, langlinks, page_props and redirect dumps",
+    )
+    parser.add_argument("--language", default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = DumpStore(args.store)
+    try:
+        store.import_dumps(args.dumps, language=args.language)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Small dumps of the en, pl and de wikis around the article on the Battle of Cedynia.
+
+The plwiki dump names link targets in ``pagelinks`` like dumps from before
+2024 do, the others use the ``linktarget`` table.
+"""
+__all__ = ["FIXTURE_DUMPS"]
+
+import glob
+import os
+
+FIXTURE_DUMPS: list[str] = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*wiki-*.sql")))
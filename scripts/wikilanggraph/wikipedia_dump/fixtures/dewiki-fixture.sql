@@ -0,0 +1,79 @@
+-- MySQL dump of dewiki tables, a small fixture in the format of the Wikimedia SQL dumps
+
+DROP TABLE IF EXISTS `page`;
+CREATE TABLE `page` (
+  `page_id` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_title` varbinary(255) NOT NULL DEFAULT '',
+  `page_is_redirect` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_is_new` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_random` double unsigned NOT NULL DEFAULT 0,
+  `page_touched` varbinary(255) NOT NULL DEFAULT '',
+  `page_links_updated` varbinary(255) NOT NULL DEFAULT '',
+  `page_latest` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_len` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_content_model` varbinary(255) NOT NULL DEFAULT '',
+  `page_lang` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`page_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page` WRITE;
+INSERT INTO `page` VALUES (103,0,'Schlacht_bei_Zehden',0,0,0.811511,'20240601000000','20240601000000',5103,1000,'wikitext',NULL),(203,0,'Mieszko_I.',0,0,0.984926,'20240601000000','20240601000000',5203,1001,'wikitext',NULL),(303,0,'Oder',0,0,0.852629,'20240601000000','20240601000000',5303,1002,'wikitext',NULL),(403,0,'Cedynia',0,0,0.806079,'20240601000000','20240601000000',5403,1003,'wikitext',NULL),(503,0,'Hodo_(Markgraf)',0,0,0.818333,'20240601000000','20240601000000',5503,1004,'wikitext',NULL),(603,0,'Nordmark',0,0,0.739873,'20240601000000','20240601000000',5603,1005,'wikitext',NULL),(703,0,'Heiliges_Römisches_Reich',0,0,0.226739,'20240601000000','20240601000000',5703,1006,'wikitext',NULL),(803,0,'Otto_I._(HRR)',0,0,0.517639,'20240601000000','20240601000000',5803,1007,'wikitext',NULL),(903,0,'Polanen',0,0,0.355563,'20240601000000','20240601000000',5903,1008,'wikitext',NULL),(1003,0,'Thietmar_von_Merseburg',0,0,0.02898,'20240601000000','20240601000000',6003,1009,'wikitext',NULL),(1103,0,'Czcibor',0,0,0.027937,'20240601000000','20240601000000',6103,1010,'wikitext',NULL),(1203,0,'Pommern',0,0,0.279419,'20240601000000','20240601000000',6203,1011,'wikitext',NULL),(1303,0,'Wolin',0,0,0.259174,'20240601000000','20240601000000',6303,1012,'wikitext',NULL),(1403,0,'Wilzen',0,0,0.692522,'20240601000000','20240601000000',6403,1013,'wikitext',NULL),(1503,0,'Polen',0,0,0.956515,'20240601000000','20240601000000',6503,1014,'wikitext',NULL);
+INSERT INTO `page` VALUES (1603,0,'Deutschland',0,0,0.447228,'20240601000000','20240601000000',6603,1015,'wikitext',NULL),(1703,0,'972',0,0,0.937021,'20240601000000','20240601000000',6703,1016,'wikitext',NULL),(1803,0,'Piasten',0,0,0.988038,'20240601000000','20240601000000',6803,1017,'wikitext',NULL),(1903,0,'Christianisierung_Polens',0,0,0.955001,'20240601000000','20240601000000',6903,1018,'wikitext',NULL),(2003,0,'Gniezno',0,0,0.364636,'20240601000000','20240601000000',7003,1019,'wikitext',NULL),(2103,0,'Lausitz',0,0,0.220462,'20240601000000','20240601000000',7103,1020,'wikitext',NULL),(2203,0,'Magdeburg',0,0,0.226846,'20240601000000','20240601000000',7203,1021,'wikitext',NULL),(2303,0,'Schlacht_bei_Lenzen',0,0,0.196706,'20240601000000','20240601000000',7303,1022,'wikitext',NULL),(2503,0,'Dubrawka',0,0,0.204373,'20240601000000','20240601000000',7503,1024,'wikitext',NULL),(2603,0,'Bolesław_I._(Polen)',0,0,0.624066,'20240601000000','20240601000000',7603,1025,'wikitext',NULL),(2703,0,'Woiwodschaft_Westpommern',0,0,0.900308,'20240601000000','20240601000000',7703,1026,'wikitext',NULL),(2803,0,'Mittelalter',0,0,0.840436,'20240601000000','20240601000000',7803,1027,'wikitext',NULL),(2903,0,'Ibrahim_ibn_Yaqub',0,0,0.479473,'20240601000000','20240601000000',7903,1028,'wikitext',NULL),(9003,0,'Oderfluss',1,0,0.5,'20240601000000','20240601000000',9103,20,'wikitext',NULL),(9503,14,'Battles',0,0,0.25,'20240601000000','20240601000000',9603,20,'wikitext',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `linktarget`;
+CREATE TABLE `linktarget` (
+  `lt_id` int(10) unsigned NOT NULL DEFAULT 0,
+  `lt_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `lt_title` varbinary(255) NOT NULL DEFAULT '',
+  PRIMARY KEY (`lt_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `linktarget` WRITE;
+INSERT INTO `linktarget` VALUES (1,0,'Schlacht_bei_Zehden'),(2,0,'Mieszko_I.'),(3,0,'Oderfluss'),(4,0,'Cedynia'),(5,0,'Hodo_(Markgraf)'),(6,0,'Polanen'),(7,0,'Thietmar_von_Merseburg'),(8,0,'Pommern'),(9,0,'Polen'),(10,0,'Deutschland');
+INSERT INTO `linktarget` VALUES (11,0,'Piasten'),(12,0,'Christianisierung_Polens'),(13,0,'Gniezno'),(14,0,'Lausitz'),(15,0,'Siegfried_von_Walbeck'),(16,0,'Woiwodschaft_Westpommern'),(17,0,'Mittelalter'),(18,0,'Ibrahim_ibn_Yaqub'),(19,0,'Schlacht_bei_Zantoch'),(20,14,'Battles');
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `pagelinks`;
+CREATE TABLE `pagelinks` (
+  `pl_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_from_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_target_id` int(10) unsigned NOT NULL DEFAULT 0,
+  PRIMARY KEY (`pl_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `pagelinks` WRITE;
+INSERT INTO `pagelinks` VALUES (203,0,1),(303,0,1),(1103,0,1),(1203,0,1),(1303,0,1),(1403,0,1),(1603,0,1),(1803,0,1),(103,0,2),(103,0,3),(103,0,4),(103,0,5),(103,0,6);
+INSERT INTO `pagelinks` VALUES (103,0,7),(103,0,8),(103,0,9),(103,0,10),(103,0,11),(103,0,12),(103,0,13),(103,0,14),(103,0,15),(103,0,16),(103,0,17),(103,0,18),(103,0,19),(103,0,20);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `langlinks`;
+CREATE TABLE `langlinks` (
+  `ll_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `ll_lang` varbinary(255) NOT NULL DEFAULT '',
+  `ll_title` varbinary(255) NOT NULL DEFAULT '',
+  PRIMARY KEY (`ll_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `langlinks` WRITE;
+INSERT INTO `langlinks` VALUES (103,'en','Battle of Cedynia'),(103,'pl','Bitwa pod Cedynią'),(203,'en','Mieszko I'),(203,'pl','Mieszko I'),(303,'en','Oder'),(303,'pl','Odra'),(403,'en','Cedynia'),(403,'pl','Cedynia'),(503,'en','Hodo'),(503,'pl','Hodon'),(603,'en','Northern March'),(603,'pl','Marchia Północna'),(703,'en','Holy Roman Empire'),(703,'pl','Święte Cesarstwo Rzymskie'),(803,'en','Otto I'),(803,'pl','Otton I Wielki'),(903,'en','Polans (western)'),(903,'pl','Polanie'),(1003,'en','Thietmar of Merseburg'),(1003,'pl','Thietmar'),(1103,'en','Czcibor'),(1103,'pl','Czcibor'),(1203,'en','Pomerania'),(1203,'pl','Pomorze'),(1303,'en','Wolin'),(1303,'pl','Wolin'),(1403,'en','Veleti'),(1403,'pl','Wieleci');
+INSERT INTO `langlinks` VALUES (1503,'en','Poland'),(1503,'pl','Polska'),(1603,'en','Germany'),(1603,'pl','Niemcy'),(1703,'en','972'),(1703,'pl','972'),(1803,'en','Piast dynasty'),(1803,'pl','Piastowie'),(1903,'en','Christianization of Poland'),(1903,'pl','Chrzest Polski'),(2003,'en','Gniezno'),(2003,'pl','Gniezno'),(2103,'en','Lusatia'),(2103,'pl','Łużyce'),(2203,'en','Magdeburg'),(2203,'pl','Magdeburg'),(2303,'en','Battle of Lenzen'),(2303,'pl','Bitwa pod Łęczynem'),(2503,'en','Dobrawa of Bohemia'),(2503,'pl','Dobrawa'),(2603,'en','Bolesław I the Brave'),(2603,'pl','Bolesław I Chrobry'),(2703,'en','West Pomeranian Voivodeship'),(2703,'pl','Województwo zachodniopomorskie'),(2803,'en','Middle Ages'),(2803,'pl','Średniowiecze'),(2903,'en','Ibrahim ibn Ya\'qub'),(2903,'pl','Ibrahim ibn Jakub');
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `page_props`;
+CREATE TABLE `page_props` (
+  `pp_page` int(10) unsigned NOT NULL DEFAULT 0,
+  `pp_propname` varbinary(255) NOT NULL DEFAULT '',
+  `pp_value` varbinary(255) NOT NULL DEFAULT '',
+  `pp_sortkey` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`pp_page`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page_props` WRITE;
+INSERT INTO `page_props` VALUES (103,'wikibase_item','Q1',NULL),(203,'wikibase_item','Q2',NULL),(303,'wikibase_item','Q3',NULL),(403,'wikibase_item','Q4',NULL),(503,'wikibase_item','Q5',NULL),(603,'wikibase_item','Q6',NULL),(703,'wikibase_item','Q7',NULL),(803,'wikibase_item','Q8',NULL),(903,'wikibase_item','Q9',NULL),(1003,'wikibase_item','Q10',NULL),(1103,'wikibase_item','Q11',NULL),(1203,'wikibase_item','Q12',NULL),(1303,'wikibase_item','Q13',NULL),(1403,'wikibase_item','Q14',NULL);
+INSERT INTO `page_props` VALUES (1503,'wikibase_item','Q15',NULL),(1603,'wikibase_item','Q16',NULL),(1703,'wikibase_item','Q17',NULL),(1803,'wikibase_item','Q18',NULL),(1903,'wikibase_item','Q19',NULL),(2003,'wikibase_item','Q20',NULL),(2103,'wikibase_item','Q21',NULL),(2203,'wikibase_item','Q22',NULL),(2303,'wikibase_item','Q23',NULL),(2503,'wikibase_item','Q25',NULL),(2603,'wikibase_item','Q26',NULL),(2703,'wikibase_item','Q27',NULL),(2803,'wikibase_item','Q28',NULL),(2903,'wikibase_item','Q29',NULL),(103,'wikibase-shortdesc','Schlacht im Jahr 972',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `redirect`;
+CREATE TABLE `redirect` (
+  `rd_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_title` varbinary(255) NOT NULL DEFAULT '',
+  `rd_interwiki` varbinary(255) DEFAULT NULL,
+  `rd_fragment` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`rd_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `redirect` WRITE;
+INSERT INTO `redirect` VALUES (9003,0,'Oder','','');
+UNLOCK TABLES;
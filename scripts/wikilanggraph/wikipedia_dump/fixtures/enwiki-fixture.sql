@@ -0,0 +1,79 @@
+-- MySQL dump of enwiki tables, a small fixture in the format of the Wikimedia SQL dumps
+
+DROP TABLE IF EXISTS `page`;
+CREATE TABLE `page` (
+  `page_id` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_title` varbinary(255) NOT NULL DEFAULT '',
+  `page_is_redirect` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_is_new` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_random` double unsigned NOT NULL DEFAULT 0,
+  `page_touched` varbinary(255) NOT NULL DEFAULT '',
+  `page_links_updated` varbinary(255) NOT NULL DEFAULT '',
+  `page_latest` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_len` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_content_model` varbinary(255) NOT NULL DEFAULT '',
+  `page_lang` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`page_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page` WRITE;
+INSERT INTO `page` VALUES (101,0,'Battle_of_Cedynia',0,0,0.323833,'20240601000000','20240601000000',5101,1000,'wikitext',NULL),(201,0,'Mieszko_I',0,0,0.150849,'20240601000000','20240601000000',5201,1001,'wikitext',NULL),(301,0,'Oder',0,0,0.650934,'20240601000000','20240601000000',5301,1002,'wikitext',NULL),(401,0,'Cedynia',0,0,0.072436,'20240601000000','20240601000000',5401,1003,'wikitext',NULL),(501,0,'Hodo',0,0,0.535882,'20240601000000','20240601000000',5501,1004,'wikitext',NULL),(601,0,'Northern_March',0,0,0.365689,'20240601000000','20240601000000',5601,1005,'wikitext',NULL),(701,0,'Holy_Roman_Empire',0,0,0.057999,'20240601000000','20240601000000',5701,1006,'wikitext',NULL),(801,0,'Otto_I',0,0,0.507436,'20240601000000','20240601000000',5801,1007,'wikitext',NULL),(901,0,'Polans_(western)',0,0,0.037496,'20240601000000','20240601000000',5901,1008,'wikitext',NULL),(1001,0,'Thietmar_of_Merseburg',0,0,0.433646,'20240601000000','20240601000000',6001,1009,'wikitext',NULL),(1101,0,'Czcibor',0,0,0.069855,'20240601000000','20240601000000',6101,1010,'wikitext',NULL),(1201,0,'Pomerania',0,0,0.090713,'20240601000000','20240601000000',6201,1011,'wikitext',NULL),(1301,0,'Wolin',0,0,0.424519,'20240601000000','20240601000000',6301,1012,'wikitext',NULL),(1401,0,'Veleti',0,0,0.826852,'20240601000000','20240601000000',6401,1013,'wikitext',NULL),(1501,0,'Poland',0,0,0.123802,'20240601000000','20240601000000',6501,1014,'wikitext',NULL);
+INSERT INTO `page` VALUES (1601,0,'Germany',0,0,0.223239,'20240601000000','20240601000000',6601,1015,'wikitext',NULL),(1701,0,'972',0,0,0.627433,'20240601000000','20240601000000',6701,1016,'wikitext',NULL),(1801,0,'Piast_dynasty',0,0,0.947709,'20240601000000','20240601000000',6801,1017,'wikitext',NULL),(1901,0,'Christianization_of_Poland',0,0,0.577103,'20240601000000','20240601000000',6901,1018,'wikitext',NULL),(2001,0,'Gniezno',0,0,0.39668,'20240601000000','20240601000000',7001,1019,'wikitext',NULL),(2101,0,'Lusatia',0,0,0.976255,'20240601000000','20240601000000',7101,1020,'wikitext',NULL),(2201,0,'Magdeburg',0,0,0.046583,'20240601000000','20240601000000',7201,1021,'wikitext',NULL),(2301,0,'Battle_of_Lenzen',0,0,0.858468,'20240601000000','20240601000000',7301,1022,'wikitext',NULL),(2401,0,'Sigfried_of_Walbeck',0,0,0.289609,'20240601000000','20240601000000',7401,1023,'wikitext',NULL),(2501,0,'Dobrawa_of_Bohemia',0,0,0.144255,'20240601000000','20240601000000',7501,1024,'wikitext',NULL),(2601,0,'Bolesław_I_the_Brave',0,0,0.117792,'20240601000000','20240601000000',7601,1025,'wikitext',NULL),(2701,0,'West_Pomeranian_Voivodeship',0,0,0.308482,'20240601000000','20240601000000',7701,1026,'wikitext',NULL),(2801,0,'Middle_Ages',0,0,0.816126,'20240601000000','20240601000000',7801,1027,'wikitext',NULL),(2901,0,'Ibrahim_ibn_Ya\'qub',0,0,0.180726,'20240601000000','20240601000000',7901,1028,'wikitext',NULL),(9001,0,'Oder_River',1,0,0.5,'20240601000000','20240601000000',9101,20,'wikitext',NULL),(9501,14,'Battles',0,0,0.25,'20240601000000','20240601000000',9601,20,'wikitext',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `linktarget`;
+CREATE TABLE `linktarget` (
+  `lt_id` int(10) unsigned NOT NULL DEFAULT 0,
+  `lt_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `lt_title` varbinary(255) NOT NULL DEFAULT '',
+  PRIMARY KEY (`lt_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `linktarget` WRITE;
+INSERT INTO `linktarget` VALUES (1,0,'Battle_of_Cedynia'),(2,0,'Mieszko_I'),(3,0,'Oder_River'),(4,0,'Cedynia'),(5,0,'Hodo'),(6,0,'Northern_March'),(7,0,'Holy_Roman_Empire'),(8,0,'Otto_I'),(9,0,'Polans_(western)'),(10,0,'Thietmar_of_Merseburg'),(11,0,'Czcibor'),(12,0,'Pomerania'),(13,0,'Wolin');
+INSERT INTO `linktarget` VALUES (14,0,'Veleti'),(15,0,'Germany'),(16,0,'972'),(17,0,'Piast_dynasty'),(18,0,'Christianization_of_Poland'),(19,0,'Lusatia'),(20,0,'Magdeburg'),(21,0,'Sigfried_of_Walbeck'),(22,0,'Dobrawa_of_Bohemia'),(23,0,'West_Pomeranian_Voivodeship'),(24,0,'Middle_Ages'),(25,0,'Ibrahim_ibn_Ya\'qub'),(26,0,'Battle_of_Santok'),(27,14,'Battles');
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `pagelinks`;
+CREATE TABLE `pagelinks` (
+  `pl_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_from_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_target_id` int(10) unsigned NOT NULL DEFAULT 0,
+  PRIMARY KEY (`pl_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `pagelinks` WRITE;
+INSERT INTO `pagelinks` VALUES (1501,0,1),(2001,0,1),(2301,0,1),(2501,0,1),(2601,0,1),(2701,0,1),(2901,0,1),(101,0,2),(101,0,3),(101,0,4),(101,0,5),(101,0,6),(101,0,7),(101,0,8),(101,0,9),(101,0,10);
+INSERT INTO `pagelinks` VALUES (101,0,11),(101,0,12),(101,0,13),(101,0,14),(101,0,15),(101,0,16),(101,0,17),(101,0,18),(101,0,19),(101,0,20),(101,0,21),(101,0,22),(101,0,23),(101,0,24),(101,0,25),(101,0,26),(101,0,27);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `langlinks`;
+CREATE TABLE `langlinks` (
+  `ll_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `ll_lang` varbinary(255) NOT NULL DEFAULT '',
+  `ll_title` varbinary(255) NOT NULL DEFAULT '',
+  PRIMARY KEY (`ll_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `langlinks` WRITE;
+INSERT INTO `langlinks` VALUES (101,'pl','Bitwa pod Cedynią'),(101,'de','Schlacht bei Zehden'),(201,'pl','Mieszko I'),(201,'de','Mieszko I.'),(301,'pl','Odra'),(301,'de','Oder'),(401,'pl','Cedynia'),(401,'de','Cedynia'),(501,'pl','Hodon'),(501,'de','Hodo (Markgraf)'),(601,'pl','Marchia Północna'),(601,'de','Nordmark'),(701,'pl','Święte Cesarstwo Rzymskie'),(701,'de','Heiliges Römisches Reich'),(801,'pl','Otton I Wielki'),(801,'de','Otto I. (HRR)'),(901,'pl','Polanie'),(901,'de','Polanen'),(1001,'pl','Thietmar'),(1001,'de','Thietmar von Merseburg'),(1101,'pl','Czcibor'),(1101,'de','Czcibor'),(1201,'pl','Pomorze'),(1201,'de','Pommern'),(1301,'pl','Wolin'),(1301,'de','Wolin'),(1401,'pl','Wieleci'),(1401,'de','Wilzen');
+INSERT INTO `langlinks` VALUES (1501,'pl','Polska'),(1501,'de','Polen'),(1601,'pl','Niemcy'),(1601,'de','Deutschland'),(1701,'pl','972'),(1701,'de','972'),(1801,'pl','Piastowie'),(1801,'de','Piasten'),(1901,'pl','Chrzest Polski'),(1901,'de','Christianisierung Polens'),(2001,'pl','Gniezno'),(2001,'de','Gniezno'),(2101,'pl','Łużyce'),(2101,'de','Lausitz'),(2201,'pl','Magdeburg'),(2201,'de','Magdeburg'),(2301,'pl','Bitwa pod Łęczynem'),(2301,'de','Schlacht bei Lenzen'),(2401,'pl','Zygfryd z Walbeck'),(2501,'pl','Dobrawa'),(2501,'de','Dubrawka'),(2601,'pl','Bolesław I Chrobry'),(2601,'de','Bolesław I. (Polen)'),(2701,'pl','Województwo zachodniopomorskie'),(2701,'de','Woiwodschaft Westpommern'),(2801,'pl','Średniowiecze'),(2801,'de','Mittelalter'),(2901,'pl','Ibrahim ibn Jakub'),(2901,'de','Ibrahim ibn Yaqub');
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `page_props`;
+CREATE TABLE `page_props` (
+  `pp_page` int(10) unsigned NOT NULL DEFAULT 0,
+  `pp_propname` varbinary(255) NOT NULL DEFAULT '',
+  `pp_value` varbinary(255) NOT NULL DEFAULT '',
+  `pp_sortkey` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`pp_page`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page_props` WRITE;
+INSERT INTO `page_props` VALUES (101,'wikibase_item','Q1',NULL),(201,'wikibase_item','Q2',NULL),(301,'wikibase_item','Q3',NULL),(401,'wikibase_item','Q4',NULL),(501,'wikibase_item','Q5',NULL),(601,'wikibase_item','Q6',NULL),(701,'wikibase_item','Q7',NULL),(801,'wikibase_item','Q8',NULL),(901,'wikibase_item','Q9',NULL),(1001,'wikibase_item','Q10',NULL),(1101,'wikibase_item','Q11',NULL),(1201,'wikibase_item','Q12',NULL),(1301,'wikibase_item','Q13',NULL),(1401,'wikibase_item','Q14',NULL),(1501,'wikibase_item','Q15',NULL);
+INSERT INTO `page_props` VALUES (1601,'wikibase_item','Q16',NULL),(1701,'wikibase_item','Q17',NULL),(1801,'wikibase_item','Q18',NULL),(1901,'wikibase_item','Q19',NULL),(2001,'wikibase_item','Q20',NULL),(2101,'wikibase_item','Q21',NULL),(2201,'wikibase_item','Q22',NULL),(2301,'wikibase_item','Q23',NULL),(2401,'wikibase_item','Q24',NULL),(2501,'wikibase_item','Q25',NULL),(2601,'wikibase_item','Q26',NULL),(2701,'wikibase_item','Q27',NULL),(2801,'wikibase_item','Q28',NULL),(2901,'wikibase_item','Q29',NULL),(101,'wikibase-shortdesc','Battle in 972',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `redirect`;
+CREATE TABLE `redirect` (
+  `rd_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_title` varbinary(255) NOT NULL DEFAULT '',
+  `rd_interwiki` varbinary(255) DEFAULT NULL,
+  `rd_fragment` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`rd_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `redirect` WRITE;
+INSERT INTO `redirect` VALUES (9001,0,'Oder','','');
+UNLOCK TABLES;
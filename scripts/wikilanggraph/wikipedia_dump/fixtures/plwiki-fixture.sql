@@ -0,0 +1,69 @@
+-- MySQL dump of plwiki tables, a small fixture in the format of the Wikimedia SQL dumps
+
+DROP TABLE IF EXISTS `page`;
+CREATE TABLE `page` (
+  `page_id` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_title` varbinary(255) NOT NULL DEFAULT '',
+  `page_is_redirect` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_is_new` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_random` double unsigned NOT NULL DEFAULT 0,
+  `page_touched` varbinary(255) NOT NULL DEFAULT '',
+  `page_links_updated` varbinary(255) NOT NULL DEFAULT '',
+  `page_latest` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_len` int(10) unsigned NOT NULL DEFAULT 0,
+  `page_content_model` varbinary(255) NOT NULL DEFAULT '',
+  `page_lang` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`page_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page` WRITE;
+INSERT INTO `page` VALUES (102,0,'Bitwa_pod_Cedynią',0,0,0.247615,'20240601000000','20240601000000',5102,1000,'wikitext',NULL),(202,0,'Mieszko_I',0,0,0.39095,'20240601000000','20240601000000',5202,1001,'wikitext',NULL),(302,0,'Odra',0,0,0.871422,'20240601000000','20240601000000',5302,1002,'wikitext',NULL),(402,0,'Cedynia',0,0,0.080581,'20240601000000','20240601000000',5402,1003,'wikitext',NULL),(502,0,'Hodon',0,0,0.449187,'20240601000000','20240601000000',5502,1004,'wikitext',NULL),(602,0,'Marchia_Północna',0,0,0.54944,'20240601000000','20240601000000',5602,1005,'wikitext',NULL),(702,0,'Święte_Cesarstwo_Rzymskie',0,0,0.883384,'20240601000000','20240601000000',5702,1006,'wikitext',NULL),(802,0,'Otton_I_Wielki',0,0,0.81928,'20240601000000','20240601000000',5802,1007,'wikitext',NULL),(902,0,'Polanie',0,0,0.863984,'20240601000000','20240601000000',5902,1008,'wikitext',NULL),(1002,0,'Thietmar',0,0,0.278421,'20240601000000','20240601000000',6002,1009,'wikitext',NULL),(1102,0,'Czcibor',0,0,0.415297,'20240601000000','20240601000000',6102,1010,'wikitext',NULL),(1202,0,'Pomorze',0,0,0.358771,'20240601000000','20240601000000',6202,1011,'wikitext',NULL),(1302,0,'Wolin',0,0,0.884193,'20240601000000','20240601000000',6302,1012,'wikitext',NULL),(1402,0,'Wieleci',0,0,0.957731,'20240601000000','20240601000000',6402,1013,'wikitext',NULL),(1502,0,'Polska',0,0,0.150921,'20240601000000','20240601000000',6502,1014,'wikitext',NULL);
+INSERT INTO `page` VALUES (1602,0,'Niemcy',0,0,0.176218,'20240601000000','20240601000000',6602,1015,'wikitext',NULL),(1702,0,'972',0,0,0.231957,'20240601000000','20240601000000',6702,1016,'wikitext',NULL),(1802,0,'Piastowie',0,0,0.233336,'20240601000000','20240601000000',6802,1017,'wikitext',NULL),(1902,0,'Chrzest_Polski',0,0,0.484963,'20240601000000','20240601000000',6902,1018,'wikitext',NULL),(2002,0,'Gniezno',0,0,0.589124,'20240601000000','20240601000000',7002,1019,'wikitext',NULL),(2102,0,'Łużyce',0,0,0.262747,'20240601000000','20240601000000',7102,1020,'wikitext',NULL),(2202,0,'Magdeburg',0,0,0.004094,'20240601000000','20240601000000',7202,1021,'wikitext',NULL),(2302,0,'Bitwa_pod_Łęczynem',0,0,0.418947,'20240601000000','20240601000000',7302,1022,'wikitext',NULL),(2402,0,'Zygfryd_z_Walbeck',0,0,0.369254,'20240601000000','20240601000000',7402,1023,'wikitext',NULL),(2502,0,'Dobrawa',0,0,0.566341,'20240601000000','20240601000000',7502,1024,'wikitext',NULL),(2602,0,'Bolesław_I_Chrobry',0,0,0.953098,'20240601000000','20240601000000',7602,1025,'wikitext',NULL),(2702,0,'Województwo_zachodniopomorskie',0,0,0.690494,'20240601000000','20240601000000',7702,1026,'wikitext',NULL),(2802,0,'Średniowiecze',0,0,0.515491,'20240601000000','20240601000000',7802,1027,'wikitext',NULL),(2902,0,'Ibrahim_ibn_Jakub',0,0,0.617593,'20240601000000','20240601000000',7902,1028,'wikitext',NULL),(9002,0,'Rzeka_Odra',1,0,0.5,'20240601000000','20240601000000',9102,20,'wikitext',NULL),(9502,14,'Battles',0,0,0.25,'20240601000000','20240601000000',9602,20,'wikitext',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `pagelinks`;
+CREATE TABLE `pagelinks` (
+  `pl_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `pl_title` varbinary(255) NOT NULL DEFAULT '',
+  `pl_from_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  PRIMARY KEY (`pl_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `pagelinks` WRITE;
+INSERT INTO `pagelinks` VALUES (602,0,'Bitwa_pod_Cedynią',0),(702,0,'Bitwa_pod_Cedynią',0),(902,0,'Bitwa_pod_Cedynią',0),(1102,0,'Bitwa_pod_Cedynią',0),(1202,0,'Bitwa_pod_Cedynią',0),(1502,0,'Bitwa_pod_Cedynią',0),(1702,0,'Bitwa_pod_Cedynią',0),(2202,0,'Bitwa_pod_Cedynią',0),(2402,0,'Bitwa_pod_Cedynią',0),(2902,0,'Bitwa_pod_Cedynią',0),(102,0,'Mieszko_I',0),(102,0,'Rzeka_Odra',0),(102,0,'Otton_I_Wielki',0),(102,0,'Polanie',0),(102,0,'Thietmar',0),(102,0,'Czcibor',0),(102,0,'Pomorze',0);
+INSERT INTO `pagelinks` VALUES (102,0,'Wolin',0),(102,0,'Wieleci',0),(102,0,'Polska',0),(102,0,'Niemcy',0),(102,0,'972',0),(102,0,'Piastowie',0),(102,0,'Chrzest_Polski',0),(102,0,'Gniezno',0),(102,0,'Łużyce',0),(102,0,'Magdeburg',0),(102,0,'Zygfryd_z_Walbeck',0),(102,0,'Dobrawa',0),(102,0,'Bolesław_I_Chrobry',0),(102,0,'Województwo_zachodniopomorskie',0),(102,0,'Średniowiecze',0),(102,0,'Ibrahim_ibn_Jakub',0),(102,0,'Bitwa_pod_Santokiem',0),(102,14,'Battles',0);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `langlinks`;
+CREATE TABLE `langlinks` (
+  `ll_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `ll_lang` varbinary(255) NOT NULL DEFAULT '',
+  `ll_title` varbinary(255) NOT NULL DEFAULT '',
+  PRIMARY KEY (`ll_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `langlinks` WRITE;
+INSERT INTO `langlinks` VALUES (102,'en','Battle of Cedynia'),(102,'de','Schlacht bei Zehden'),(202,'en','Mieszko I'),(202,'de','Mieszko I.'),(302,'en','Oder'),(302,'de','Oder'),(402,'en','Cedynia'),(402,'de','Cedynia'),(502,'en','Hodo'),(502,'de','Hodo (Markgraf)'),(602,'en','Northern March'),(602,'de','Nordmark'),(702,'en','Holy Roman Empire'),(702,'de','Heiliges Römisches Reich'),(802,'en','Otto I'),(802,'de','Otto I. (HRR)'),(902,'en','Polans (western)'),(902,'de','Polanen'),(1002,'en','Thietmar of Merseburg'),(1002,'de','Thietmar von Merseburg'),(1102,'en','Czcibor'),(1102,'de','Czcibor'),(1202,'en','Pomerania'),(1202,'de','Pommern'),(1302,'en','Wolin'),(1302,'de','Wolin'),(1402,'en','Veleti'),(1402,'de','Wilzen');
+INSERT INTO `langlinks` VALUES (1502,'en','Poland'),(1502,'de','Polen'),(1602,'en','Germany'),(1602,'de','Deutschland'),(1702,'en','972'),(1702,'de','972'),(1802,'en','Piast dynasty'),(1802,'de','Piasten'),(1902,'en','Christianization of Poland'),(1902,'de','Christianisierung Polens'),(2002,'en','Gniezno'),(2002,'de','Gniezno'),(2102,'en','Lusatia'),(2102,'de','Lausitz'),(2202,'en','Magdeburg'),(2202,'de','Magdeburg'),(2302,'en','Battle of Lenzen'),(2302,'de','Schlacht bei Lenzen'),(2402,'en','Sigfried of Walbeck'),(2502,'en','Dobrawa of Bohemia'),(2502,'de','Dubrawka'),(2602,'en','Bolesław I the Brave'),(2602,'de','Bolesław I. (Polen)'),(2702,'en','West Pomeranian Voivodeship'),(2702,'de','Woiwodschaft Westpommern'),(2802,'en','Middle Ages'),(2802,'de','Mittelalter'),(2902,'en','Ibrahim ibn Ya\'qub'),(2902,'de','Ibrahim ibn Yaqub');
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `page_props`;
+CREATE TABLE `page_props` (
+  `pp_page` int(10) unsigned NOT NULL DEFAULT 0,
+  `pp_propname` varbinary(255) NOT NULL DEFAULT '',
+  `pp_value` varbinary(255) NOT NULL DEFAULT '',
+  `pp_sortkey` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`pp_page`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `page_props` WRITE;
+INSERT INTO `page_props` VALUES (102,'wikibase_item','Q1',NULL),(202,'wikibase_item','Q2',NULL),(302,'wikibase_item','Q3',NULL),(402,'wikibase_item','Q4',NULL),(502,'wikibase_item','Q5',NULL),(602,'wikibase_item','Q6',NULL),(702,'wikibase_item','Q7',NULL),(802,'wikibase_item','Q8',NULL),(902,'wikibase_item','Q9',NULL),(1002,'wikibase_item','Q10',NULL),(1102,'wikibase_item','Q11',NULL),(1202,'wikibase_item','Q12',NULL),(1302,'wikibase_item','Q13',NULL),(1402,'wikibase_item','Q14',NULL),(1502,'wikibase_item','Q15',NULL);
+INSERT INTO `page_props` VALUES (1602,'wikibase_item','Q16',NULL),(1702,'wikibase_item','Q17',NULL),(1802,'wikibase_item','Q18',NULL),(1902,'wikibase_item','Q19',NULL),(2002,'wikibase_item','Q20',NULL),(2102,'wikibase_item','Q21',NULL),(2202,'wikibase_item','Q22',NULL),(2302,'wikibase_item','Q23',NULL),(2402,'wikibase_item','Q24',NULL),(2502,'wikibase_item','Q25',NULL),(2602,'wikibase_item','Q26',NULL),(2702,'wikibase_item','Q27',NULL),(2802,'wikibase_item','Q28',NULL),(2902,'wikibase_item','Q29',NULL),(102,'wikibase-shortdesc','Bitwa w 972 roku',NULL);
+UNLOCK TABLES;
+DROP TABLE IF EXISTS `redirect`;
+CREATE TABLE `redirect` (
+  `rd_from` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_namespace` int(10) unsigned NOT NULL DEFAULT 0,
+  `rd_title` varbinary(255) NOT NULL DEFAULT '',
+  `rd_interwiki` varbinary(255) DEFAULT NULL,
+  `rd_fragment` varbinary(255) DEFAULT NULL,
+  PRIMARY KEY (`rd_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary;
+LOCK TABLES `redirect` WRITE;
+INSERT INTO `redirect` VALUES (9002,0,'Odra','','');
+UNLOCK TABLES;
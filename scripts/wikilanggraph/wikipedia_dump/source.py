@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+__all__ = ["DumpDataSource"]
+
+import logging
+from typing import Any
+
+import httpx
+
+from scripts.wikilanggraph.wikipedia_api.source import DataSource
+from scripts.wikilanggraph.wikipedia_dump.store import ARTICLE_NAMESPACE
+from scripts.wikilanggraph.wikipedia_dump.store import DumpStore
+from scripts.wikilanggraph.wikipedia_dump.store import StoredPage
+
+logger = logging.getLogger(__name__)
+
+
+class DumpDataSource(DataSource):
+    """Answers the API requests made by pages from a DumpStore, with no network at all.
+
+    Responses are shaped like those of the MediaWiki API, so pages are parsed
+    the same way whatever their source. Every response is complete, so no
+    continuation is ever needed. SQL dumps describe the latest revisions only,
+    so revision histories are empty and past revisions cannot be parsed.
+    """
+
+    def __init__(self: DumpDataSource, store: DumpStore) -> None:
+        self.store: DumpStore = store
+        self.requests: int = 0
+
+    def __repr__(self: DumpDataSource) -> str:
+        return f"DumpDataSource(store={self.store}, requests={self.requests})"
+
+    async def fetch_json(
+        self: DumpDataSource,
+        client: httpx.AsyncClient,
+        language: str,
+        params: dict[str, Any],
+        description: str,
+    ) -> dict:
+        self.requests += 1
+        action = params.get("action")
+        if action == "query":
+            return self.query(language, params)
+        if action == "parse":
+            logger.warning('Revisions are not part of the dumps, cannot parse "%s"', description)
+            return _error("nosuchrevid", "Revision histories are not part of the imported dumps")
+        return _error("badvalue", f'Unsupported action "{action}"')
+
+    def query(self: DumpDataSource, language: str, params: dict[str, Any]) -> dict:
+        props = set(str(params.get("prop", "")).split("|"))
+        normalized, redirects, pages = [], [], {}
+        missing_id = -1
+        for title in str(params.get("titles", "")).split("|"):
+            name = _normalize(title)
+            if name != title:
+                normalized.append({"from": title, "to": name})
+            page = self.store.page(language, name)
+            if page is not None and page.is_redirect and params.get("redirects"):
+                target = self.store.redirect_target(language, page.id)
+                if target is not None:
+                    redirects.append({"from": name, "to": target})
+                    name, page = target, self.store.page(language, target)
+            if page is None:
+                pages[str(missing_id)] = {"ns": ARTICLE_NAMESPACE, "title": name, "missing": ""}
+                missing_id -= 1
+                continue
+            pages[str(page.id)] = self._page_data(language, page, props, params)
+        query = {"pages": pages}
+        if normalized:
+            query["normalized"] = normalized
+        if redirects:
+            query["redirects"] = redirects
+        return {"batchcomplete": "", "query": query}
+
+    def _page_data(
+        self: DumpDataSource,
+        language: str,
+        page: StoredPage,
+        props: set[str],
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        data = {"pageid": page.id, "ns": ARTICLE_NAMESPACE, "title": page.title}
+        properties = self.store.properties(language, page.id)
+        prop_data = {
+            "info": self._info,
+            "pageprops": self._pageprops,
+            "pageterms": self._pageterms,
+            "langlinks": self._langlinks,
+            "links": self._links,
+            "redirects": self._redirects,
+        }
+        for prop, read in prop_data.items():
+            if prop in props:
+                data.update(read(language, page, properties, params))
+        return data
+
+    @staticmethod
+    def _info(
+        language: str, page: StoredPage, properties: dict[str, str], params: dict[str, Any]
+    ) -> dict[str, Any]:
+        if "displaytitle" not in str(params.get("inprop", "")):
+            return {}
+        return {"displaytitle": properties.get("displaytitle") or page.title}
+
+    @staticmethod
+    def _pageprops(
+        language: str, page: StoredPage, properties: dict[str, str], params: dict[str, Any]
+    ) -> dict[str, Any]:
+        names = params.get("ppprop")
+        pageprops = {
+            name: value
+            for name, value in properties.items()
+            if not names or name in str(names).split("|")
+        }
+        return {"pageprops": pageprops} if pageprops else {}
+
+    @staticmethod
+    def _pageterms(
+        language: str, page: StoredPage, properties: dict[str, str], params: dict[str, Any]
+    ) -> dict[str, Any]:
+        if "wikibase-shortdesc" not in properties:
+            return {}
+        return {"terms": {"description": [properties["wikibase-shortdesc"]]}}
+
+    def _langlinks(
+        self: DumpDataSource,
+        language: str,
+        page: StoredPage,
+        properties: dict[str, str],
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        langlinks = self.store.langlinks(language, page.id)
+        if not langlinks:
+            return {}
+        return {"langlinks": [{"lang": lang, "*": title} for lang, title in langlinks]}
+
+    def _links(
+        self: DumpDataSource,
+        language: str,
+        page: StoredPage,
+        properties: dict[str, str],
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        links = self.store.links(language, page.id)
+        if not links:
+            return {}
+        return {"links": [{"ns": ARTICLE_NAMESPACE, "title": title} for title in links]}
+
+    def _redirects(
+        self: DumpDataSource,
+        language: str,
+        page: StoredPage,
+        properties: dict[str, str],
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        aliases = self.store.redirects_to(language, page.title)
+        if not aliases:
+            return {}
+        return {
+            "redirects": [
+                {"pageid": alias.id, "ns": ARTICLE_NAMESPACE, "title": alias.title}
+                for alias in aliases
+            ]
+        }
+
+
+def _normalize(title: str) -> str:
+    """Normalize a title like MediaWiki does for wikis with capitalized links"""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def _error(code: str, info: str) -> dict:
+    return {"error": {"code": code, "info": info}}
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+__all__ = ["DUMP_COLUMNS", "read_sql_dump", "dump_language"]
+
+import gzip
+import logging
+import os
+import re
+from collections import Iterator
+from typing import Any
+from typing import Optional
+from typing import TextIO
+
+logger = logging.getLogger(__name__)
+
+Row = tuple[Any, ...]
+
+# Columns of the tables in recent dumps, used when a dump has no CREATE TABLE
+DUMP_COLUMNS: dict[str, tuple[str, ...]] = {
+    "page": (
+        "page_id", "page_namespace", "page_title", "page_is_redirect", "page_is_new",
+        "page_random", "page_touched", "page_links_updated", "page_latest", "page_len",
+        "page_content_model", "page_lang",
+    ),
+    "pagelinks": ("pl_from", "pl_from_namespace", "pl_target_id"),
+    "linktarget": ("lt_id", "lt_namespace", "lt_title"),
+    "langlinks": ("ll_from", "ll_lang", "ll_title"),
+    "page_props": ("pp_page", "pp_propname", "pp_value", "pp_sortkey"),
+    "redirect": ("rd_from", "rd_namespace", "rd_title", "rd_interwiki", "rd_fragment"),
+}
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE `(\w+)` \(")
+_COLUMN = re.compile(r"\s+`(\w+)`")
+_INSERT = re.compile(r"INSERT INTO `(\w+)` VALUES ")
+_VALUE = re.compile(r"""'((?:[^'\\]|\\.)*)'|(NULL)|([-+]?[0-9][0-9.eE+-]*)|(\))""")
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {"0": "\0", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+_DUMP_NAME = re.compile(r"^(\w+?)wiki-")
+
+
+def dump_language(path: str) -> Optional[str]:
+    """Language of a dump named like "plwiki-20240601-pagelinks.sql.gz" """
+    match = _DUMP_NAME.match(os.path.basename(path))
+    return match.group(1).replace("_", "-") if match else None
+
+
+def read_sql_dump(path: str) -> Iterator[tuple[str, tuple[str, ...], list[Row]]]:
+    """Yield (table, columns, rows) for every INSERT statement of a MySQL dump.
+
+    Dumps may be gzip compressed. Statements are read one line at a time, so
+    even dumps of the largest wikis are never loaded as a whole.
+    """
+    columns = dict(DUMP_COLUMNS)
+    with _open(path) as dump:
+        create_table, create_columns = None, []
+        for line in dump:
+            if create_table is not None:
+                match = _COLUMN.match(line)
+                if match:
+                    create_columns.append(match.group(1))
+                    continue
+                columns[create_table] = tuple(create_columns)
+                create_table = None
+            if line.startswith("CREATE TABLE"):
+                match = _CREATE_TABLE.match(line)
+                if match:
+                    create_table, create_columns = match.group(1), []
+            elif line.startswith("INSERT INTO"):
+                match = _INSERT.match(line)
+                if match:
+                    table = match.group(1)
+                    yield table, columns.get(table, ()), _parse_values(line, match.end())
+
+
+def _open(path: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "rt", encoding="utf-8", errors="replace")
+
+
+def _parse_values(line: str, start: int) -> list[Row]:
+    rows, row = [], []
+    for match in _VALUE.finditer(line, start):
+        string, null, number, end = match.groups()
+        if end is not None:
+            rows.append(tuple(row))
+            row = []
+        elif string is not None:
+            row.append(_unescape(string) if "\\" in string else string)
+        elif null is not None:
+            row.append(None)
+        else:
+            row.append(float(number) if "." in number or "e" in number.lower() else int(number))
+    return rows
+
+
+def _unescape(string: str) -> str:
+    return _ESCAPE.sub(lambda match: _ESCAPES.get(match.group(1), match.group(1)), string)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+__all__ = ["DumpStore", "StoredPage"]
+
+import logging
+import os
+import sqlite3
+from collections import Iterable
+from dataclasses import dataclass
+from typing import Any
+from typing import Optional
+
+from scripts.wikilanggraph.wikipedia_dump.sql_dump import dump_language
+from scripts.wikilanggraph.wikipedia_dump.sql_dump import read_sql_dump
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_NAMESPACE = 0
+# Page properties used by the emulated API responses
+PAGE_PROPERTIES = ("wikibase_item", "wikibase-shortdesc", "displaytitle")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS page (
+    language TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    is_redirect INTEGER NOT NULL,
+    PRIMARY KEY (language, id)
+);
+CREATE INDEX IF NOT EXISTS page_title ON page (language, title);
+CREATE TABLE IF NOT EXISTS link (
+    language TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS link_page ON link (language, page_id);
+CREATE TABLE IF NOT EXISTS link_target (
+    language TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    target_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS linktarget (
+    language TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    PRIMARY KEY (language, id)
+);
+CREATE TABLE IF NOT EXISTS langlink (
+    language TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    target_language TEXT NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS langlink_page ON langlink (language, page_id);
+CREATE TABLE IF NOT EXISTS property (
+    language TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (language, page_id, name)
+);
+CREATE TABLE IF NOT EXISTS redirect (
+    language TEXT NOT NULL,
+    page_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    PRIMARY KEY (language, page_id)
+);
+CREATE INDEX IF NOT EXISTS redirect_title ON redirect (language, title);
+"""
+
+
+@dataclass(frozen=True)
+class StoredPage:
+    __slots__ = ("id", "title", "is_redirect")
+    id: int
+    title: str
+    is_redirect: bool
+
+
+class DumpStore:
+    """Local SQLite store of the Wikipedia SQL dumps needed to build language graphs.
+
+    Articles, their links, langlinks, page properties and redirects are
+    imported from the ``page``, ``pagelinks`` (with ``linktarget`` for dumps
+    from 2024 on), ``langlinks``, ``page_props`` and ``redirect`` dumps of any
+    number of wikis, and indexed for the lookups made when fetching pages.
+    Titles are stored with spaces, the way the API returns them.
+    """
+
+    def __init__(self: DumpStore, path: str) -> None:
+        self._path: str = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.realpath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __repr__(self: DumpStore) -> str:
+        return f"DumpStore(path={self._path}, {self.stats()})"
+
+    def close(self: DumpStore) -> None:
+        self._connection.close()
+
+    def stats(self: DumpStore) -> dict[str, int]:
+        return {
+            table: self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("page", "link", "langlink", "property", "redirect")
+        }
+
+    def languages(self: DumpStore) -> list[str]:
+        rows = self._connection.execute("SELECT DISTINCT language FROM page ORDER BY language")
+        return [language for language, in rows]
+
+    def import_dumps(self: DumpStore, paths: Iterable[str], language: Optional[str] = None) -> None:
+        """Import SQL dumps, taking their language from the file name unless given"""
+        for path in paths:
+            dump_lang = language or dump_language(path)
+            if dump_lang is None:
+                raise ValueError(f'Cannot tell the language of dump "{path}"')
+            self.import_dump(path, language=dump_lang)
+        self._resolve_link_targets()
+
+    def import_dump(self: DumpStore, path: str, language: str) -> None:
+        logger.info('Importing dump "%s" as language "%s"', path, language)
+        with self._connection:
+            for table, columns, rows in read_sql_dump(path):
+                try:
+                    importer = getattr(self, f"_import_{table}")
+                except AttributeError:
+                    logger.debug('Skipping rows of table "%s"', table)
+                    continue
+                importer(language, [dict(zip(columns, row)) for row in rows])
+        logger.info("Imported dump: %s", self)
+
+    def page(self: DumpStore, language: str, title: str) -> Optional[StoredPage]:
+        row = self._connection.execute(
+            "SELECT id, title, is_redirect FROM page WHERE language = ? AND title = ?",
+            (language, title),
+        ).fetchone()
+        return StoredPage(row[0], row[1], bool(row[2])) if row else None
+
+    def redirect_target(self: DumpStore, language: str, page_id: int) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT title FROM redirect WHERE language = ? AND page_id = ?",
+            (language, page_id),
+        ).fetchone()
+        return row[0] if row else None
+
+    def redirects_to(self: DumpStore, language: str, title: str) -> list[StoredPage]:
+        rows = self._connection.execute(
+            "SELECT page.id, page.title FROM redirect JOIN page"
+            " ON page.language = redirect.language AND page.id = redirect.page_id"
+            " WHERE redirect.language = ? AND redirect.title = ? ORDER BY page.title",
+            (language, title),
+        )
+        return [StoredPage(page_id, page_title, True) for page_id, page_title in rows]
+
+    def links(self: DumpStore, language: str, page_id: int) -> list[str]:
+        rows = self._connection.execute(
+            "SELECT DISTINCT title FROM link WHERE language = ? AND page_id = ? ORDER BY title",
+            (language, page_id),
+        )
+        return [title for title, in rows]
+
+    def langlinks(self: DumpStore, language: str, page_id: int) -> list[tuple[str, str]]:
+        rows = self._connection.execute(
+            "SELECT target_language, title FROM langlink"
+            " WHERE language = ? AND page_id = ? ORDER BY target_language",
+            (language, page_id),
+        )
+        return rows.fetchall()
+
+    def properties(self: DumpStore, language: str, page_id: int) -> dict[str, str]:
+        rows = self._connection.execute(
+            "SELECT name, value FROM property WHERE language = ? AND page_id = ?",
+            (language, page_id),
+        )
+        return dict(rows)
+
+    def _import_page(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO page VALUES (?, ?, ?, ?)",
+            (
+                (language, row["page_id"], _title(row["page_title"]), row["page_is_redirect"])
+                for row in rows
+                if row["page_namespace"] == ARTICLE_NAMESPACE
+            ),
+        )
+
+    def _import_pagelinks(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        if rows and "pl_target_id" in rows[0]:
+            self._connection.executemany(
+                "INSERT INTO link_target VALUES (?, ?, ?)",
+                ((language, row["pl_from"], row["pl_target_id"]) for row in rows),
+            )
+            return
+        # dumps from before 2024 name link targets directly
+        self._connection.executemany(
+            "INSERT INTO link VALUES (?, ?, ?)",
+            (
+                (language, row["pl_from"], _title(row["pl_title"]))
+                for row in rows
+                if row["pl_namespace"] == ARTICLE_NAMESPACE
+            ),
+        )
+
+    def _import_linktarget(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO linktarget VALUES (?, ?, ?)",
+            (
+                (language, row["lt_id"], _title(row["lt_title"]))
+                for row in rows
+                if row["lt_namespace"] == ARTICLE_NAMESPACE
+            ),
+        )
+
+    def _import_langlinks(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT INTO langlink VALUES (?, ?, ?, ?)",
+            (
+                (language, row["ll_from"], row["ll_lang"], row["ll_title"])
+                for row in rows
+                if row["ll_title"]
+            ),
+        )
+
+    def _import_page_props(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO property VALUES (?, ?, ?, ?)",
+            (
+                (language, row["pp_page"], row["pp_propname"], row["pp_value"])
+                for row in rows
+                if row["pp_propname"] in PAGE_PROPERTIES
+            ),
+        )
+
+    def _import_redirect(self: DumpStore, language: str, rows: list[dict[str, Any]]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO redirect VALUES (?, ?, ?)",
+            (
+                (language, row["rd_from"], _title(row["rd_title"]))
+                for row in rows
+                if row["rd_namespace"] == ARTICLE_NAMESPACE and not row["rd_interwiki"]
+            ),
+        )
+
+    def _resolve_link_targets(self: DumpStore) -> None:
+        """Turn links imported by target id into links by title, once both dumps are in"""
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO link"
+                " SELECT link_target.language, link_target.page_id, linktarget.title"
+                " FROM link_target JOIN linktarget ON linktarget.language = link_target.language"
+                " AND linktarget.id = link_target.target_id"
+            )
+            # what is left of a wiki whose link targets are in links to other namespaces
+            self._connection.execute(
+                "DELETE FROM link_target"
+                " WHERE language IN (SELECT DISTINCT language FROM linktarget)"
+            )
+
+
+def _title(title: str) -> str:
+    return title.replace("_", " ")
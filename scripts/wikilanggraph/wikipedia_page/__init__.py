@@ -1,7 +1,15 @@
-__all__ = ["Page", "PageKey", "PageKeySet", "RevisionKey", "RevisionKeys"]
+__all__ = [
+    "Page",
+    "PageKey",
+    "PageKeySet",
+    "RevisionKey",
+    "RevisionKeys",
+    "TimelineIndex",
+]
 
 from scripts.wikilanggraph.wikipedia_page.page import Page
 from scripts.wikilanggraph.wikipedia_page.page import PageKey
 from scripts.wikilanggraph.wikipedia_page.page import PageKeySet
-from scripts.wikilanggraph.wikipedia_page.page import RevisionKey
-from scripts.wikilanggraph.wikipedia_page.page import RevisionKeys
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKey
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKeys
+from scripts.wikilanggraph.wikipedia_page.timeline import TimelineIndex
@@ -1,38 +1,69 @@
 from __future__ import annotations
 
-__all__ = ["Page", "PageKey", "PageKeySet", "RevisionKey", "RevisionKeys"]
+__all__ = ["Page", "PageKey", "PageKeySet"]
 
 import asyncio
 import datetime
 import logging
 import re
+import sys
+from collections import AsyncIterator
 from collections import Coroutine
 from collections import Generator
 from collections import Iterable
 from collections import defaultdict
 from contextlib import suppress
 from dataclasses import dataclass
+from urllib.parse import quote
 from urllib.parse import unquote
 
-import dateutil.parser
 from typing import Any
 from typing import Optional
+from typing import Sequence
 
 import httpx
 
-from scripts.wikilanggraph.structures.base_list import BaseList
+from scripts.wikilanggraph.instrumentation import count
+from scripts.wikilanggraph.instrumentation import span
+from scripts.wikilanggraph.instrumentation import traced
 from scripts.wikilanggraph.structures.base_set import BaseSet
-from scripts.wikilanggraph.wikipedia_page.mergedicts import mergedicts
+from scripts.wikilanggraph.structures.multiton import MultitonRegistry
 from scripts.wikilanggraph.structures.multiton import multiton
+from scripts.wikilanggraph.structures.node_key import NodeKey
+from scripts.wikilanggraph.wikipedia_api.request import fetch_json
+from scripts.wikilanggraph.wikipedia_api.scheduler import FETCH_ERRORS
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKey
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKeys
 
 logger = logging.getLogger(__name__)
 
-Seconds = int
+# MediaWiki accepts at most 50 titles per query for regular (non-bot) users
+MAX_TITLES_PER_QUERY = 50
+# Keep the percent-encoded "titles" parameter well below common URL length limits
+MAX_TITLES_LENGTH = 4000
+TITLES_SEPARATOR = quote("|")
 
 
 @multiton("title", "language", "revision", "timestamp")
 class Page:
-    _instances = {}
+    __slots__ = (
+        "_aliases",
+        "_title",
+        "_language",
+        "_revision",
+        "_timestamp",
+        "_wikibase_item",
+        "_displaytitle",
+        "_description",
+        "_backlinks",
+        "_links",
+        "_langlinks",
+        "_fetched",
+        "_valid",
+        "_revisions",
+        "__weakref__",
+    )
+    _instances = MultitonRegistry()
 
     def __init__(
         self: Page,
@@ -44,8 +75,8 @@ class Page:
     ) -> None:
         super().__init__()
         self._aliases: set[str] = set()
-        self._title: str = title
-        self._language: str = language
+        self._title: str = sys.intern(title)
+        self._language: str = sys.intern(language)
         self._revision: Optional[str] = revision
         self._timestamp: Optional[datetime.datetime] = timestamp
         self._wikibase_item: Optional[str] = None
@@ -59,17 +90,15 @@ class Page:
         self._revisions: RevisionKeys[RevisionKey] = RevisionKeys()
 
     def to_serializable(self):
-        dict_repr = self.__dict__
         attribute_mapping = {
             "_language": "language",
-            "_displaytitle": "title",
             "_timestamp": "timestamp",
+            "_displaytitle": "title",
             "_description": "description",
         }
         return {
-            attribute_mapping[k]: v
-            for k, v in dict_repr.items()
-            if k in attribute_mapping
+            name: getattr(self, attribute)
+            for attribute, name in attribute_mapping.items()
         }
 
     def __repr__(self: Page) -> str:
@@ -140,16 +169,15 @@ class Page:
 
     @property
     def timepoints_all_languages(self: Page) -> RevisionKeys[RevisionKey]:
-        return self.revisions + self._langlinks.revisions
+        return RevisionKeys.concatenate([self.revisions, self._langlinks.revisions])
 
     @property
-    def timepoints_all_languages_as_dict(self: Page) -> defaultdict[str, RevisionKeys[RevisionKey]]:
-        original_revision_mapping = {self.language: self.revisions}
-        lang_to_revision_mapping = defaultdict(RevisionKeys)
-        lang_to_revision_mapping |= original_revision_mapping
-        for rev in self._langlinks.revisions:
-            lang_to_revision_mapping[rev.language].append(rev)
-        return lang_to_revision_mapping
+    def timepoints_all_languages_as_dict(self: Page) -> dict[str, RevisionKeys[RevisionKey]]:
+        lang_to_revision_mapping = self._langlinks.revisions.by_language()
+        own_revisions = RevisionKeys.concatenate(
+            [self.revisions, lang_to_revision_mapping.pop(self.language, RevisionKeys())]
+        )
+        return {self.language: own_revisions} | lang_to_revision_mapping
 
     def to_pagekey(self: Page) -> PageKey:
         return PageKey(language=self.language, title=self.title)
@@ -164,10 +192,20 @@ class Page:
             await self.fetch_page(client=client)
         if languages is not None:
             self._langlinks.filter_languages(languages=languages)
-        coroutines = await self._langlinks.fetch_pages_coroutines(
-            client=client, make_unique=make_unique
+        langlinks = list(self._langlinks.pages)
+        results = await asyncio.gather(
+            *(page.fetch_page(client=client, make_unique=make_unique) for page in langlinks),
+            return_exceptions=True,
         )
-        await asyncio.gather(*coroutines)
+        for page, result in zip(langlinks, results):
+            if isinstance(result, FETCH_ERRORS):
+                # a language version that cannot be fetched is left out like a missing one
+                logger.error(
+                    'Skipping language "%s" of "%s": %s', page.language, page.title, result
+                )
+                page._valid = False
+            elif isinstance(result, BaseException):
+                raise result
         self._langlinks.remove_nonexistent()
 
     async def fetch_links(
@@ -176,10 +214,11 @@ class Page:
         if not self._fetched:
             await self.fetch_page(client=client)
         # self._links.filter_titles(avoid=avoid)
-        coroutines = await self._links.fetch_pages_coroutines(client=client)
+        coroutines = await self._links.fetch_pages_batched_coroutines(client=client)
         await asyncio.gather(*coroutines)
         self._links.remove_nonexistent()
 
+    @traced("fetch page")
     async def fetch_page(
         self: Page, client: httpx.AsyncClient, make_unique: bool = False
     ) -> None:
@@ -190,213 +229,356 @@ class Page:
             )
             return
         self._fetched = True
+        if self._revision:
+            self._wikibase_item = self._current_wikibase_item()
 
         arg_revisions = make_unique and not self._revision
         arg_type_ = "parse" if self._revision else "query"
-        data = await self._fetch(
+        batches = self._fetch(
             client, links=make_unique, revisions=arg_revisions, type_=arg_type_
         )
-        while "continue" in data:
-            extra_params = data.pop("continue")
-            logger.debug(
-                'Continue fetching for page "%s": %s', self.title, extra_params
-            )
-            new_data = await self._fetch(
-                client,
-                links=make_unique,
-                revisions=make_unique,
-                type_=arg_type_,
-                **extra_params,
-            )
-            data = dict(mergedicts(data, new_data))
-        if arg_type_ == 'query':
-            try:
-                page_number, page_data = data["query"]["pages"].popitem()
+        revisions = []
+        async for data in batches:
+            if arg_type_ == 'query':
+                try:
+                    page_number, page_data = data["query"]["pages"].popitem()
+                except KeyError as e:
+                    logger.exception(e)
+                    continue
                 if page_number == "-1":
                     logger.warning(
                         'Linked page "%s" does not exist and will be removed', self.title
                     )
                     return
                 self._valid = True
-            except KeyError as e:
-                page_data = None
-                logger.exception(e)
-        else:
-            try:
-                page_data = data["parse"]
-            except KeyError as e:
-                page_data = None
-                logger.exception(e)
-        self._parse_page_data(data=page_data, add_language_to_wikibase_item=make_unique)
+            else:
+                try:
+                    page_data = data["parse"]
+                except KeyError as e:
+                    logger.exception(e)
+                    continue
+            with span("parse page data"):
+                self._consume_page_data(data=page_data, revisions=revisions)
+        count("pages")
+        self._finish_page_data(revisions=revisions, add_language_to_wikibase_item=make_unique)
         self._add_aliases_to_class_instances()
 
     def _parse_page_data(
         self: Page, data: dict[str, Any], add_language_to_wikibase_item: bool = False
     ) -> None:
-        # self._displaytitle = re.sub('<[^<]+?>', '', data["displaytitle"])
-        self._displaytitle = unquote(data['displaytitle'])
+        """Parse the data of the page received in a single response"""
+        revisions = []
+        self._consume_page_data(data=data, revisions=revisions)
+        self._finish_page_data(
+            revisions=revisions, add_language_to_wikibase_item=add_language_to_wikibase_item
+        )
+
+    def _consume_page_data(self: Page, data: dict[str, Any], revisions: list[dict]) -> None:
+        """Add the page data of one response batch to what has been read so far.
+
+        Links, langlinks, backlinks and aliases are added to the sets of the
+        page and revisions are appended to ``revisions``, so reading every
+        continuation of a response takes time linear in its size.
+        """
+        with suppress(KeyError):
+            # self._displaytitle = re.sub('<[^<]+?>', '', data["displaytitle"])
+            self._displaytitle = unquote(data['displaytitle'])
         try:
             links = data["links"]
         except KeyError:
             pass
         else:
             try:
-                self._links = PageKeySet(
-                    PageKey(language=self._language, title=link["title"])
+                self._links.update(
+                    PageKey(language=self._language, title=sys.intern(link["title"]))
                     for link in links
                 )
             except KeyError:
-                self._links = PageKeySet(
-                    PageKey(language=self._language, title=link["*"])
-                    for link in links if link["ns"] == 0
+                # links of a past revision, red links are left out right away
+                self._links.update(
+                    PageKey(language=self._language, title=sys.intern(link["*"]))
+                    for link in links if link["ns"] == 0 and "exists" in link
                 )
         with suppress(KeyError):
-            self._langlinks = PageKeySet(
-                PageKey(language=langlink["lang"], title=langlink["*"])
+            self._langlinks.update(
+                PageKey(language=sys.intern(langlink["lang"]), title=sys.intern(langlink["*"]))
                 for langlink in data["langlinks"]
             )
         with suppress(KeyError):
-            self._aliases = {alias["title"] for alias in data["redirects"]}
+            self._aliases.update(alias["title"] for alias in data["redirects"])
         try:
             self._wikibase_item = data["pageprops"]["wikibase_item"]
         except KeyError:
-            try:
+            with suppress(KeyError, IndexError):
                 self._wikibase_item = [prop for prop in data["properties"] if prop['name'] == "wikibase_item"][0]["*"]
-            except KeyError:
-                logger.error("No wikibase item %s", self)
-                self._valid = False
         with suppress(KeyError):
-            rev_data = data["revisions"]
-            self._revisions = RevisionKeys(
-                RevisionKey(
-                    title=self.title,
-                    oldid=revision["revid"],
-                    language=self.language,
-                    timestamp=dateutil.parser.parse(revision["timestamp"]).replace(tzinfo=None),
-                )
-                for revision in rev_data
-            )
-        try:
+            revisions.extend(data["revisions"])
+        with suppress(KeyError):
             self._description = data["terms"]["description"]
-        except KeyError:
-            self._description = self._displaytitle
         with suppress(KeyError):
-            backlinks_data = data["linkshere"]
-            self._backlinks = PageKeySet(
+            self._backlinks.update(
                 PageKey(
-                    title=backlink['title'],
+                    title=sys.intern(backlink['title']),
                     language=self.language,
                 )
-                for backlink in backlinks_data
+                for backlink in data["linkshere"]
+            )
+
+    def _finish_page_data(
+        self: Page, revisions: list[dict], add_language_to_wikibase_item: bool = False
+    ) -> None:
+        """Complete the page once every response batch has been consumed"""
+        if revisions:
+            self._revisions = RevisionKeys.from_columns(
+                titles=[self.title] * len(revisions),
+                oldids=[revision["revid"] for revision in revisions],
+                # ISO 8601 UTC timestamps, stored as naive UTC datetimes
+                timestamps=[revision["timestamp"].rstrip("Z") for revision in revisions],
+                languages=[self.language] * len(revisions),
+            )
+        if self._description is None:
+            self._description = self._displaytitle
+        if self._wikibase_item is None:
+            logger.error("No wikibase item %s", self)
+            self._valid = False
+        elif add_language_to_wikibase_item or self._timestamp is not None:
+            # a past revision is always a language version node of its own
+            self._wikibase_item = NodeKey(
+                item=self._wikibase_item, language=self.language, timestamp=self._timestamp
             )
-        if add_language_to_wikibase_item:
-            self._wikibase_item += f"__{self.language}"
-        if self._timestamp:
-            self._wikibase_item += ' ~ ('
-            self._wikibase_item += str(self._timestamp)
-            self._wikibase_item += ')'
-        if self.wikibase_item is None:
-            logger.error("No wikibase: %s, %s", self.title, self.wikibase_item)
-
-    async def _fetch(
+
+    def _fetch(
         self: Page,
         client: httpx.AsyncClient,
         links: bool = False,
         revisions: bool = False,
         type_: str = "query",
-        **extra_params: Any,
-    ) -> dict:
-        base_url = f"https://{self.language}.wikipedia.org/w/api.php"
-        params = {
-            "action": type_,
-            "format": "json",
-            "prop": "info|langlinks|pageprops|redirects",
-            "redirects": 1,
-            "rdlimit": "max",
-            "inprop": "displaytitle",
-            "llprop": "autonym|langname|url",
-            "lllimit": "max",
-            "ppprop": "wikibase_item",
-        }
-        if links:
-            params["prop"] += "|links"
-            params["pllimit"] = "max"
-            params["plnamespace"] = "0"
-
-        if revisions:
-            params["prop"] += "|revisions"
-            params["rvlimit"] = "max"
-            params["rvprop"] = "ids|flags|timestamp|roles|flagged"
-
-        description = revisions
-        if description:
-            params["prop"] += "|pageterms"
-            params["wbptterms"] = "description"
-
-        backlinks = revisions
-        if backlinks:
-            # params["prop"] += "|linkshere"
-            params["lhlimit"] = "max"
-            params["blredirect"] = True
-
+    ) -> AsyncIterator[dict]:
         if type_ == "query":
+            params = _api_params(links=links, revisions=revisions, type_=type_)
             params["titles"] = self.title
         else:
+            params = _revision_api_params(properties=self._wikibase_item is None)
             params["oldid"] = self._revision
-            params["prop"] += '|displaytitle|properties'
-
-        response: Optional[httpx.Response] = None
-        sleep_time: Seconds = 2
-        while not response:
-            try:
-                response = await client.get(base_url, params=params | extra_params)
-            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
-                logger.error(
-                    '%s while fetching "%s" - waiting at least %i seconds before another try',
-                    e.__class__.__name__,
-                    self.title,
-                    sleep_time,
-                    exc_info=False,
-                )
-                await asyncio.sleep(sleep_time)
-                sleep_time *= 4
+        return _fetch_batches(
+            client, language=self.language, params=params, description=self.title
+        )
 
-        return response.json()
+    def _current_wikibase_item(self: Page) -> Optional[str]:
+        """Wikibase item of the current revision of the page, if it has been fetched"""
+        try:
+            current = Page.registry()[(self.title, self.language, None, None)]
+        except KeyError:
+            return None
+        return getattr(current.wikibase_item, "item", current.wikibase_item)
 
     def _add_aliases_to_class_instances(self: Page) -> None:
         for alias in self._aliases:
-            Page._instances[(alias, self.language, self._revision, self._timestamp)] = self
+            Page.registry()[(alias, self.language, self._revision, self._timestamp)] = self
+
+
+@traced("fetch pages batch")
+async def fetch_pages_batch(client: httpx.AsyncClient, pages: Sequence[Page]) -> None:
+    """Fetch details of many same-language pages with a single multi-title query"""
+    pages = [page for page in pages if not page._fetched]
+    if not pages:
+        return
+    for page in pages:
+        page._fetched = True
+
+    params = _batch_api_params()
+    params["titles"] = "|".join(page.title for page in pages)
+    batches = _fetch_batches(
+        client,
+        language=pages[0].language,
+        params=params,
+        description=f"{len(pages)} pages",
+    )
+    title_mappings = {mapping: {} for mapping in ("normalized", "converted", "redirects")}
+    found = set()
+    revisions = defaultdict(list)
+    async for data in batches:
+        with span("parse page data", pages=len(pages)):
+            _consume_batch(data, pages, title_mappings, found, revisions)
+    count("pages", len(pages))
+    for page in pages:
+        if page not in found:
+            logger.error('Batched query returned no data for page "%s"', page.title)
+        elif page._valid:
+            page._finish_page_data(revisions=revisions[page])
+            page._add_aliases_to_class_instances()
+
+
+def _consume_batch(
+    data: dict[str, Any],
+    pages: Sequence[Page],
+    title_mappings: dict[str, dict[str, str]],
+    found: set[Page],
+    revisions: defaultdict[Page, list[dict]],
+) -> None:
+    """Hand the data of one batched response over to the pages it describes"""
+    query = data.get("query", {})
+    for mapping, titles in title_mappings.items():
+        titles.update((item["from"], item["to"]) for item in query.get(mapping, []))
+    pages_by_title = {
+        page_data["title"]: (page_number, page_data)
+        for page_number, page_data in query.get("pages", {}).items()
+    }
+    for page in pages:
+        title = page.title
+        for titles in title_mappings.values():
+            title = titles.get(title, title)
+        try:
+            page_number, page_data = pages_by_title[title]
+        except KeyError:
+            continue
+        if int(page_number) < 0:
+            if page not in found:
+                logger.warning(
+                    'Linked page "%s" does not exist and will be removed', page.title
+                )
+            found.add(page)
+            continue
+        found.add(page)
+        page._valid = True
+        page._consume_page_data(data=page_data, revisions=revisions[page])
+
+
+def _api_params(
+    links: bool = False, revisions: bool = False, type_: str = "query"
+) -> dict[str, Any]:
+    params = {
+        "action": type_,
+        "format": "json",
+        "prop": "info|langlinks|pageprops|redirects",
+        "redirects": 1,
+        "rdlimit": "max",
+        "inprop": "displaytitle",
+        "llprop": "autonym|langname|url",
+        "lllimit": "max",
+        "ppprop": "wikibase_item",
+    }
+    if links:
+        params["prop"] += "|links"
+        params["pllimit"] = "max"
+        params["plnamespace"] = "0"
+
+    if revisions:
+        params["prop"] += "|revisions"
+        params["rvlimit"] = "max"
+        params["rvprop"] = "ids|flags|timestamp|roles|flagged"
+
+    description = revisions
+    if description:
+        params["prop"] += "|pageterms"
+        params["wbptterms"] = "description"
+
+    backlinks = revisions
+    if backlinks:
+        # params["prop"] += "|linkshere"
+        params["lhlimit"] = "max"
+        params["blredirect"] = True
+    return params
+
+
+def _batch_api_params() -> dict[str, Any]:
+    """Parameters of a multi-title query resolving linked pages.
+
+    Langlinks of linked pages are never read, and the ``*limit`` parameters of
+    the API cap the items of the whole response rather than those of every
+    title, so only the page properties and redirects are requested.
+    """
+    return {
+        "action": "query",
+        "format": "json",
+        "prop": "info|pageprops|redirects",
+        "redirects": 1,
+        "rdlimit": "max",
+        "inprop": "displaytitle",
+        "ppprop": "wikibase_item",
+    }
+
+
+def _revision_api_params(properties: bool = True) -> dict[str, Any]:
+    """Parameters of a parse request returning only the links of a past revision.
+
+    Neither the rendered HTML nor the sections are requested; page properties
+    are only needed when the wikibase item is not known from the current
+    revision of the page.
+    """
+    params = {
+        "action": "parse",
+        "format": "json",
+        "prop": "links|displaytitle",
+        "disablelimitreport": 1,
+        "disableeditsection": 1,
+        "disabletoc": 1,
+    }
+    if properties:
+        params["prop"] += "|properties"
+    return params
+
+
+async def _fetch_batches(
+    client: httpx.AsyncClient, language: str, params: dict[str, Any], description: str
+) -> AsyncIterator[dict]:
+    """Yield a response and then each of its continuations as soon as it arrives"""
+    data = await fetch_json(client, language=language, params=params, description=description)
+    while "continue" in data:
+        extra_params = data.pop("continue")
+        count("continuations")
+        yield data
+        logger.debug('Continue fetching for "%s": %s', description, extra_params)
+        data = await fetch_json(
+            client, language=language, params=params | extra_params, description=description
+        )
+    yield data
 
 
 @dataclass(frozen=True, eq=True)
 class PageKey:
+    __slots__ = ("title", "language")
     title: str
     language: str
 
+    def to_page(self: PageKey) -> Page:
+        return Page(title=self.title, language=self.language)
 
-@dataclass(frozen=True, eq=True)
-class RevisionKey:
-    title: str
-    oldid: str
-    language: str
-    timestamp: datetime.datetime
-
+    # what dataclass(slots=True) generates, a frozen class has no __setattr__ to unpickle with
+    def __getstate__(self: PageKey) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
 
-class RevisionKeys(BaseList):
-    def __init__(self, revision_keys: Optional[Iterable[RevisionKey]] = None):
-        super().__init__(iterable=revision_keys)
-        if revision_keys is not None:
-            if not isinstance(revision_keys, Iterable) or not all(
-                isinstance(el, RevisionKey) for el in revision_keys
-            ):
-                raise ValueError("RevisionKeys must by made of RevisionKey instances")
-            self._data.sort(reverse=True, key=lambda x: x.timestamp)
+    def __setstate__(self: PageKey, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
 
 class PageKeySet(BaseSet):
+    """Keys of linked pages, holding on to the pages they were resolved to.
+
+    Pages are looked up in the multiton registry every time, but the set keeps
+    the ones it got alive, so a fetched page reachable only through its key is
+    never evicted from the registry and replaced with an unfetched one.
+    """
+
+    __slots__ = ("_pages",)
+
+    def __init__(self: PageKeySet, iterable: Iterable = ()) -> None:
+        super().__init__(iterable)
+        self._pages: dict[PageKey, Page] = {}
+
     @property
     def pages(self: PageKeySet) -> Generator[Page, None, None]:
-        return (Page(**page_key.__dict__) for page_key in self._data)
+        return (self._resolve(page_key) for page_key in self._data)
+
+    def _resolve(self: PageKeySet, page_key: PageKey) -> Page:
+        page = self._pages[page_key] = page_key.to_page()
+        return page
+
+    def _forget_removed(self: PageKeySet) -> None:
+        self._pages = {
+            page_key: page for page_key, page in self._pages.items() if page_key in self._data
+        }
 
     @property
     def wikibase_items(self: PageKeySet) -> Generator[str, None, None]:
@@ -404,19 +586,20 @@ class PageKeySet(BaseSet):
 
     @property
     def revisions(self: PageKeySet) -> RevisionKeys[RevisionKey]:
-        return RevisionKeys(
-            revision for page in self.pages for revision in page.revisions
-        )
+        return RevisionKeys.concatenate(page.revisions for page in self.pages)
 
     def remove_nonexistent(self: PageKeySet) -> None:
-        self._data = {
-            page_key for page_key in self._data if Page(**page_key.__dict__)._valid
-        }
+        with span("remove nonexistent", pages=len(self._data)):
+            self._data = {
+                page_key for page_key in self._data if self._resolve(page_key)._valid
+            }
+            self._forget_removed()
 
     def filter_languages(self: PageKeySet, languages: Iterable[str]) -> None:
         self._data = {
             page_key for page_key in self._data if page_key.language in languages
         }
+        self._forget_removed()
 
     # def filter_titles(self: PageKeySet, avoid: str) -> None:
     #     if avoid:
@@ -432,6 +615,32 @@ class PageKeySet(BaseSet):
             for page in self.pages
         )
 
+    def batches(
+        self: PageKeySet, size: int = MAX_TITLES_PER_QUERY
+    ) -> Generator[list[Page], None, None]:
+        pages_by_language = defaultdict(list)
+        for page in self.pages:
+            if not page._fetched:
+                pages_by_language[page.language].append(page)
+        for pages in pages_by_language.values():
+            batch, batch_length = [], 0
+            for page in sorted(pages, key=lambda p: p.title):
+                title_length = len(quote(page.title)) + len(TITLES_SEPARATOR)
+                if batch and (
+                    len(batch) >= size or batch_length + title_length > MAX_TITLES_LENGTH
+                ):
+                    yield batch
+                    batch, batch_length = [], 0
+                batch.append(page)
+                batch_length += title_length
+            if batch:
+                yield batch
+
+    async def fetch_pages_batched_coroutines(
+        self: PageKeySet, client: httpx.AsyncClient
+    ) -> Generator[Coroutine, Any, None]:
+        return (fetch_pages_batch(client, batch) for batch in self.batches())
+
     async def fetch_pages_coroutines(
         self: Page, client: httpx.AsyncClient, *args: Any, **kwargs: Any
     ) -> Generator[Coroutine, Any, None]:
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+__all__ = ["RevisionKey", "RevisionKeys"]
+
+import datetime
+from collections import Iterable
+from collections import Sequence
+from dataclasses import dataclass
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=True)
+class RevisionKey:
+    __slots__ = ("title", "oldid", "language", "timestamp")
+    title: str
+    oldid: str
+    language: str
+    timestamp: datetime.datetime
+
+    # what dataclass(slots=True) generates, a frozen class has no __setattr__ to unpickle with
+    def __getstate__(self: RevisionKey) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self: RevisionKey, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+_NO_TITLES = _readonly(np.empty(0, dtype=object))
+_NO_OLDIDS = _readonly(np.empty(0, dtype=np.int64))
+_NO_TIMESTAMPS = _readonly(np.empty(0, dtype="datetime64[us]"))
+_NO_LANGUAGE_CODES = _readonly(np.empty(0, dtype=np.int32))
+
+
+class RevisionKeys(Sequence):
+    """Revisions stored column-wise, newest first.
+
+    Titles, oldids, timestamps and categorical language codes are kept in
+    read-only NumPy arrays. Slicing returns views of the same arrays, merging
+    revisions of many pages is one concatenation and sort, and grouping by
+    language regroups the columns once. RevisionKey objects are only created
+    when single revisions are accessed.
+    """
+
+    __slots__ = ("_titles", "_oldids", "_timestamps", "_language_codes", "_languages")
+
+    def __init__(self: RevisionKeys, revision_keys: Optional[Iterable[RevisionKey]] = None):
+        titles, oldids, timestamps, languages = [], [], [], []
+        for revision in revision_keys or ():
+            if not isinstance(revision, RevisionKey):
+                raise ValueError("RevisionKeys must by made of RevisionKey instances")
+            titles.append(revision.title)
+            oldids.append(revision.oldid)
+            timestamps.append(revision.timestamp)
+            languages.append(revision.language)
+        self._set_columns(*_sorted_columns(*_columns(titles, oldids, timestamps, languages)))
+
+    @classmethod
+    def from_columns(
+        cls: type[RevisionKeys],
+        titles: Sequence[str],
+        oldids: Sequence[int],
+        timestamps: Union[Sequence[datetime.datetime], np.ndarray],
+        languages: Sequence[str],
+    ) -> RevisionKeys:
+        """Build revisions from per-field sequences, without RevisionKey objects"""
+        return cls._from_arrays(*_sorted_columns(*_columns(titles, oldids, timestamps, languages)))
+
+    @classmethod
+    def concatenate(cls: type[RevisionKeys], parts: Iterable[RevisionKeys]) -> RevisionKeys:
+        """Merge revisions of many pages, keeping them ordered newest first"""
+        parts = [part for part in parts if len(part)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return cls()
+        languages = list(dict.fromkeys(language for part in parts for language in part._languages))
+        positions = {language: i for i, language in enumerate(languages)}
+        language_codes = np.concatenate([
+            np.array([positions[language] for language in part._languages], dtype=np.int32)[
+                part._language_codes
+            ]
+            for part in parts
+        ])
+        return cls._from_arrays(*_sorted_columns(
+            np.concatenate([part._titles for part in parts]),
+            np.concatenate([part._oldids for part in parts]),
+            np.concatenate([part._timestamps for part in parts]),
+            language_codes,
+            tuple(languages),
+        ))
+
+    @classmethod
+    def _from_arrays(
+        cls: type[RevisionKeys],
+        titles: np.ndarray,
+        oldids: np.ndarray,
+        timestamps: np.ndarray,
+        language_codes: np.ndarray,
+        languages: tuple[str, ...],
+    ) -> RevisionKeys:
+        instance = cls.__new__(cls)
+        instance._set_columns(titles, oldids, timestamps, language_codes, languages)
+        return instance
+
+    def _set_columns(
+        self: RevisionKeys,
+        titles: np.ndarray,
+        oldids: np.ndarray,
+        timestamps: np.ndarray,
+        language_codes: np.ndarray,
+        languages: tuple[str, ...],
+    ) -> None:
+        self._titles: np.ndarray = _readonly(titles) if len(titles) else _NO_TITLES
+        self._oldids: np.ndarray = _readonly(oldids) if len(oldids) else _NO_OLDIDS
+        self._timestamps: np.ndarray = _readonly(timestamps) if len(timestamps) else _NO_TIMESTAMPS
+        self._language_codes: np.ndarray = (
+            _readonly(language_codes) if len(language_codes) else _NO_LANGUAGE_CODES
+        )
+        self._languages: tuple[str, ...] = languages
+
+    def __len__(self: RevisionKeys) -> int:
+        return len(self._oldids)
+
+    def __getitem__(
+        self: RevisionKeys, index: Union[int, slice]
+    ) -> Union[RevisionKey, RevisionKeys]:
+        if isinstance(index, slice):
+            return self._from_arrays(
+                self._titles[index],
+                self._oldids[index],
+                self._timestamps[index],
+                self._language_codes[index],
+                self._languages,
+            )
+        return RevisionKey(
+            title=self._titles[index],
+            oldid=self._oldids[index].item(),
+            language=self._languages[self._language_codes[index]],
+            timestamp=self._timestamps[index].item(),
+        )
+
+    def __iter__(self: RevisionKeys):
+        languages = [self._languages[code] for code in self._language_codes.tolist()]
+        for title, oldid, language, timestamp in zip(
+            self._titles.tolist(), self._oldids.tolist(), languages, self._timestamps.tolist()
+        ):
+            yield RevisionKey(title=title, oldid=oldid, language=language, timestamp=timestamp)
+
+    def __add__(self: RevisionKeys, other: RevisionKeys) -> RevisionKeys:
+        if not isinstance(other, RevisionKeys):
+            other = RevisionKeys(other)
+        return self.concatenate([self, other])
+
+    def __eq__(self: RevisionKeys, other: object) -> bool:
+        if not isinstance(other, RevisionKeys):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self: RevisionKeys) -> str:
+        return f"RevisionKeys({len(self)} revisions, languages={list(self.languages)})"
+
+    @property
+    def titles(self: RevisionKeys) -> np.ndarray:
+        return self._titles
+
+    @property
+    def oldids(self: RevisionKeys) -> np.ndarray:
+        return self._oldids
+
+    @property
+    def timestamps(self: RevisionKeys) -> np.ndarray:
+        return self._timestamps
+
+    @property
+    def languages(self: RevisionKeys) -> tuple[str, ...]:
+        """Languages having at least one revision, in order of first appearance"""
+        present = np.zeros(len(self._languages), dtype=bool)
+        present[self._language_codes] = True
+        return tuple(language for language, is_present in zip(self._languages, present) if is_present)
+
+    def take(self: RevisionKeys, indices: np.ndarray) -> RevisionKeys:
+        """Return revisions at the given positions, in that order"""
+        return self._from_arrays(
+            self._titles[indices],
+            self._oldids[indices],
+            self._timestamps[indices],
+            self._language_codes[indices],
+            self._languages,
+        )
+
+    def by_language(self: RevisionKeys) -> dict[str, RevisionKeys]:
+        """Split revisions per language; every group is a view of one regrouped copy"""
+        order = np.argsort(self._language_codes, kind="stable")
+        grouped = self.take(order)
+        counts = np.bincount(grouped._language_codes, minlength=len(self._languages))
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+        return {
+            language: grouped[bounds[code]:bounds[code + 1]]
+            for code, language in enumerate(self._languages)
+            if counts[code]
+        }
+
+
+def _columns(
+    titles: Sequence[str],
+    oldids: Sequence[int],
+    timestamps: Union[Sequence[datetime.datetime], np.ndarray],
+    languages: Sequence[str],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple[str, ...]]:
+    categories = {}
+    language_codes = np.array(
+        [categories.setdefault(language, len(categories)) for language in languages],
+        dtype=np.int32,
+    )
+    titles_array = np.empty(len(titles), dtype=object)
+    titles_array[:] = titles
+    return (
+        titles_array,
+        np.array(oldids, dtype=np.int64),
+        np.array(timestamps, dtype="datetime64[us]"),
+        language_codes,
+        tuple(categories),
+    )
+
+
+def _sorted_columns(
+    titles: np.ndarray,
+    oldids: np.ndarray,
+    timestamps: np.ndarray,
+    language_codes: np.ndarray,
+    languages: tuple[str, ...],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple[str, ...]]:
+    # newest first, revisions with equal timestamps keep their relative order
+    order = np.argsort(-timestamps.view(np.int64), kind="stable")
+    return titles[order], oldids[order], timestamps[order], language_codes[order], languages
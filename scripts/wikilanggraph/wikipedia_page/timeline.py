@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+__all__ = ["TimelineIndex"]
+
+import datetime
+from collections import Iterable
+from typing import Mapping
+from typing import Optional
+
+import numpy as np
+
+from scripts.wikilanggraph.wikipedia_page.page import Page
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKey
+from scripts.wikilanggraph.wikipedia_page.revisions import RevisionKeys
+
+
+class _LanguageTimeline:
+    def __init__(self: _LanguageTimeline, revisions: Iterable[RevisionKey]) -> None:
+        if not isinstance(revisions, RevisionKeys):
+            revisions = RevisionKeys(revisions)
+        order = np.argsort(revisions.timestamps, kind="stable")
+        self.revisions: RevisionKeys = revisions.take(order)
+        self.timestamps: np.ndarray = self.revisions.timestamps
+        self.oldids: np.ndarray = self.revisions.oldids
+
+    def __len__(self: _LanguageTimeline) -> int:
+        return len(self.revisions)
+
+    def at(self: _LanguageTimeline, moment: np.datetime64) -> Optional[RevisionKey]:
+        position = np.searchsorted(self.timestamps, moment, side="right") - 1
+        return self.revisions[position] if position >= 0 else None
+
+
+class TimelineIndex:
+    """Per-language revision timelines answering "latest revision at time T".
+
+    Timestamps of every language version are kept as a sorted datetime64
+    array, so looking up the revision that was current at a given moment is
+    a binary search instead of a scan over the whole revision history.
+    """
+
+    def __init__(
+        self: TimelineIndex, revisions_by_language: Mapping[str, Iterable[RevisionKey]]
+    ) -> None:
+        self._timelines: dict[str, _LanguageTimeline] = {
+            language: _LanguageTimeline(revisions)
+            for language, revisions in revisions_by_language.items()
+        }
+
+    def __repr__(self: TimelineIndex) -> str:
+        sizes = {language: len(timeline) for language, timeline in self._timelines.items()}
+        return f"TimelineIndex({sizes})"
+
+    @classmethod
+    def from_page(cls: type[TimelineIndex], page: Page) -> TimelineIndex:
+        return cls(page.timepoints_all_languages_as_dict)
+
+    @property
+    def languages(self: TimelineIndex) -> list[str]:
+        return list(self._timelines)
+
+    def at(
+        self: TimelineIndex, language: str, moment: datetime.datetime
+    ) -> Optional[RevisionKey]:
+        """Return the latest revision of a language version made at or before moment"""
+        try:
+            timeline = self._timelines[language]
+        except KeyError:
+            return None
+        return timeline.at(np.datetime64(moment, "us"))
+
+    def nearest_revisions(
+        self: TimelineIndex, moment: datetime.datetime
+    ) -> dict[str, Optional[RevisionKey]]:
+        moment = np.datetime64(moment, "us")
+        return {language: timeline.at(moment) for language, timeline in self._timelines.items()}